@@ -5,15 +5,26 @@ import io
 import logging
 import os
 import platform
-from typing import TYPE_CHECKING
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
 
-from browser_use.agent.views import AgentHistoryList
+from browser_use.agent.views import AgentHistory, AgentHistoryList
 
 if TYPE_CHECKING:
 	from PIL import Image, ImageFont
 
 logger = logging.getLogger(__name__)
 
+# ffmpeg codec arguments by file extension, any other extension is recorded as a GIF
+VIDEO_CODECS = {
+	'.mp4': ['-c:v', 'libx264', '-movflags', '+faststart'],
+	'.webm': ['-c:v', 'libvpx-vp9', '-b:v', '0', '-crf', '40'],
+}
+
 
 def decode_unicode_escapes_to_utf8(text: str) -> str:
 	"""Handle decoding any unicode escape sequences embedded in a string (needed to render non-ASCII languages like chinese or arabic in the GIF overlay text)"""
@@ -44,120 +55,329 @@ def create_history_gif(
 	goal_font_size: int = 44,
 	margin: int = 40,
 	line_spacing: float = 1.5,
+	max_dimension: int | None = None,
+	reuse_palette: bool = False,
 ) -> None:
-	"""Create a GIF from the agent's history with overlaid task and goal text."""
+	"""Create a GIF (or an MP4/WebM video, by the extension of output_path) from the agent's history with overlaid task and goal text."""
 	if not history.history:
 		logger.warning('No history to create GIF from')
 		return
 
-	from PIL import Image, ImageFont
-
-	images = []
-
 	# if history is empty or first screenshot is None, we can't create a gif
-	if not history.history or not history.history[0].state.screenshot:
+	if not history.history[0].state.get_screenshot():
 		logger.warning('No history or first screenshot to create GIF from')
 		return
 
-	# Try to load nicer fonts
-	try:
-		# Try different font options in order of preference
-		# ArialUni is a font that comes with Office and can render most non-alphabet characters
-		font_options = [
-			'Microsoft YaHei',  # 微软雅黑
-			'SimHei',  # 黑体
-			'SimSun',  # 宋体
-			'Noto Sans CJK SC',  # 思源黑体
-			'WenQuanYi Micro Hei',  # 文泉驿微米黑
-			'Helvetica',
-			'Arial',
-			'DejaVuSans',
-			'Verdana',
-		]
-		font_loaded = False
-
-		for font_name in font_options:
-			try:
-				if platform.system() == 'Windows':
-					# Need to specify the abs font path on Windows
-					font_name = os.path.join(os.getenv('WIN_FONT_DIR', 'C:\\Windows\\Fonts'), font_name + '.ttf')
-				regular_font = ImageFont.truetype(font_name, font_size)
-				title_font = ImageFont.truetype(font_name, title_font_size)
-				goal_font = ImageFont.truetype(font_name, goal_font_size)
-				font_loaded = True
-				break
-			except OSError:
-				continue
-
-		if not font_loaded:
-			raise OSError('No preferred fonts found')
-
-	except OSError:
-		regular_font = ImageFont.load_default()
-		title_font = ImageFont.load_default()
-
-		goal_font = regular_font
-
-	# Load logo if requested
-	logo = None
-	if show_logo:
+	recorder = HistoryRecorder(
+		output_path,
+		task=task if show_task else None,
+		duration=duration,
+		show_goals=show_goals,
+		show_logo=show_logo,
+		font_size=font_size,
+		title_font_size=title_font_size,
+		goal_font_size=goal_font_size,
+		margin=margin,
+		line_spacing=line_spacing,
+		max_dimension=max_dimension,
+		reuse_palette=reuse_palette,
+	)
+	for i, item in enumerate(history.history, 1):
+		recorder.add_history_item(item, i)
+	recorder.close()
+
+
+class HistoryRecorder:
+	"""
+	Encodes the history into a GIF, or an MP4/WebM video through a local ffmpeg, frame by frame as steps are added.
+	Frames are rendered and encoded on a single background thread and only the frame being encoded is kept in memory.
+	"""
+
+	def __init__(
+		self,
+		output_path: str,
+		task: str | None = None,
+		duration: int = 3000,
+		show_goals: bool = True,
+		show_logo: bool = False,
+		font_size: int = 40,
+		title_font_size: int = 56,
+		goal_font_size: int = 44,
+		margin: int = 40,
+		line_spacing: float = 1.5,
+		max_dimension: int | None = None,  # downscale frames so their longest side is at most this many pixels
+		reuse_palette: bool = False,  # quantize every frame to the colors of the first screenshot, faster but less exact
+	):
+		self.output_path = output_path
+		self.task = task
+		self.duration = duration
+		self.show_goals = show_goals
+		self.show_logo = show_logo
+		self.font_size = font_size
+		self.title_font_size = title_font_size
+		self.goal_font_size = goal_font_size
+		self.margin = margin
+		self.line_spacing = line_spacing
+		self.max_dimension = max_dimension
+		self.reuse_palette = reuse_palette
+		self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='history_recorder')
+		self._writer: _GifWriter | _FfmpegWriter | None = None
+		self._logo: Image.Image | None = None
+		self._failed = False
+
+	def add_history_item(self, item: AgentHistory, step_number: int) -> None:
+		"""Add the step's screenshot with its goal overlaid, returns right away while the frame is encoded in the background"""
+		screenshot = item.state.get_screenshot()
+		if not screenshot:
+			return
+		goal = item.model_output.current_state.next_goal if self.show_goals and item.model_output else None
+		self._executor.submit(self._add_frame, screenshot, step_number, goal)
+
+	def close(self) -> None:
+		"""Wait for the pending frames and finish the file"""
+		self._executor.shutdown(wait=True)
+		if self._writer is None:
+			if not self._failed:
+				logger.warning('No images found in history to create GIF')
+			return
 		try:
-			logo = Image.open('./static/browser-use.png')
-			# Resize logo to be small (e.g., 40px height)
-			logo_height = 150
-			aspect_ratio = logo.width / logo.height
-			logo_width = int(logo_height * aspect_ratio)
-			logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+			self._writer.close()
+			logger.info(f'Created {"GIF" if isinstance(self._writer, _GifWriter) else "video"} at {self._writer.path}')
 		except Exception as e:
-			logger.warning(f'Could not load logo: {e}')
-
-	# Create task frame if requested
-	if show_task and task:
-		task_frame = _create_task_frame(
-			task,
-			history.history[0].state.screenshot,
-			title_font,  # type: ignore
-			regular_font,  # type: ignore
-			logo,
-			line_spacing,
-		)
-		images.append(task_frame)
+			logger.error(f'❌ Failed to create {self._writer.path}: {type(e).__name__}: {e}')
 
-	# Process each history item
-	for i, item in enumerate(history.history, 1):
-		if not item.state.screenshot:
-			continue
+	def _add_frame(self, screenshot: str, step_number: int, goal: str | None) -> None:
+		if self._failed:
+			return
+		try:
+			from PIL import Image
+
+			regular_font, title_font, _ = _load_fonts(self.font_size, self.title_font_size, self.goal_font_size)
+			if self._writer is None:
+				self._writer = self._open_writer()
+				if self.show_logo:
+					self._logo = _load_logo()
+				if self.task:
+					task_frame = _create_task_frame(
+						self.task, screenshot, title_font, regular_font, self._logo, self.line_spacing
+					)
+					self._writer.add_frame(self._downscale(task_frame))
+
+			image = Image.open(io.BytesIO(base64.b64decode(screenshot)))
+			if goal is not None:
+				image = _add_overlay_to_image(
+					image=image,
+					step_number=step_number,
+					goal_text=goal,
+					regular_font=regular_font,
+					title_font=title_font,
+					margin=self.margin,
+					logo=self._logo,
+				)
+			self._writer.add_frame(self._downscale(image))
+		except Exception as e:
+			# a broken recording must not break the run, stop recording instead
+			self._failed = True
+			logger.error(f'❌ Failed to record step {step_number} to {self.output_path}: {type(e).__name__}: {e}')
+
+	def _open_writer(self) -> _GifWriter | _FfmpegWriter:
+		path = Path(self.output_path)
+		if path.suffix.lower() in VIDEO_CODECS:
+			ffmpeg = _find_ffmpeg()
+			if ffmpeg:
+				return _FfmpegWriter(path, self.duration, ffmpeg)
+			path = path.with_suffix('.gif')
+			logger.warning(f'⚠️ ffmpeg not found, recording a GIF to {path} instead of {self.output_path}')
+		return _GifWriter(path, self.duration, self.reuse_palette)
+
+	def _downscale(self, image: Image.Image) -> Image.Image:
+		if self.max_dimension is None or max(image.size) <= self.max_dimension:
+			return image
+		from PIL import Image
+
+		scale = self.max_dimension / max(image.size)
+		size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+		return image.resize(size, Image.Resampling.LANCZOS)
+
+
+class _GifWriter:
+	"""
+	Writes GIF frames to the file as they come instead of collecting them for Image.save(save_all=True).
+	The last frame is held back so identical consecutive frames can be merged into one longer frame.
+	"""
 
-		# Convert base64 screenshot to PIL Image
-		img_data = base64.b64decode(item.state.screenshot)
-		image = Image.open(io.BytesIO(img_data))
-
-		if show_goals and item.model_output:
-			image = _add_overlay_to_image(
-				image=image,
-				step_number=i,
-				goal_text=item.model_output.current_state.next_goal,
-				regular_font=regular_font,  # type: ignore
-				title_font=title_font,  # type: ignore
-				margin=margin,
-				logo=logo,
+	def __init__(self, path: Path, duration: int, reuse_palette: bool):
+		self.path = path
+		self.duration = duration
+		self.reuse_palette = reuse_palette
+		self._file: IO[bytes] | None = None
+		self._size: tuple[int, int] = (0, 0)
+		self._palette_image: Image.Image | None = None
+		self._pending: Image.Image | None = None
+		self._pending_duration = 0
+
+	def add_frame(self, image: Image.Image) -> None:
+		from PIL import GifImagePlugin, Image
+
+		if self._file is None:
+			self._size = image.size
+		elif image.size != self._size:
+			image = image.resize(self._size, Image.Resampling.LANCZOS)
+
+		image = image.convert('RGB')
+		if self._palette_image is not None:
+			frame = image.quantize(palette=self._palette_image, dither=Image.Dither.NONE)
+		else:
+			frame = image.convert('P', palette=Image.Palette.ADAPTIVE)
+
+		if self._file is None:
+			self.path.parent.mkdir(parents=True, exist_ok=True)
+			self._file = open(self.path, 'wb')
+			header, _ = GifImagePlugin.getheader(frame, info={'loop': 0, 'duration': self.duration})
+			self._file.write(b''.join(header))
+			if self.reuse_palette:
+				self._palette_image = frame
+
+		if (
+			self._pending is not None
+			and frame.tobytes() == self._pending.tobytes()
+			and frame.getpalette() == self._pending.getpalette()
+		):
+			self._pending_duration += self.duration
+			return
+
+		self._write_pending()
+		self._pending = frame
+		self._pending_duration = self.duration
+
+	def close(self) -> None:
+		assert self._file is not None
+		self._write_pending()
+		self._file.write(b';')  # trailer
+		self._file.close()
+
+	def _write_pending(self) -> None:
+		from PIL import GifImagePlugin
+
+		if self._pending is None:
+			return
+		assert self._file is not None
+		data = GifImagePlugin.getdata(
+			self._pending, duration=self._pending_duration, include_color_table=self._palette_image is None
+		)
+		self._file.write(b''.join(data))
+		self._pending = None
+
+
+class _FfmpegWriter:
+	"""Pipes raw RGB frames into a local ffmpeg, every frame is shown for duration milliseconds"""
+
+	def __init__(self, path: Path, duration: int, ffmpeg: str):
+		self.path = path
+		self.duration = duration
+		self.ffmpeg = ffmpeg
+		self._process: subprocess.Popen | None = None
+		self._size: tuple[int, int] = (0, 0)
+
+	def add_frame(self, image: Image.Image) -> None:
+		from PIL import Image
+
+		if self._process is None:
+			# yuv420p needs even dimensions
+			self._size = (max(2, image.width - image.width % 2), max(2, image.height - image.height % 2))
+			self.path.parent.mkdir(parents=True, exist_ok=True)
+			size = f'{self._size[0]}x{self._size[1]}'
+			command = [
+				self.ffmpeg,
+				*'-y -loglevel error -f rawvideo -pix_fmt rgb24'.split(),
+				'-s',
+				size,
+				'-r',
+				f'1000/{self.duration}',
+			]
+			command += ['-i', '-', '-pix_fmt', 'yuv420p', *VIDEO_CODECS[self.path.suffix.lower()], str(self.path)]
+			self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+		if image.size != self._size:
+			image = image.resize(self._size, Image.Resampling.LANCZOS)
+		assert self._process.stdin is not None
+		self._process.stdin.write(image.convert('RGB').tobytes())
+
+	def close(self) -> None:
+		assert self._process is not None
+		_, stderr = self._process.communicate()
+		if self._process.returncode != 0:
+			raise RuntimeError(f'ffmpeg exited with code {self._process.returncode}: {stderr.decode(errors="replace").strip()}')
+
+
+def _find_ffmpeg() -> str | None:
+	"""ffmpeg on the PATH, or the binary bundled with imageio-ffmpeg if that is installed"""
+	ffmpeg = shutil.which('ffmpeg')
+	if ffmpeg:
+		return ffmpeg
+	try:
+		import imageio_ffmpeg  # type: ignore
+
+		return imageio_ffmpeg.get_ffmpeg_exe()
+	except Exception:
+		return None
+
+
+@cache
+def _load_fonts(font_size: int, title_font_size: int, goal_font_size: int) -> tuple[Any, Any, Any]:
+	"""Regular, title and goal fonts, probed once per process instead of on every recording"""
+	from PIL import ImageFont
+
+	# Try different font options in order of preference
+	# ArialUni is a font that comes with Office and can render most non-alphabet characters
+	font_options = [
+		'Microsoft YaHei',  # 微软雅黑
+		'SimHei',  # 黑体
+		'SimSun',  # 宋体
+		'Noto Sans CJK SC',  # 思源黑体
+		'WenQuanYi Micro Hei',  # 文泉驿微米黑
+		'Helvetica',
+		'Arial',
+		'DejaVuSans',
+		'Verdana',
+	]
+	for font_name in font_options:
+		try:
+			if platform.system() == 'Windows':
+				# Need to specify the abs font path on Windows
+				font_name = os.path.join(os.getenv('WIN_FONT_DIR', 'C:\\Windows\\Fonts'), font_name + '.ttf')
+			return (
+				ImageFont.truetype(font_name, font_size),
+				ImageFont.truetype(font_name, title_font_size),
+				ImageFont.truetype(font_name, goal_font_size),
 			)
+		except OSError:
+			continue
 
-		images.append(image)
-
-	if images:
-		# Save the GIF
-		images[0].save(
-			output_path,
-			save_all=True,
-			append_images=images[1:],
-			duration=duration,
-			loop=0,
-			optimize=False,
-		)
-		logger.info(f'Created GIF at {output_path}')
-	else:
-		logger.warning('No images found in history to create GIF')
+	regular_font = ImageFont.load_default()
+	return regular_font, ImageFont.load_default(), regular_font
+
+
+@cache
+def _sized_font(path: Any, size: int) -> Any:
+	from PIL import ImageFont
+
+	return ImageFont.truetype(path, size)
+
+
+def _load_logo() -> Image.Image | None:
+	from PIL import Image
+
+	try:
+		logo = Image.open('./static/browser-use.png')
+		# Resize logo to be small (e.g., 40px height)
+		logo_height = 150
+		aspect_ratio = logo.width / logo.height
+		logo_width = int(logo_height * aspect_ratio)
+		return logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+	except Exception as e:
+		logger.warning(f'Could not load logo: {e}')
+		return None
 
 
 def _create_task_frame(
@@ -169,7 +389,7 @@ def _create_task_frame(
 	line_spacing: float = 1.5,
 ) -> Image.Image:
 	"""Create initial frame showing the task."""
-	from PIL import Image, ImageDraw, ImageFont
+	from PIL import Image, ImageDraw
 
 	img_data = base64.b64decode(first_screenshot)
 	template = Image.open(io.BytesIO(img_data))
@@ -198,7 +418,7 @@ def _create_task_frame(
 	else:
 		font_size = base_font_size
 
-	larger_font = ImageFont.truetype(regular_font.path, font_size)
+	larger_font = _sized_font(regular_font.path, font_size)
 
 	# Generate wrapped text with the calculated font size
 	wrapped_text = _wrap_text(task, larger_font, max_width)
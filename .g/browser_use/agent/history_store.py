@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+from browser_use.agent.views import AgentHistory, AgentHistoryList, AgentOutput
+from browser_use.browser.views import screenshot_media_type
+
+logger = logging.getLogger(__name__)
+
+SCREENSHOT_EXTENSIONS = {'image/png': 'png', 'image/jpeg': 'jpg', 'image/webp': 'webp'}
+
+
+class HistoryStore:
+	"""
+	Append-only agent history on disk, written as the steps finish so a crashed run loses at most its last step:
+	- history.jsonl: one AgentHistory.model_dump() per line, screenshots replaced by their screenshot_path
+	- screenshots/: the decoded images named by a hash of their content, identical screenshots are stored once
+	"""
+
+	def __init__(self, directory: str | Path):
+		self.directory = Path(directory)
+		self.history_file = self.directory / 'history.jsonl'
+		self.screenshots_dir = self.directory / 'screenshots'
+
+	def start_run(self, items: list[AgentHistory]) -> None:
+		"""
+		Start the history of a new run with the steps the agent already has, the history of a previous run in the same
+		directory is kept as history.<n>.jsonl instead of being mixed into this one
+		"""
+		if self.history_file.exists() and self.history_file.stat().st_size:
+			n = 1
+			while (rotated := self.directory / f'history.{n}.jsonl').exists():
+				n += 1
+			os.replace(self.history_file, rotated)
+			logger.debug(f'📜 Kept the previous history of {self.directory} as {rotated.name}')
+		else:
+			self.history_file.unlink(missing_ok=True)
+		for item in items:
+			self.append(item)
+
+	def append(self, item: AgentHistory) -> None:
+		"""Write the step to the end of the history, its screenshot_path points to the stored screenshot afterwards"""
+		screenshot = item.state.screenshot
+		if screenshot is not None and not item.state.screenshot_path:
+			item.state.screenshot_path = str(self.save_screenshot(screenshot))
+
+		data = item.model_dump()
+		data['state']['screenshot'] = None
+		if item.state.screenshot_path:
+			data['state']['screenshot_path'] = self._relative_path(Path(item.state.screenshot_path))
+
+		self.directory.mkdir(parents=True, exist_ok=True)
+		with open(self.history_file, 'a', encoding='utf-8') as f:
+			f.write(json.dumps(data) + '\n')
+
+	def save_screenshot(self, screenshot_b64: str) -> Path:
+		"""Store a base64 screenshot as an image file named by its content hash, returns the path of the file"""
+		image = base64.b64decode(screenshot_b64)
+		extension = SCREENSHOT_EXTENSIONS.get(screenshot_media_type(screenshot_b64), 'png')
+		path = self.screenshots_dir / f'{hashlib.blake2b(image, digest_size=16).hexdigest()}.{extension}'
+		if not path.exists():
+			self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+			# write and rename so an interrupted write never leaves a truncated image under the final name
+			tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+			tmp_path.write_bytes(image)
+			os.replace(tmp_path, path)
+		return path
+
+	def iter_history(self, output_model: type[AgentOutput], load_screenshots: bool = False) -> Iterator[AgentHistory]:
+		"""
+		Read the steps back one at a time. Screenshots stay on disk and are read on demand with
+		state.get_screenshot() unless load_screenshots is set.
+		"""
+		if not self.history_file.exists():
+			return
+
+		with open(self.history_file, encoding='utf-8') as f:
+			for line_number, line in enumerate(f, start=1):
+				if not line.strip():
+					continue
+				try:
+					data = json.loads(line)
+				except json.JSONDecodeError:
+					# the run was killed in the middle of writing this step
+					logger.warning(f'⚠️ Skipping incomplete step on line {line_number} of {self.history_file}')
+					continue
+
+				screenshot_path = data['state'].get('screenshot_path')
+				if screenshot_path:
+					data['state']['screenshot_path'] = str(self.directory / screenshot_path)
+				item = AgentHistory.load_from_dict(data, output_model)
+				if load_screenshots:
+					item.state.screenshot = item.state.get_screenshot()
+				yield item
+
+	def load(self, output_model: type[AgentOutput], load_screenshots: bool = False) -> AgentHistoryList:
+		"""All steps of the stored history"""
+		return AgentHistoryList(history=list(self.iter_history(output_model, load_screenshots)))
+
+	def _relative_path(self, path: Path) -> str:
+		# screenshots inside the store are referenced relative to it, so the directory can be moved as a whole
+		try:
+			return str(path.relative_to(self.directory))
+		except ValueError:
+			return str(path)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+
+from browser_use.agent.message_manager.token_counter import TokenCounter
+from browser_use.dom.views import DOMElementNode
+from browser_use.utils import time_execution_sync
+
+logger = logging.getLogger(__name__)
+
+# rows repeated at least this often are collapsed, keeping the first few as examples
+MIN_REPEATED_ROWS = 4
+KEPT_REPEATED_ROWS = 2
+
+KEYWORD_STOPWORDS = frozenset(
+	'the and for with from that this into your you then than are was were have has will all any use using '
+	'find click page website www http https com org net what which when where how who'.split()
+)
+
+
+@dataclass(slots=True)
+class _Line:
+	text: str
+	depth: int
+	highlight_index: int | None = None
+	score: float = 0.0
+	protected: bool = False  # never collapsed into a "similar rows" marker
+	signature: str = '#marker'
+
+
+def extract_task_keywords(task: str) -> set[str]:
+	"""Lowercased task words worth matching against element text, ASCII words need 3+ letters, other scripts 2+"""
+	keywords = set()
+	for word in re.findall(r'\w+', task.lower()):
+		if word in KEYWORD_STOPWORDS or word.isdigit():
+			continue
+		if len(word) >= 3 or (len(word) >= 2 and not word.isascii()):
+			keywords.add(word)
+	return keywords
+
+
+def _score_lines(element_tree: DOMElementNode, include_attributes: list[str] | None, task: str) -> list[_Line]:
+	"""Rank every line by novelty, viewport proximity and task keyword relevance"""
+	clickable_lines = element_tree.clickable_element_lines(include_attributes, dedupe_attributes=True)
+	keywords = extract_task_keywords(task)
+
+	lines: list[_Line] = []
+	in_viewport: list[bool] = []
+	for clickable_line in clickable_lines:
+		node = clickable_line.node
+		element = node if isinstance(node, DOMElementNode) else node.parent
+		is_element = isinstance(node, DOMElementNode)
+		line = _Line(
+			text=clickable_line.line,
+			depth=clickable_line.depth,
+			highlight_index=node.highlight_index if is_element else None,
+			signature=node.tag_name if is_element else '#text',
+		)
+
+		if is_element:
+			line.score += 1
+		if is_element and node.is_new:
+			line.score += 4
+			line.protected = True
+		if keywords:
+			lowered = line.text.lower()
+			matches = sum(1 for keyword in keywords if keyword in lowered)
+			if matches:
+				line.score += 1.5 * min(matches, 3)
+				line.protected = True
+
+		lines.append(line)
+		in_viewport.append(bool(element and element.is_in_viewport))
+
+	# viewport proximity: distance in lines to the closest line inside the viewport, both directions in two passes
+	distances = [0 if visible else len(lines) for visible in in_viewport]
+	for i in range(1, len(lines)):
+		distances[i] = min(distances[i], distances[i - 1] + 1)
+	for i in range(len(lines) - 2, -1, -1):
+		distances[i] = min(distances[i], distances[i + 1] + 1)
+	for line, distance in zip(lines, distances):
+		line.score += 3 if distance == 0 else 2 / (1 + distance / 10)
+
+	return lines
+
+
+def _collapse_repeated_rows(lines: list[_Line]) -> list[_Line]:
+	"""Replace long runs of structurally identical sibling rows with a single '×N similar rows' line"""
+
+	def row_end(start: int, end: int) -> int:
+		i = start + 1
+		while i < end and lines[i].depth > lines[start].depth:
+			i += 1
+		return i
+
+	def row_signature(start: int, end: int) -> tuple[tuple[int, str], ...]:
+		return tuple((lines[i].depth - lines[start].depth, lines[i].signature) for i in range(start, end))
+
+	def collapse(start: int, end: int) -> list[_Line]:
+		result: list[_Line] = []
+		i = start
+		while i < end:
+			first_end = row_end(i, end)
+			signature = row_signature(i, first_end)
+			rows = [(i, first_end)]
+			j = first_end
+			while j < end and lines[j].depth == lines[i].depth:
+				next_end = row_end(j, end)
+				if row_signature(j, next_end) != signature:
+					break
+				rows.append((j, next_end))
+				j = next_end
+
+			collapsed: list[tuple[int, int]] = []
+			for row_number, (row_start, row_stop) in enumerate(rows):
+				keep = (
+					len(rows) < MIN_REPEATED_ROWS
+					or row_number < KEPT_REPEATED_ROWS
+					or any(lines[k].protected for k in range(row_start, row_stop))
+				)
+				if not keep:
+					collapsed.append((row_start, row_stop))
+					continue
+				if collapsed:
+					result.append(_collapsed_marker(lines, collapsed))
+					collapsed = []
+				result.append(lines[row_start])
+				result.extend(collapse(row_start + 1, row_stop))
+			if collapsed:
+				result.append(_collapsed_marker(lines, collapsed))
+			i = j
+		return result
+
+	return collapse(0, len(lines))
+
+
+def _collapsed_marker(lines: list[_Line], rows: list[tuple[int, int]]) -> _Line:
+	depth = lines[rows[0][0]].depth
+	indices = [lines[k].highlight_index for start, stop in rows for k in range(start, stop)]
+	indices = [index for index in indices if index is not None]
+	index_range = f' (indices {min(indices)}-{max(indices)})' if indices else ''
+	depth_str = depth * '\t'
+	return _Line(text=f'{depth_str}... ×{len(rows)} similar rows{index_range} ...', depth=depth)
+
+
+def _omitted_marker(count: int) -> str:
+	return f'... {count} lines omitted ...'
+
+
+def _fit_to_budget(lines: list[_Line], token_budget: int, token_counter: TokenCounter) -> str:
+	"""Keep the best ranked lines that fit the budget, in page order, gaps replaced by an omission marker"""
+	costs = [token_counter.count(line.text) + 1 for line in lines]
+	marker_cost = token_counter.count(_omitted_marker(len(lines))) + 1
+
+	# ties are broken by page order so the result is deterministic
+	ranking = sorted(range(len(lines)), key=lambda i: (-lines[i].score, i))
+	kept: set[int] = set()
+	remaining = token_budget - marker_cost  # the tail can always end in a gap
+	for i in ranking:
+		# every kept line can open at most one new gap before it
+		cost = costs[i] + marker_cost
+		if cost <= remaining:
+			kept.add(i)
+			remaining -= cost
+
+	while True:
+		text = _render_kept(lines, kept)
+		if token_counter.count(text) <= token_budget:
+			return text
+		if not kept:
+			return ''  # not even the omission marker fits
+		# counts of separate lines do not always add up exactly, drop the worst kept line until it fits
+		kept.discard(min(kept, key=lambda i: (lines[i].score, -i)))
+
+
+def _render_kept(lines: list[_Line], kept: set[int]) -> str:
+	output: list[str] = []
+	omitted = 0
+	for i, line in enumerate(lines):
+		if i in kept:
+			if omitted:
+				output.append(_omitted_marker(omitted))
+				omitted = 0
+			output.append(line.text)
+		else:
+			omitted += 1
+	if omitted:
+		output.append(_omitted_marker(omitted))
+	return '\n'.join(output)
+
+
+@time_execution_sync('--compress_clickable_elements')
+def compress_clickable_elements(
+	element_tree: DOMElementNode,
+	include_attributes: list[str] | None,
+	token_budget: int,
+	token_counter: TokenCounter,
+	task: str = '',
+) -> str:
+	"""
+	clickable_elements_to_string() squeezed into token_budget, a listing that fits is returned unchanged,
+	otherwise each stage only runs while still over budget:
+	1. attributes repeating the text or another attribute are dropped
+	2. long runs of similar rows are collapsed, new and task relevant rows are kept
+	3. the lowest ranked lines are omitted (ranked by novelty, viewport proximity and task keywords)
+	"""
+	text = element_tree.clickable_elements_to_string(include_attributes)
+	if token_counter.count(text) <= token_budget:
+		return text
+
+	lines = _score_lines(element_tree, include_attributes, task)
+	text = '\n'.join(line.text for line in lines)
+	if token_counter.count(text) <= token_budget:
+		return text
+
+	lines = _collapse_repeated_rows(lines)
+	text = '\n'.join(line.text for line in lines)
+	if token_counter.count(text) <= token_budget:
+		return text
+
+	logger.debug(f'Clickable elements still over {token_budget} tokens after collapsing similar rows, omitting low ranked lines')
+	return _fit_to_budget(lines, token_budget, token_counter)
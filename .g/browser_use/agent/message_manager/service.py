@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
 import shutil
@@ -13,6 +14,7 @@ from langchain_core.messages import (
 )
 from pydantic import BaseModel
 
+from browser_use.agent.message_manager.token_counter import TokenCounter, Tokenizer, create_token_counter
 from browser_use.agent.message_manager.views import MessageMetadata
 from browser_use.agent.prompts import AgentMessagePrompt
 from browser_use.agent.views import ActionResult, AgentOutput, AgentStepInfo, MessageManagerState
@@ -183,9 +185,27 @@ def _log_format_message_line(
 # ========== End of Logging Helper Functions ==========
 
 
+def _message_text(message: BaseMessage) -> str:
+	if isinstance(message.content, str):
+		return message.content
+	return ''.join(item.get('text', '') for item in message.content if isinstance(item, dict))
+
+
+def _message_fingerprint(message: BaseMessage) -> bytes:
+	"""Identifies the exact bytes a message contributes to the prompt"""
+	payload = repr((message.__class__.__name__, message.content, getattr(message, 'tool_calls', None)))
+	return hashlib.blake2b(payload.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+
+
 class MessageManagerSettings(BaseModel):
 	max_input_tokens: int = 128000
 	estimated_characters_per_token: int = 3
+	tokenizer: Tokenizer = 'estimate'  # 'tiktoken' or 'model' count real tokens, needed for CJK/Vietnamese pages
+	tiktoken_encoding: str = 'o200k_base'
+	max_elements_tokens: int | None = None  # compress the interactive elements of each state message to this budget
+	# keep the history append-only and per-step content in the state message at the tail, so providers can cache the prefix
+	cache_friendly_layout: bool = False
+	cache_breakpoints: bool = False  # mark the end of the stable prefix with cache_control (Anthropic prompt caching)
 	image_tokens: int = 800
 	include_attributes: list[str] = []
 	message_context: str | None = None
@@ -201,11 +221,22 @@ class MessageManager:
 		system_message: SystemMessage,
 		settings: MessageManagerSettings = MessageManagerSettings(),
 		state: MessageManagerState = MessageManagerState(),
+		token_counter: TokenCounter | None = None,
 	):
 		self.task = task
 		self.settings = settings
 		self.state = state
 		self.system_prompt = system_message
+		self.token_counter = token_counter or create_token_counter(
+			settings.tokenizer,
+			characters_per_token=settings.estimated_characters_per_token,
+			tiktoken_encoding=settings.tiktoken_encoding,
+		)
+		# per-step content that only belongs in the next state message, see add_volatile_message()
+		self._volatile_context: list[str] = []
+		# fingerprints of the messages sent with the previous request, to measure how much of the prompt is cacheable
+		self._last_request_fingerprints: list[bytes] = []
+		self.last_cacheable_prefix_ratio: float | None = None
 
 		# Only initialize messages if state is empty
 		if len(self.state.history.messages) == 0:
@@ -316,9 +347,24 @@ class MessageManager:
 			result=result,
 			include_attributes=self.settings.include_attributes,
 			step_info=step_info,
+			task=self.task,
+			max_elements_tokens=self.settings.max_elements_tokens,
+			token_counter=self.token_counter,
+			volatile_context=self._volatile_context,
 		).get_user_message(use_vision)
+		self._volatile_context = []
 		self._add_message_with_tokens(state_message)
 
+	def add_volatile_message(self, content: str) -> None:
+		"""Add a message that only matters for the current step, like page specific actions or the last step warning.
+		With cache_friendly_layout it is rendered at the end of the next state message instead of
+		being stored in the history, so the history stays append-only and byte-stable between steps.
+		"""
+		if self.settings.cache_friendly_layout:
+			self._volatile_context.append(content)
+		else:
+			self._add_message_with_tokens(HumanMessage(content=content))
+
 	def add_model_output(self, model_output: AgentOutput) -> None:
 		"""Add model output as AI message"""
 		tool_calls = [
@@ -387,6 +433,56 @@ class MessageManager:
 
 		return msg
 
+	def get_request_messages(self) -> list[BaseMessage]:
+		"""Messages for the next agent LLM request: records the cacheable prefix ratio and adds cache breakpoints if enabled"""
+		msg = self.get_messages()
+
+		self._update_cacheable_prefix_ratio()
+		if self.settings.cache_breakpoints:
+			msg = self._add_cache_breakpoints(msg)
+
+		return msg
+
+	def _update_cacheable_prefix_ratio(self) -> None:
+		"""Estimate the share of prompt tokens that repeat the start of the previous request and can be served from cache"""
+		fingerprints = [_message_fingerprint(m.message) for m in self.state.history.messages]
+		common = 0
+		for previous, current in zip(self._last_request_fingerprints, fingerprints):
+			if previous != current:
+				break
+			common += 1
+		self._last_request_fingerprints = fingerprints
+
+		total_tokens = self.state.history.current_tokens
+		prefix_tokens = sum(m.metadata.tokens for m in self.state.history.messages[:common])
+		self.last_cacheable_prefix_ratio = prefix_tokens / total_tokens if total_tokens else 0.0
+		logger.debug(
+			f'🗃️ Cacheable prompt prefix: {self.last_cacheable_prefix_ratio:.0%} '
+			f'({common}/{len(fingerprints)} messages unchanged since the last request)'
+		)
+
+	def _add_cache_breakpoints(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+		"""Mark the system prompt and the last message before the current state with cache_control.
+		Copies are returned, the history itself is never modified.
+		"""
+		messages = list(messages)
+		stable_end = len(messages) - 1  # the last message is the state of the current step
+		breakpoints = [0] if messages and isinstance(messages[0], SystemMessage) else []
+		for i in range(stable_end - 1, 0, -1):
+			if isinstance(messages[i], HumanMessage | AIMessage | SystemMessage) and _message_text(messages[i]):
+				breakpoints.append(i)
+				break
+
+		for i in breakpoints:
+			content = messages[i].content
+			blocks = [{'type': 'text', 'text': content}] if isinstance(content, str) else [dict(block) for block in content]
+			for block in reversed(blocks):
+				if isinstance(block, dict) and block.get('type') == 'text':
+					block['cache_control'] = {'type': 'ephemeral'}
+					break
+			messages[i] = messages[i].model_copy(update={'content': blocks})
+		return messages
+
 	def _add_message_with_tokens(
 		self, message: BaseMessage, position: int | None = None, message_type: str | None = None
 	) -> None:
@@ -462,8 +558,7 @@ class MessageManager:
 
 	def _count_text_tokens(self, text: str) -> int:
 		"""Count tokens in a text string"""
-		tokens = len(text) // self.settings.estimated_characters_per_token  # Rough estimate if no tokenizer available
-		return tokens
+		return self.token_counter.count(text)
 
 	def cut_messages(self):
 		"""Get current message list, potentially trimmed to max tokens"""
@@ -493,21 +588,17 @@ class MessageManager:
 		if diff <= 0:
 			return None
 
-		# if still over, remove text from state message proportionally to the number of tokens needed with buffer
-		# Calculate the proportion of content to remove
+		# if still over, cut the state message down to exactly the tokens that are left in the budget
 		proportion_to_remove = diff / msg.metadata.tokens
 		if proportion_to_remove > 0.99:
 			raise ValueError(
 				f'Max token limit reached - history is too long - reduce the system prompt or task. '
 				f'proportion_to_remove: {proportion_to_remove}'
 			)
-		logger.debug(
-			f'Removing {proportion_to_remove * 100:.2f}% of the last message  {proportion_to_remove * msg.metadata.tokens:.2f} / {msg.metadata.tokens:.2f} tokens)'
-		)
+		token_budget = msg.metadata.tokens - diff
+		logger.debug(f'Cutting the last message from {msg.metadata.tokens} to {token_budget} tokens')
 
-		content = msg.message.content
-		characters_to_remove = int(len(content) * proportion_to_remove)
-		content = content[:-characters_to_remove]
+		content = self.token_counter.truncate(msg.message.content, token_budget)
 
 		# remove tokens and old long message
 		self.state.history.remove_last_state_message()
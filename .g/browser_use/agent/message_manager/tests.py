@@ -3,7 +3,9 @@ from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_openai import AzureChatOpenAI, ChatOpenAI
 
+from browser_use.agent.message_manager.compression import compress_clickable_elements
 from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
+from browser_use.agent.message_manager.token_counter import CachedTokenCounter, EstimateTokenCounter, TokenCounter
 from browser_use.agent.views import ActionResult
 from browser_use.browser.views import BrowserStateSummary, TabInfo
 from browser_use.dom.views import DOMElementNode, DOMTextNode
@@ -234,4 +236,192 @@ def test_token_overflow_handling_with_real_flow(message_manager: MessageManager,
 		assert message_manager.state.history.current_tokens == total_tokens
 
 
+class CharacterTokenCounter(TokenCounter):
+	"""One token per character, a stand-in for a tokenizer that counts CJK characters individually"""
+
+	def __init__(self):
+		self.calls = 0
+
+	def count(self, text: str) -> int:
+		self.calls += 1
+		return len(text)
+
+
+@pytest.mark.parametrize('max_tokens', [0, 1, 5, 17])
+def test_truncate_fits_exact_budget(max_tokens: int):
+	text = 'Xin chào thế giới 你好世界'
+	for counter in [EstimateTokenCounter(3), CharacterTokenCounter()]:
+		truncated = counter.truncate(text, max_tokens)
+		assert text.startswith(truncated)
+		assert counter.count(truncated) <= max_tokens
+		# one more character would not fit anymore
+		if truncated != text:
+			assert counter.count(text[: len(truncated) + 1]) > max_tokens
+
+
+def test_cached_token_counter_counts_each_text_once():
+	inner = CharacterTokenCounter()
+	counter = CachedTokenCounter(inner, maxsize=2)
+
+	assert counter.count('你好') == counter.count('你好') == 2
+	assert inner.calls == 1
+
+	counter.count('a')
+	counter.count('bb')  # evicts '你好'
+	counter.count('你好')
+	assert inner.calls == 4
+
+
+def test_cut_messages_trims_state_message_to_exact_budget():
+	message_manager = MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='Test actions'),
+		settings=MessageManagerSettings(max_input_tokens=100000),
+		token_counter=CharacterTokenCounter(),
+	)
+	message_manager._add_message_with_tokens(HumanMessage(content='你好世界' * 1000))
+
+	message_manager.settings.max_input_tokens = message_manager.state.history.current_tokens - 1234
+	message_manager.cut_messages()
+
+	assert message_manager.state.history.current_tokens == message_manager.settings.max_input_tokens
+
+
+def build_results_page(rows: int) -> DOMElementNode:
+	"""A search box followed by a long list of structurally identical result rows"""
+	body = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None)
+	search = DOMElementNode(
+		tag_name='input',
+		xpath='/body/input',
+		attributes={'type': 'search', 'placeholder': 'Search', 'aria-label': 'Search'},
+		children=[],
+		is_visible=True,
+		is_in_viewport=True,
+		highlight_index=0,
+		parent=body,
+	)
+	body.children.append(search)
+	for i in range(1, rows + 1):
+		link = DOMElementNode(
+			tag_name='a',
+			xpath=f'/body/a[{i}]',
+			attributes={'title': f'Result {i}'},
+			children=[],
+			is_visible=True,
+			is_in_viewport=i < 5,
+			highlight_index=i,
+			is_new=i == 30,
+			parent=body,
+		)
+		link.children.append(
+			DOMTextNode(text=f'Result {i}' if i != 20 else 'Cheap flights to Hanoi', is_visible=True, parent=link)
+		)
+		body.children.append(link)
+	return body
+
+
+def test_compression_keeps_full_listing_when_it_fits():
+	tree = build_results_page(rows=3)
+	compressed = compress_clickable_elements(tree, ['title', 'type'], token_budget=10000, token_counter=EstimateTokenCounter())
+
+	assert compressed == tree.clickable_elements_to_string(['title', 'type'])
+
+
+def test_compression_drops_repeated_attributes_only_when_over_budget():
+	tree = build_results_page(rows=3)
+	counter = EstimateTokenCounter()
+	deduped = tree.clickable_elements_to_string(['type'])  # title only repeated the link text
+	assert counter.count(deduped) < counter.count(tree.clickable_elements_to_string(['title', 'type']))
+
+	compressed = compress_clickable_elements(tree, ['title', 'type'], token_budget=counter.count(deduped), token_counter=counter)
+
+	assert compressed == deduped
+
+
+def test_compression_collapses_similar_rows_but_keeps_relevant_ones():
+	tree = build_results_page(rows=40)
+	counter = EstimateTokenCounter()
+	budget = counter.count(tree.clickable_elements_to_string(['title'])) // 2
+
+	compressed = compress_clickable_elements(
+		tree, ['title'], token_budget=budget, token_counter=counter, task='Find flights to Hanoi'
+	)
+
+	assert counter.count(compressed) <= budget
+	assert 'similar rows' in compressed
+	assert '[1]<a >Result 1 />' in compressed
+	assert '*[30]*<a >Result 30 />' in compressed  # new element
+	assert "[20]<a title='Result 20'>Cheap flights to Hanoi />" in compressed  # matches the task
+	assert '[25]<a' not in compressed
+
+
+@pytest.mark.parametrize('budget', [5, 40, 150])
+def test_compression_fits_budget_deterministically(budget: int):
+	tree = build_results_page(rows=40)
+	counter = CharacterTokenCounter()
+
+	compressed = compress_clickable_elements(tree, ['title'], token_budget=budget, token_counter=counter, task='flights')
+
+	assert counter.count(compressed) <= budget
+	assert compressed == compress_clickable_elements(tree, ['title'], token_budget=budget, token_counter=counter, task='flights')
+
+
+def run_steps(message_manager: MessageManager, steps: int) -> list[list]:
+	"""Simulate agent steps with page specific actions, returns the messages sent for every request"""
+	from browser_use.agent.views import AgentBrain, AgentOutput
+
+	requests = []
+	for i in range(steps):
+		state = BrowserStateSummary(
+			url=f'https://test.com/{i}',
+			title=f'Test Page {i}',
+			element_tree=DOMElementNode(tag_name='div', attributes={}, children=[], is_visible=True, parent=None, xpath='//div'),
+			selector_map={},
+			tabs=[TabInfo(page_id=1, url=f'https://test.com/{i}', title=f'Test Page {i}')],
+		)
+		message_manager.add_volatile_message(f'For this page, these additional actions are available:\nsearch_page_{i}')
+		message_manager.add_state_message(browser_state_summary=state, result=[ActionResult(extracted_content=f'Step {i} done')])
+		requests.append(message_manager.get_request_messages())
+		message_manager._remove_last_state_message()
+		message_manager.add_model_output(
+			AgentOutput(
+				current_state=AgentBrain(evaluation_previous_goal='ok', memory=f'step {i}', next_goal='next'),
+				action=[],
+			)
+		)
+	return requests
+
+
+def test_cache_friendly_layout_keeps_step_content_out_of_history():
+	message_manager = MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='Test actions'),
+		settings=MessageManagerSettings(cache_friendly_layout=True),
+	)
+	requests = run_steps(message_manager, steps=3)
+
+	# page specific actions are only part of the state message of their own step
+	assert 'search_page_2' in requests[2][-1].content
+	assert not any('search_page' in str(m.message.content) for m in message_manager.state.history.messages)
+
+	# every request starts with the complete previous request, except its state message
+	for previous, current in zip(requests, requests[1:]):
+		assert current[: len(previous) - 1] == previous[:-1]
+	assert message_manager.last_cacheable_prefix_ratio is not None and message_manager.last_cacheable_prefix_ratio > 0.5
+
+
+def test_cache_breakpoints_only_mark_the_request_copy():
+	message_manager = MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='Test actions'),
+		settings=MessageManagerSettings(cache_friendly_layout=True, cache_breakpoints=True),
+	)
+	request = run_steps(message_manager, steps=2)[-1]
+
+	marked = [i for i, m in enumerate(request) if isinstance(m.content, list) and 'cache_control' in m.content[-1]]
+	assert marked[0] == 0  # system prompt
+	assert len(marked) == 2 and marked[1] < len(request) - 1  # end of the stable history, not the state message
+	assert all(isinstance(m.message.content, str) for m in message_manager.state.history.messages[:2])
+
+
 # pytest -s browser_use/agent/message_manager/tests.py
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+	from langchain_core.language_models.chat_models import BaseChatModel
+
+logger = logging.getLogger(__name__)
+
+Tokenizer = Literal['estimate', 'tiktoken', 'model']
+
+
+class TokenCounter(ABC):
+	"""Counts tokens in text and cuts text down to a token budget"""
+
+	@abstractmethod
+	def count(self, text: str) -> int:
+		pass
+
+	def truncate(self, text: str, max_tokens: int) -> str:
+		"""Longest prefix of text that fits in max_tokens, binary search over the prefix length"""
+		if self.count(text) <= max_tokens:
+			return text
+
+		low, high = 0, len(text)
+		while low < high:
+			mid = (low + high + 1) // 2
+			if self.count(text[:mid]) <= max_tokens:
+				low = mid
+			else:
+				high = mid - 1
+		return text[:low]
+
+
+class EstimateTokenCounter(TokenCounter):
+	"""Fixed characters per token, cheap but far off for CJK and Vietnamese text"""
+
+	def __init__(self, characters_per_token: int = 3):
+		self.characters_per_token = characters_per_token
+
+	def count(self, text: str) -> int:
+		return len(text) // self.characters_per_token
+
+	def truncate(self, text: str, max_tokens: int) -> str:
+		return text[: max(0, (max_tokens + 1) * self.characters_per_token - 1)]
+
+
+class TiktokenTokenCounter(TokenCounter):
+	"""BPE token counts from tiktoken, the encoding is only loaded on first use"""
+
+	def __init__(self, encoding_name: str = 'o200k_base', fallback: TokenCounter | None = None):
+		self.encoding_name = encoding_name
+		self.fallback = fallback or EstimateTokenCounter()
+		self._encoding: Any = None
+		self._unavailable = False
+
+	def _get_encoding(self) -> Any:
+		if self._encoding is None and not self._unavailable:
+			try:
+				import tiktoken
+
+				self._encoding = tiktoken.get_encoding(self.encoding_name)
+			except Exception as e:
+				# tiktoken is missing or could not download the encoding (offline), keep working with estimates
+				self._unavailable = True
+				logger.warning(f'⚠️ Could not load tiktoken encoding {self.encoding_name}, estimating tokens instead: {e}')
+		return self._encoding
+
+	def count(self, text: str) -> int:
+		encoding = self._get_encoding()
+		if encoding is None:
+			return self.fallback.count(text)
+		return len(encoding.encode(text, disallowed_special=()))
+
+	def truncate(self, text: str, max_tokens: int) -> str:
+		encoding = self._get_encoding()
+		if encoding is None:
+			return self.fallback.truncate(text, max_tokens)
+
+		tokens = encoding.encode(text, disallowed_special=())
+		if len(tokens) <= max_tokens:
+			return text
+		# a multi-byte character split at the cut is dropped instead of turning into a replacement character
+		truncated = encoding.decode_bytes(tokens[: max(0, max_tokens)]).decode('utf-8', errors='ignore')
+		# re-encoding the cut text can merge differently, make sure it really fits
+		while truncated and self.count(truncated) > max_tokens:
+			truncated = truncated[:-1]
+		return truncated
+
+
+class ModelTokenCounter(TokenCounter):
+	"""Token counts from the chat model's own tokenizer via langchain's get_num_tokens()"""
+
+	def __init__(self, llm: BaseChatModel):
+		self.llm = llm
+
+	def count(self, text: str) -> int:
+		return self.llm.get_num_tokens(text)
+
+
+class CachedTokenCounter(TokenCounter):
+	"""LRU cache of token counts keyed by a hash of the text, so long texts are not kept alive by the cache"""
+
+	def __init__(self, counter: TokenCounter, maxsize: int = 1024):
+		self.counter = counter
+		self.maxsize = maxsize
+		self._cache: OrderedDict[bytes, int] = OrderedDict()
+
+	def count(self, text: str) -> int:
+		key = hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+		tokens = self._cache.get(key)
+		if tokens is not None:
+			self._cache.move_to_end(key)
+			return tokens
+
+		tokens = self._cache[key] = self.counter.count(text)
+		if len(self._cache) > self.maxsize:
+			self._cache.popitem(last=False)
+		return tokens
+
+	def truncate(self, text: str, max_tokens: int) -> str:
+		if isinstance(self.counter, TiktokenTokenCounter | EstimateTokenCounter):
+			return self.counter.truncate(text, max_tokens)
+		# the generic binary search goes through the cached count()
+		return super().truncate(text, max_tokens)
+
+
+def create_token_counter(
+	tokenizer: Tokenizer,
+	characters_per_token: int = 3,
+	tiktoken_encoding: str = 'o200k_base',
+	llm: BaseChatModel | None = None,
+) -> TokenCounter:
+	"""Build the token counter selected by MessageManagerSettings.tokenizer"""
+	estimate = EstimateTokenCounter(characters_per_token)
+	if tokenizer == 'estimate':
+		return estimate
+	if tokenizer == 'tiktoken':
+		return CachedTokenCounter(TiktokenTokenCounter(tiktoken_encoding, fallback=estimate))
+	if tokenizer == 'model':
+		if llm is None:
+			raise ValueError("tokenizer='model' needs the llm whose tokenizer should be used")
+		return CachedTokenCounter(ModelTokenCounter(llm))
+	raise ValueError(f'Unknown tokenizer: {tokenizer}')
@@ -4,7 +4,11 @@ from typing import TYPE_CHECKING, Optional
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from browser_use.agent.message_manager.compression import compress_clickable_elements
+from browser_use.browser.views import screenshot_media_type
+
 if TYPE_CHECKING:
+	from browser_use.agent.message_manager.token_counter import TokenCounter
 	from browser_use.agent.views import ActionResult, AgentStepInfo
 	from browser_use.browser.views import BrowserStateSummary
 
@@ -66,15 +70,32 @@ class AgentMessagePrompt:
 		result: list['ActionResult'] | None = None,
 		include_attributes: list[str] | None = None,
 		step_info: Optional['AgentStepInfo'] = None,
+		task: str = '',
+		max_elements_tokens: int | None = None,
+		token_counter: Optional['TokenCounter'] = None,
+		volatile_context: list[str] | None = None,
 	):
 		self.state: 'BrowserStateSummary' = browser_state_summary
 		self.result = result
 		self.include_attributes = include_attributes or []
 		self.step_info = step_info
+		self.task = task
+		self.max_elements_tokens = max_elements_tokens
+		self.token_counter = token_counter
+		self.volatile_context = volatile_context or []
 		assert self.state
 
 	def get_user_message(self, use_vision: bool = True) -> HumanMessage:
-		elements_text = self.state.element_tree.clickable_elements_to_string(include_attributes=self.include_attributes)
+		if self.max_elements_tokens is not None and self.token_counter is not None:
+			elements_text = compress_clickable_elements(
+				self.state.element_tree,
+				include_attributes=self.include_attributes,
+				token_budget=self.max_elements_tokens,
+				token_counter=self.token_counter,
+				task=self.task,
+			)
+		else:
+			elements_text = self.state.element_tree.clickable_elements_to_string(include_attributes=self.include_attributes)
 
 		has_content_above = (self.state.pixels_above or 0) > 0
 		has_content_below = (self.state.pixels_below or 0) > 0
@@ -123,6 +144,9 @@ Interactive elements from top layer of the current page inside the viewport:
 					error = result.error.split('\n')[-1]
 					state_description += f'\nAction error {i + 1}/{len(self.result)}: ...{error}'
 
+		for context in self.volatile_context:
+			state_description += f'\n{context}'
+
 		if self.state.screenshot and use_vision is True:
 			# Format message for vision model
 			return HumanMessage(
@@ -130,7 +154,9 @@ Interactive elements from top layer of the current page inside the viewport:
 					{'type': 'text', 'text': state_description},
 					{
 						'type': 'image_url',
-						'image_url': {'url': f'data:image/png;base64,{self.state.screenshot}'},  # , 'detail': 'low'
+						'image_url': {
+							'url': f'data:{screenshot_media_type(self.state.screenshot)};base64,{self.state.screenshot}'
+						},  # , 'detail': 'low'
 					},
 				]
 			)
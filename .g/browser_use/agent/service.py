@@ -7,15 +7,17 @@ import os
 import re
 import shutil
 import sys
+import tempfile
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from contextlib import suppress
 from pathlib import Path
 from threading import Thread
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Literal, TypeVar
 
 from dotenv import load_dotenv
 
-from browser_use.browser.session import DEFAULT_BROWSER_PROFILE
+from browser_use.browser.session import DEFAULT_BROWSER_PROFILE, StatePrefetch
 
 load_dotenv()
 
@@ -28,9 +30,11 @@ from langchain_core.messages import (
 from playwright.async_api import Browser, BrowserContext, Page
 from pydantic import BaseModel, ValidationError
 
-from browser_use.agent.gif import create_history_gif
+from browser_use.agent.gif import HistoryRecorder
+from browser_use.agent.history_store import HistoryStore
 from browser_use.agent.memory import Memory, MemoryConfig
 from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
+from browser_use.agent.message_manager.token_counter import Tokenizer, create_token_counter
 from browser_use.agent.message_manager.utils import (
 	convert_input_messages,
 	extract_json_from_model_output,
@@ -38,6 +42,7 @@ from browser_use.agent.message_manager.utils import (
 	save_conversation,
 )
 from browser_use.agent.prompts import AgentMessagePrompt, PlannerPrompt, SystemPrompt
+from browser_use.agent.streaming import StreamedActions
 from browser_use.agent.views import (
 	ActionResult,
 	AgentError,
@@ -61,6 +66,7 @@ from browser_use.dom.history_tree_processor.service import (
 	DOMHistoryElement,
 	HistoryTreeProcessor,
 )
+from browser_use.dom.views import SelectorMap
 from browser_use.exceptions import LLMException
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import (
@@ -73,6 +79,11 @@ logger = logging.getLogger(__name__)
 SKIP_LLM_API_KEY_VERIFICATION = os.environ.get('SKIP_LLM_API_KEY_VERIFICATION', 'false').lower()[0] in 'ty1'
 
 
+async def _iterate_actions(actions: list[ActionModel]) -> AsyncIterator[ActionModel]:
+	for action in actions:
+		yield action
+
+
 def log_response(response: AgentOutput, registry=None) -> None:
 	"""Utility function to log the model's response."""
 
@@ -89,6 +100,7 @@ def log_response(response: AgentOutput, registry=None) -> None:
 
 
 Context = TypeVar('Context')
+T = TypeVar('T')
 
 AgentHookFunc = Callable[['Agent'], Awaitable[None]]
 
@@ -126,11 +138,17 @@ class Agent(Generic[Context]):
 		use_vision_for_planner: bool = False,
 		save_conversation_path: str | None = None,
 		save_conversation_path_encoding: str | None = 'utf-8',
+		save_history_path: str | None = None,
+		max_screenshots_in_memory: int | None = None,
+		evicted_screenshots: Literal['disk', 'drop'] = 'disk',
 		max_failures: int = 3,
 		retry_delay: int = 10,
 		override_system_message: str | None = None,
 		extend_system_message: str | None = None,
 		max_input_tokens: int = 128000,
+		tokenizer: Tokenizer = 'estimate',
+		max_elements_tokens: int | None = None,
+		cache_friendly_prompt: bool = False,
 		validate_output: bool = False,
 		message_context: str | None = None,
 		generate_gif: bool | str = False,
@@ -148,7 +166,10 @@ class Agent(Generic[Context]):
 			'data-date-format',
 		],
 		max_actions_per_step: int = 10,
+		pipelined_steps: bool = False,
 		tool_calling_method: ToolCallingMethod | None = 'auto',
+		stream_llm_output: bool = False,
+		stream_actions: bool = False,
 		page_extraction_llm: BaseChatModel | None = None,
 		planner_llm: BaseChatModel | None = None,
 		planner_interval: int = 1,  # Run planner every N steps
@@ -175,18 +196,27 @@ class Agent(Generic[Context]):
 			use_vision_for_planner=use_vision_for_planner,
 			save_conversation_path=save_conversation_path,
 			save_conversation_path_encoding=save_conversation_path_encoding,
+			save_history_path=save_history_path,
+			max_screenshots_in_memory=max_screenshots_in_memory,
+			evicted_screenshots=evicted_screenshots,
 			max_failures=max_failures,
 			retry_delay=retry_delay,
 			override_system_message=override_system_message,
 			extend_system_message=extend_system_message,
 			max_input_tokens=max_input_tokens,
+			tokenizer=tokenizer,
+			max_elements_tokens=max_elements_tokens,
+			cache_friendly_prompt=cache_friendly_prompt,
 			validate_output=validate_output,
 			message_context=message_context,
 			generate_gif=generate_gif,
 			available_file_paths=available_file_paths,
 			include_attributes=include_attributes,
 			max_actions_per_step=max_actions_per_step,
+			pipelined_steps=pipelined_steps,
 			tool_calling_method=tool_calling_method,
+			stream_llm_output=stream_llm_output,
+			stream_actions=stream_actions,
 			page_extraction_llm=page_extraction_llm,
 			planner_llm=planner_llm,
 			planner_interval=planner_interval,
@@ -201,11 +231,16 @@ class Agent(Generic[Context]):
 
 		# Initialize state
 		self.state = injected_agent_state or AgentState()
+		self.history_store = HistoryStore(self.settings.save_history_path) if self.settings.save_history_path else None
+		self._screenshot_spill_dir: tempfile.TemporaryDirectory | None = None  # removed by its finalizer, not on close()
+		self._screenshots_evicted_until = 0  # history items before this index hold no screenshot in memory
+		self._recorder: HistoryRecorder | None = None
 
 		# Action setup
 		self._setup_action_models()
 		self._set_browser_use_version_and_source(source)
 		self.initial_actions = self._convert_initial_actions(initial_actions) if initial_actions else None
+		self._state_prefetch: asyncio.Task[StatePrefetch] | None = None
 
 		# Model setup
 		self._set_model_names()
@@ -260,12 +295,18 @@ class Agent(Generic[Context]):
 			).get_system_message(),
 			settings=MessageManagerSettings(
 				max_input_tokens=self.settings.max_input_tokens,
+				tokenizer=self.settings.tokenizer,
+				max_elements_tokens=self.settings.max_elements_tokens,
+				cache_friendly_layout=self.settings.cache_friendly_prompt,
+				cache_breakpoints=self.settings.cache_friendly_prompt
+				and self.llm.__class__.__name__ in ['ChatAnthropic', 'AnthropicChat'],
 				include_attributes=self.settings.include_attributes,
 				message_context=self.settings.message_context,
 				sensitive_data=sensitive_data,
 				available_file_paths=self.settings.available_file_paths,
 			),
 			state=self.state.message_manager_state,
+			token_counter=create_token_counter('model', llm=self.llm) if self.settings.tokenizer == 'model' else None,
 		)
 
 		if self.enable_memory:
@@ -386,6 +427,10 @@ class Agent(Generic[Context]):
 			logger.info(f'Saving conversation to {self.settings.save_conversation_path}')
 		self._external_pause_event = asyncio.Event()
 		self._external_pause_event.set()
+		# set while paused or stopped, aborts in-flight LLM calls
+		self._interrupt_event = asyncio.Event()
+		if self.state.paused or self.state.stopped:
+			self._interrupt_event.set()
 
 	@property
 	def browser(self) -> Browser:
@@ -774,11 +819,15 @@ class Agent(Generic[Context]):
 		browser_state_summary = None
 		model_output = None
 		result: list[ActionResult] = []
+		# elements of this step's state converted by multi_act before a recapture patched their nodes in place
+		history_elements: dict[int, DOMHistoryElement] = {}
+		interacted_elements: list[DOMHistoryElement | None] | None = None
 		step_start_time = time.time()
+		page_load_wait_start = self.browser_session.page_load_wait_seconds
 		tokens = 0
 
 		try:
-			browser_state_summary = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=True)
+			browser_state_summary = await self._get_step_state_summary()
 			current_page = await self.browser_session.get_current_page()
 
 			self._log_step_context(current_page, browser_state_summary)
@@ -798,10 +847,11 @@ class Agent(Generic[Context]):
 			# If there are page-specific actions, add them as a special message for this step only
 			if page_filtered_actions:
 				page_action_message = f'For this page, these additional actions are available:\n{page_filtered_actions}'
-				self._message_manager._add_message_with_tokens(HumanMessage(content=page_action_message))
+				self._message_manager.add_volatile_message(page_action_message)
 
 			# If using raw tool calling method, we need to update the message context with new actions
-			if self.tool_calling_method == 'raw':
+			# (the cache friendly layout keeps the context stable, the page actions are in the state message already)
+			if self.tool_calling_method == 'raw' and not self.settings.cache_friendly_prompt:
 				# For raw tool calling, get all non-filtered actions plus the page-filtered ones
 				all_unfiltered_actions = self.controller.registry.get_prompt_description()
 				all_actions = all_unfiltered_actions
@@ -817,6 +867,19 @@ class Agent(Generic[Context]):
 					updated_context = f'Available actions: {all_actions}'
 				self._message_manager.settings.message_context = updated_context
 
+			last_step_message = None
+			if step_info and step_info.is_last_step():
+				# Add last step warning if needed
+				last_step_message = 'Now comes your last step. Use only the "done" action now. No other actions - so here your action sequence must have length 1.'
+				last_step_message += '\nIf the task is not yet fully finished as requested by the user, set success in "done" to false! E.g. if not all steps are fully completed.'
+				last_step_message += '\nIf the task is fully finished, set success in "done" to true.'
+				last_step_message += '\nInclude everything you found out for the ultimate task in the done text.'
+				logger.info('Last step finishing up')
+				self.AgentOutput = self.DoneAgentOutput
+				if self.settings.cache_friendly_prompt:
+					# rendered at the end of the state message below
+					self._message_manager.add_volatile_message(last_step_message)
+
 			self._message_manager.add_state_message(
 				browser_state_summary=browser_state_summary,
 				result=self.state.last_result,
@@ -827,24 +890,29 @@ class Agent(Generic[Context]):
 			# Run planner at specified intervals if planner is configured
 			if self.settings.planner_llm and self.state.n_steps % self.settings.planner_interval == 0:
 				plan = await self._run_planner()
-				# add plan before last state message
+				# add plan before last state message, it stays in the history so the history is still only appended to
 				self._message_manager.add_plan(plan, position=-1)
 
-			if step_info and step_info.is_last_step():
-				# Add last step warning if needed
-				msg = 'Now comes your last step. Use only the "done" action now. No other actions - so here your action sequence must have length 1.'
-				msg += '\nIf the task is not yet fully finished as requested by the user, set success in "done" to false! E.g. if not all steps are fully completed.'
-				msg += '\nIf the task is fully finished, set success in "done" to true.'
-				msg += '\nInclude everything you found out for the ultimate task in the done text.'
-				logger.info('Last step finishing up')
-				self._message_manager._add_message_with_tokens(HumanMessage(content=msg))
-				self.AgentOutput = self.DoneAgentOutput
+			if last_step_message and not self.settings.cache_friendly_prompt:
+				self._message_manager._add_message_with_tokens(HumanMessage(content=last_step_message))
 
-			input_messages = self._message_manager.get_messages()
+			input_messages = self._message_manager.get_request_messages()
 			tokens = self._message_manager.state.history.current_tokens
 
+			# actions are executed while the output streams in, starting with the first complete one
+			streamed_actions: StreamedActions | None = None
+			acting: asyncio.Task[list[ActionResult]] | None = None
+			if self.settings.stream_actions and self.tool_calling_method == 'raw':
+				action_model = self.DoneActionModel if self.AgentOutput is self.DoneAgentOutput else self.ActionModel
+				streamed_actions = StreamedActions(action_model, max_actions=self.settings.max_actions_per_step)
+				acting = asyncio.create_task(self.multi_act(streamed_actions, history_elements=history_elements))
+
+			# with incremental dom snapshots a capture patches the tree of this step's state, which the actions still need
+			elif self.settings.pipelined_steps and not self.browser_profile.incremental_dom_snapshots:
+				self._start_state_prefetch()
+
 			try:
-				model_output = await self.get_next_action(input_messages)
+				model_output = await self.get_next_action(input_messages, streamed_actions)
 				if (
 					not model_output.action
 					or not isinstance(model_output.action, list)
@@ -892,19 +960,35 @@ class Agent(Generic[Context]):
 			except asyncio.CancelledError:
 				# Task was cancelled due to Ctrl+C
 				self._message_manager._remove_last_state_message()
+				await self._abort_streamed_actions(streamed_actions, acting)
 				raise InterruptedError('Model query cancelled by user')
 			except InterruptedError:
 				# Agent was paused during get_next_action
 				self._message_manager._remove_last_state_message()
+				await self._abort_streamed_actions(streamed_actions, acting)
 				raise  # Re-raise to be caught by the outer try/except
 			except Exception as e:
 				# model call failed, remove last state message from history
 				self._message_manager._remove_last_state_message()
+				await self._abort_streamed_actions(streamed_actions, acting)
 				raise e
 
-			result: list[ActionResult] = await self.multi_act(model_output.action)
+			if streamed_actions is not None and acting is not None:
+				streamed_actions.close(model_output.action)
+				result = await acting
+			else:
+				await self._settle_state_prefetch(model_output.action)
+				result: list[ActionResult] = await self.multi_act(model_output.action, history_elements=history_elements)
 
 			self.state.last_result = result
+			# before the prefetch below can patch the nodes of this step's selector map
+			interacted_elements = AgentHistory.get_interacted_element(
+				model_output, browser_state_summary.selector_map, history_elements
+			)
+
+			# settle-wait and capture the next state while this step is wrapped up
+			if self.settings.pipelined_steps and not (result and result[-1].is_done):
+				self._start_state_prefetch()
 
 			if len(result) > 0 and result[-1].is_done:
 				logger.info(f'📄 Result: {result[-1].extracted_content}')
@@ -930,6 +1014,7 @@ class Agent(Generic[Context]):
 
 		finally:
 			step_end_time = time.time()
+			page_load_wait = self.browser_session.page_load_wait_seconds - page_load_wait_start
 			if not result:
 				return
 
@@ -939,11 +1024,63 @@ class Agent(Generic[Context]):
 					step_start_time=step_start_time,
 					step_end_time=step_end_time,
 					input_tokens=tokens,
+					cacheable_prefix_ratio=self._message_manager.last_cacheable_prefix_ratio,
+					page_load_wait_seconds=page_load_wait,
+				)
+				await self._make_history_item(
+					model_output, browser_state_summary, result, metadata, interacted_elements, history_elements
 				)
-				self._make_history_item(model_output, browser_state_summary, result, metadata)
 
 			# Log step completion summary
-			self._log_step_completion_summary(step_start_time, result)
+			self._log_step_completion_summary(step_start_time, result, page_load_wait)
+
+	async def _get_step_state_summary(self) -> BrowserStateSummary:
+		"""State for this step, taken over from the prefetched one when the page did not change since it was captured"""
+		prefetch_task, self._state_prefetch = self._state_prefetch, None
+		if prefetch_task is not None:
+			try:
+				prefetch = await prefetch_task
+			except Exception as e:
+				logger.debug(f'Discarding the prefetched state: {type(e).__name__}: {e}')
+			else:
+				browser_state_summary = await self.browser_session.adopt_state_summary(
+					prefetch, cache_clickable_elements_hashes=True
+				)
+				if browser_state_summary is not None:
+					return browser_state_summary
+
+		return await self.browser_session.get_state_summary(cache_clickable_elements_hashes=True)
+
+	def _start_state_prefetch(self) -> None:
+		"""Capture the next state in the background, validated against the page fingerprint before it is used"""
+		if self._state_prefetch is None:
+			self._state_prefetch = asyncio.create_task(self.browser_session.prefetch_state_summary())
+
+	async def _settle_state_prefetch(self, actions: list[ActionModel]) -> None:
+		"""Called before acting: a prefetch survives read-only actions, anything else makes it stale or ends the task (done)"""
+		if self._state_prefetch is None:
+			return
+
+		action_names = {name for action in actions for name in action.model_dump(exclude_unset=True)}
+		if all(self.controller.registry.is_read_only(name) for name in action_names):
+			# the capture redraws highlights, let it finish before the actions run
+			await asyncio.wait([self._state_prefetch])
+		else:
+			self._cancel_state_prefetch()
+
+	async def _abort_streamed_actions(self, streamed_actions: StreamedActions | None, acting: asyncio.Task | None) -> None:
+		"""The model output was rejected: no further streamed action runs, the one in flight is waited for"""
+		if streamed_actions is None or acting is None:
+			return
+		streamed_actions.abort()
+		await asyncio.wait([acting])
+		if not acting.cancelled() and acting.exception() is not None:
+			logger.debug(f'Streamed actions failed: {type(acting.exception()).__name__}: {acting.exception()}')
+
+	def _cancel_state_prefetch(self) -> None:
+		if self._state_prefetch is not None:
+			self._state_prefetch.cancel()
+			self._state_prefetch = None
 
 	@time_execution_async('--handle_step_error (agent)')
 	async def _handle_step_error(self, error: Exception) -> list[ActionResult]:
@@ -990,19 +1127,24 @@ class Agent(Generic[Context]):
 
 		return [ActionResult(error=error_msg, include_in_memory=True)]
 
-	def _make_history_item(
+	async def _make_history_item(
 		self,
 		model_output: AgentOutput | None,
 		browser_state_summary: BrowserStateSummary,
 		result: list[ActionResult],
 		metadata: StepMetadata | None = None,
+		interacted_elements: list[DOMHistoryElement | None] | None = None,
+		history_elements: dict[int, DOMHistoryElement] | None = None,
 	) -> None:
 		"""Create and store history item"""
 
-		if model_output:
-			interacted_elements = AgentHistory.get_interacted_element(model_output, browser_state_summary.selector_map)
-		else:
-			interacted_elements = [None]
+		if interacted_elements is None:
+			if model_output:
+				interacted_elements = AgentHistory.get_interacted_element(
+					model_output, browser_state_summary.selector_map, history_elements
+				)
+			else:
+				interacted_elements = [None]
 
 		state_history = BrowserStateHistory(
 			url=browser_state_summary.url,
@@ -1014,7 +1156,50 @@ class Agent(Generic[Context]):
 
 		history_item = AgentHistory(model_output=model_output, result=result, state=state_history, metadata=metadata)
 
+		await self._add_history_item(history_item)
+
+	async def _add_history_item(self, history_item: AgentHistory) -> None:
+		"""Append to the history, and to the history store on disk if save_history_path is set"""
 		self.state.history.history.append(history_item)
+		if self.history_store:
+			try:
+				# serializing the step and writing its screenshot would block the other agents on the loop
+				await asyncio.to_thread(self.history_store.append, history_item)
+			except Exception as e:
+				logger.error(f'❌ Failed to save step to {self.history_store.history_file}: {type(e).__name__}: {e}')
+		if self._recorder:
+			# before the screenshot can be evicted, the frame is encoded in the background
+			self._recorder.add_history_item(history_item, len(self.state.history.history))
+		await self._evict_screenshots()
+
+	async def _evict_screenshots(self) -> None:
+		"""Keep only the last max_screenshots_in_memory screenshots of the history in memory"""
+		max_screenshots = self.settings.max_screenshots_in_memory
+		if max_screenshots is None:
+			return
+
+		history = self.state.history.history
+		evict_until = len(history) - max_screenshots
+		for item in history[self._screenshots_evicted_until : max(evict_until, 0)]:
+			state = item.state
+			if state.screenshot is None:
+				continue
+			if self.settings.evicted_screenshots == 'disk' and not state.screenshot_path:
+				# screenshots already in the history store are on disk, the others go to a temporary one
+				store = self.history_store or self._get_screenshot_spill_store()
+				try:
+					state.screenshot_path = str(await asyncio.to_thread(store.save_screenshot, state.screenshot))
+				except Exception as e:
+					logger.warning(f'⚠️ Failed to spill screenshot to disk, dropping it: {type(e).__name__}: {e}')
+			state.screenshot = None
+		self._screenshots_evicted_until = max(self._screenshots_evicted_until, evict_until)
+
+	def _get_screenshot_spill_store(self) -> HistoryStore:
+		if self._screenshot_spill_dir is None:
+			self._screenshot_spill_dir = tempfile.TemporaryDirectory(prefix='browser_use_screenshots_')
+			# the history returned by run() keeps reading its screenshots from here after the agent is gone
+			self.state.history._screenshot_spill_dir = self._screenshot_spill_dir
+		return HistoryStore(self._screenshot_spill_dir.name)
 
 	THINK_TAGS = re.compile(r'<think>.*?</think>', re.DOTALL)
 	STRAY_CLOSE_TAG = re.compile(r'.*?</think>', re.DOTALL)
@@ -1035,15 +1220,19 @@ class Agent(Generic[Context]):
 			return input_messages
 
 	@time_execution_async('--get_next_action (agent)')
-	async def get_next_action(self, input_messages: list[BaseMessage]) -> AgentOutput:
-		"""Get next action from LLM based on current state"""
+	async def get_next_action(
+		self, input_messages: list[BaseMessage], streamed_actions: StreamedActions | None = None
+	) -> AgentOutput:
+		"""Get next action from LLM based on current state, streamed_actions receives the actions while they stream in (raw mode)"""
 		input_messages = self._convert_input_messages(input_messages)
 
 		if self.tool_calling_method == 'raw':
 			self._log_llm_call_info(input_messages, self.tool_calling_method)
 			try:
-				output = self.llm.invoke(input_messages)
+				output = await self._run_interruptible(self._invoke_raw(input_messages, streamed_actions))
 				response = {'raw': output, 'parsed': None}
+			except InterruptedError:
+				raise
 			except Exception as e:
 				logger.error(f'Failed to invoke model: {str(e)}')
 				raise LLMException(401, 'LLM API call failed') from e
@@ -1060,9 +1249,11 @@ class Agent(Generic[Context]):
 		elif self.tool_calling_method is None:
 			structured_llm = self.llm.with_structured_output(self.AgentOutput, include_raw=True)
 			try:
-				response: dict[str, Any] = await structured_llm.ainvoke(input_messages)  # type: ignore
+				response: dict[str, Any] = await self._run_interruptible(structured_llm.ainvoke(input_messages))  # type: ignore
 				parsed: AgentOutput | None = response['parsed']
 
+			except InterruptedError:
+				raise
 			except Exception as e:
 				logger.error(f'Failed to invoke model: {str(e)}')
 				raise LLMException(401, 'LLM API call failed') from e
@@ -1070,7 +1261,7 @@ class Agent(Generic[Context]):
 		else:
 			self._log_llm_call_info(input_messages, self.tool_calling_method)
 			structured_llm = self.llm.with_structured_output(self.AgentOutput, include_raw=True, method=self.tool_calling_method)
-			response: dict[str, Any] = await structured_llm.ainvoke(input_messages)  # type: ignore
+			response: dict[str, Any] = await self._run_interruptible(structured_llm.ainvoke(input_messages))  # type: ignore
 
 		# Handle tool call responses
 		if response.get('parsing_error') and 'raw' in response:
@@ -1118,6 +1309,45 @@ class Agent(Generic[Context]):
 		self._log_next_action_summary(parsed)
 		return parsed
 
+	async def _invoke_raw(
+		self, input_messages: list[BaseMessage], streamed_actions: StreamedActions | None = None
+	) -> BaseMessage:
+		"""Plain LLM call for the raw tool calling method, streamed if enabled (falls back to a thread for sync-only models)"""
+		if not self.settings.stream_llm_output and streamed_actions is None:
+			return await self.llm.ainvoke(input_messages)
+
+		output: BaseMessage | None = None
+		start_time = time.perf_counter()
+		async for chunk in self.llm.astream(input_messages):
+			if output is None:
+				logger.debug(f'🧠 First token after {time.perf_counter() - start_time:.2f}s')
+				output = chunk
+			else:
+				output += chunk  # type: ignore[operator]
+			if streamed_actions is not None:
+				streamed_actions.feed(str(chunk.content))
+		if output is None:
+			raise ValueError('LLM returned an empty response stream')
+		return output
+
+	async def _run_interruptible(self, llm_call: Awaitable[T]) -> T:
+		"""Await an LLM call, the in-flight request is cancelled as soon as the agent is paused or stopped"""
+		call = asyncio.ensure_future(llm_call)
+		watcher = asyncio.create_task(self._interrupt_event.wait())
+		try:
+			await asyncio.wait({call, watcher}, return_when=asyncio.FIRST_COMPLETED)
+		finally:
+			# also reached when this step is cancelled (Ctrl+C), the request must not outlive it
+			watcher.cancel()
+			if not call.done():
+				call.cancel()
+				with suppress(asyncio.CancelledError):
+					await call
+
+		if call.cancelled():
+			raise InterruptedError('LLM call aborted, the agent was paused or stopped')
+		return call.result()
+
 	def _log_agent_run(self) -> None:
 		"""Log the agent run"""
 		logger.info(f'🚀 Starting task: {self.task}')
@@ -1174,7 +1404,9 @@ class Agent(Generic[Context]):
 				summary_lines.append(f'          {i + 1}. {detail}')
 			logger.info('\n'.join(summary_lines))
 
-	def _log_step_completion_summary(self, step_start_time: float, result: list[ActionResult]) -> None:
+	def _log_step_completion_summary(
+		self, step_start_time: float, result: list[ActionResult], page_load_wait: float | None = None
+	) -> None:
 		"""Log step completion summary with action count, timing, and success/failure stats"""
 		if not result:
 			return
@@ -1192,7 +1424,8 @@ class Agent(Generic[Context]):
 		status_parts = [part for part in [success_indicator, failure_indicator] if part]
 		status_str = ' | '.join(status_parts) if status_parts else '✅ 0'
 
-		logger.info(f'📍 Step {self.state.n_steps}: Ran {action_count} actions in {step_duration:.2f}s: {status_str}')
+		waiting = f' ({page_load_wait:.2f}s waiting for the page)' if page_load_wait else ''
+		logger.info(f'📍 Step {self.state.n_steps}: Ran {action_count} actions in {step_duration:.2f}s{waiting}: {status_str}')
 
 	def _log_llm_call_info(self, input_messages: list[BaseMessage], method: str) -> None:
 		"""Log comprehensive information about the LLM call being made"""
@@ -1328,6 +1561,20 @@ class Agent(Generic[Context]):
 		try:
 			self._log_agent_run()
 
+			if self.history_store:
+				# a reused save_history_path starts a new history instead of appending to the one of the last run
+				try:
+					await asyncio.to_thread(self.history_store.start_run, list(self.state.history.history))
+				except Exception as e:
+					logger.error(f'❌ Failed to start the history in {self.history_store.directory}: {type(e).__name__}: {e}')
+
+			if self.settings.generate_gif:
+				output_path = self.settings.generate_gif if isinstance(self.settings.generate_gif, str) else 'agent_history.gif'
+				# frames are encoded as the steps finish instead of all at once after the run
+				self._recorder = HistoryRecorder(output_path, task=self.task)
+				for i, item in enumerate(self.state.history.history, 1):
+					self._recorder.add_history_item(item, i)
+
 			# Execute initial actions if provided
 			if self.initial_actions:
 				result = await self.multi_act(self.initial_actions, check_for_new_elements=False)
@@ -1376,7 +1623,7 @@ class Agent(Generic[Context]):
 			else:
 				agent_run_error = 'Failed to complete task in maximum steps'
 
-				self.state.history.history.append(
+				await self._add_history_item(
 					AgentHistory(
 						model_output=None,
 						result=[ActionResult(error=agent_run_error, include_in_memory=True)],
@@ -1438,56 +1685,111 @@ class Agent(Generic[Context]):
 
 			await self.close()
 
-			if self.settings.generate_gif:
-				output_path: str = 'agent_history.gif'
-				if isinstance(self.settings.generate_gif, str):
-					output_path = self.settings.generate_gif
-
-				create_history_gif(task=self.task, history=self.state.history, output_path=output_path)
+			if self._recorder:
+				recorder, self._recorder = self._recorder, None
+				await asyncio.to_thread(recorder.close)
 
 	# @observe(name='controller.multi_act')
 	@time_execution_async('--multi_act')
 	async def multi_act(
 		self,
-		actions: list[ActionModel],
+		actions: list[ActionModel] | AsyncIterable[ActionModel],
 		check_for_new_elements: bool = True,
+		history_elements: dict[int, DOMHistoryElement] | None = None,
 	) -> list[ActionResult]:
-		"""Execute multiple actions"""
-		results = []
+		"""
+		Execute multiple actions, streamed actions are executed as they arrive.
+		Consecutive read-only actions run concurrently and are not followed by wait_between_actions.
+		With incremental dom snapshots, the elements of the selector map are converted into history_elements before
+		a recapture patches them in place, so the history records the elements that were acted on.
+		"""
+		results: list[ActionResult] = []
+		total_actions = len(actions) if isinstance(actions, list) else '?'
+		action_stream = _iterate_actions(actions) if isinstance(actions, list) else actions
 
 		cached_selector_map = await self.browser_session.get_selector_map()
-		cached_path_hashes = {e.hash.branch_path_hash for e in cached_selector_map.values()}
+		# hash up front: with incremental dom snapshots the next state update patches these nodes in place
+		cached_index_hashes = {index: e.hash.branch_path_hash for index, e in cached_selector_map.items()}
+		cached_path_hashes = set(cached_index_hashes.values())
 
 		await self.browser_session.remove_highlights()
 
-		for i, action in enumerate(actions):
-			if action.get_index() is not None and i != 0:
-				new_browser_state_summary = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=False)
-				new_selector_map = new_browser_state_summary.selector_map
-
-				# Detect index change after previous action
-				orig_target = cached_selector_map.get(action.get_index())  # type: ignore
-				orig_target_hash = orig_target.hash.branch_path_hash if orig_target else None
-				new_target = new_selector_map.get(action.get_index())  # type: ignore
-				new_target_hash = new_target.hash.branch_path_hash if new_target else None
-				if orig_target_hash != new_target_hash:
-					msg = f'Element index changed after action {i} / {len(actions)}, because page changed.'
-					logger.info(msg)
-					results.append(ActionResult(extracted_content=msg, include_in_memory=True))
-					break
+		# read-only actions run in the background until an action that may change the page, results are kept in order
+		running_read_only: list[tuple[int, str, asyncio.Task[ActionResult]]] = []
+
+		async def collect_read_only_results() -> bool:
+			"""Wait for the running read-only actions, True if one of them ends this step (done or error)"""
+			while running_read_only:
+				i, action_name, task = running_read_only.pop(0)
+				results.append(await task)
+				logger.info(f'☑️ Executed action {i + 1}/{total_actions}: {action_name}')
+				if results[-1].is_done or results[-1].error:
+					return True
+			return False
+
+		i = -1
+		previous_read_only = False
+		recaptured = False
+		try:
+			async for action in action_stream:
+				i += 1
+				# Get action name from the action model
+				action_data = action.model_dump(exclude_unset=True)
+				action_name = next(iter(action_data.keys())) if action_data else 'unknown'
+				read_only = self.controller.registry.is_read_only(action_name)
 
-				new_path_hashes = {e.hash.branch_path_hash for e in new_selector_map.values()}
-				if check_for_new_elements and not new_path_hashes.issubset(cached_path_hashes):
-					# next action requires index but there are new elements on the page
-					msg = f'Something new appeared after action {i} / {len(actions)}'
-					logger.info(msg)
-					results.append(ActionResult(extracted_content=msg, include_in_memory=True))
+				if not read_only and await collect_read_only_results():
 					break
+				if i != 0 and not previous_read_only:
+					await asyncio.sleep(self.browser_profile.wait_between_actions)
+				previous_read_only = read_only
+
+				# the indices are only checked against a fresh state if the page changed since the last one, once the state was
+				# recaptured in this step they are always checked against it, its indices may have shifted
+				index = action.get_index()
+				current_selector_map: SelectorMap | None = None
+				new_elements = False
+				if index is not None and i != 0 and await self.browser_session.is_state_stale():
+					if history_elements is not None and self.browser_profile.incremental_dom_snapshots:
+						for history_index, element in cached_selector_map.items():
+							if history_index not in history_elements:
+								history_elements[history_index] = HistoryTreeProcessor.convert_dom_element_to_history_element(
+									element
+								)
+					new_browser_state_summary = await self.browser_session.get_state_summary(
+						cache_clickable_elements_hashes=False
+					)
+					current_selector_map = new_browser_state_summary.selector_map
+					recaptured = True
+
+					new_path_hashes = {e.hash.branch_path_hash for e in current_selector_map.values()}
+					new_elements = check_for_new_elements and not new_path_hashes.issubset(cached_path_hashes)
+				elif index is not None and recaptured:
+					current_selector_map = await self.browser_session.get_selector_map()
+
+				if current_selector_map is not None:
+					# Detect index change after previous action
+					orig_target_hash = cached_index_hashes.get(index)  # type: ignore
+					new_target = current_selector_map.get(index)  # type: ignore
+					new_target_hash = new_target.hash.branch_path_hash if new_target else None
+					if orig_target_hash != new_target_hash:
+						msg = f'Element index changed after action {i} / {total_actions}, because page changed.'
+						logger.info(msg)
+						if not await collect_read_only_results():
+							results.append(ActionResult(extracted_content=msg, include_in_memory=True))
+						break
+
+					if new_elements:
+						# next action requires index but there are new elements on the page
+						msg = f'Something new appeared after action {i} / {total_actions}'
+						logger.info(msg)
+						if not await collect_read_only_results():
+							results.append(ActionResult(extracted_content=msg, include_in_memory=True))
+						break
 
-			try:
 				await self._raise_if_stopped_or_paused()
 
-				result = await self.controller.act(
+				act = self.controller.act(
 					action=action,
 					browser_session=self.browser_session,
 					page_extraction_llm=self.settings.page_extraction_llm,
@@ -1495,26 +1797,28 @@ class Agent(Generic[Context]):
 					available_file_paths=self.settings.available_file_paths,
 					context=self.context,
 				)
+				if read_only:
+					running_read_only.append((i, action_name, asyncio.create_task(act)))
+					continue
 
-				results.append(result)
-
-				# Get action name from the action model
-				action_data = action.model_dump(exclude_unset=True)
-				action_name = next(iter(action_data.keys())) if action_data else 'unknown'
-				logger.info(f'☑️ Executed action {i + 1}/{len(actions)}: {action_name}')
-				if results[-1].is_done or results[-1].error or i == len(actions) - 1:
+				results.append(await act)
+				logger.info(f'☑️ Executed action {i + 1}/{total_actions}: {action_name}')
+				if results[-1].is_done or results[-1].error:
 					break
+			else:
+				await collect_read_only_results()
 
-				await asyncio.sleep(self.browser_profile.wait_between_actions)
-				# hash all elements. if it is a subset of cached_state its fine - else break (new elements on page)
-
-			except asyncio.CancelledError:
-				# Gracefully handle task cancellation
-				logger.info(f'Action {i + 1} was cancelled due to Ctrl+C')
-				if not results:
-					# Add a result for the cancelled action
-					results.append(ActionResult(error='The action was cancelled due to Ctrl+C', include_in_memory=True))
-				raise InterruptedError('Action cancelled by user')
+		except asyncio.CancelledError:
+			# Gracefully handle task cancellation
+			logger.info(f'Action {i + 1} was cancelled due to Ctrl+C')
+			if not results:
+				# Add a result for the cancelled action
+				results.append(ActionResult(error='The action was cancelled due to Ctrl+C', include_in_memory=True))
+			raise InterruptedError('Action cancelled by user')
+		finally:
+			# read-only actions after one that ended the step are not needed anymore
+			for _, _, task in running_read_only:
+				task.cancel()
 
 		return results
 
@@ -1675,9 +1979,7 @@ class Agent(Generic[Context]):
 		if not historical_element or not browser_state_summary.element_tree:
 			return action
 
-		current_element = HistoryTreeProcessor.find_history_element_in_tree(
-			historical_element, browser_state_summary.element_tree
-		)
+		current_element = HistoryTreeProcessor.find_history_element_in_index(historical_element, browser_state_summary.hash_index)
 
 		if not current_element or current_element.highlight_index is None:
 			return None
@@ -1718,6 +2020,7 @@ class Agent(Generic[Context]):
 		)
 		self.state.paused = True
 		self._external_pause_event.clear()
+		self._interrupt_event.set()
 
 		# The signal handler will handle the asyncio pause logic for us
 		# No need to duplicate the code here
@@ -1728,6 +2031,7 @@ class Agent(Generic[Context]):
 		print('▶️  Got Enter, resuming agent execution where it left off...\n')
 		self.state.paused = False
 		self._external_pause_event.set()
+		self._interrupt_event.clear()
 
 		# The signal handler should have already reset the flags
 		# through its reset() method when called from run()
@@ -1744,6 +2048,7 @@ class Agent(Generic[Context]):
 		"""Stop the agent"""
 		logger.info('⏹️ Agent stopping')
 		self.state.stopped = True
+		self._interrupt_event.set()
 
 	def _convert_initial_actions(self, actions: list[dict[str, dict[str, Any]]]) -> list[ActionModel]:
 		"""Convert dictionary-based actions to ActionModel instances"""
@@ -1853,6 +2158,7 @@ class Agent(Generic[Context]):
 
 	async def close(self):
 		"""Close all resources"""
+		self._cancel_state_prefetch()
 		try:
 			# First close browser resources
 			await self.browser_session.stop()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from collections.abc import AsyncIterator
+
+from pydantic import ValidationError
+
+from browser_use.controller.registry.views import ActionModel
+
+logger = logging.getLogger(__name__)
+
+# characters that change the scanner state, everything else is skipped over
+JSON_STRUCTURE_RE = re.compile(r'["\\{}\[\]:,]')
+
+
+class IncrementalActionParser:
+	"""
+	Scans a JSON model output while it streams in and returns the entries of its top level "action" array as soon as
+	each one is complete. Nothing else is parsed, the complete output still goes through the regular parsing.
+	"""
+
+	def __init__(self, key: str = 'action'):
+		self.key = key
+		self.text = ''
+		self._position = 0
+		self._depth = 0
+		self._root_depth: int | None = None  # depth of the members of the output object
+		self._in_string = False
+		self._escaped_position = -1
+		self._string_start = 0
+		self._member_name: str | None = None  # last string seen at root depth, a key if a ':' follows
+		self._current_key: str | None = None
+		self._array_depth: int | None = None  # depth of the entries of the action array
+		self._entry_start: int | None = None
+		self._finished = False
+
+	def feed(self, chunk: str) -> list[dict]:
+		"""Add the next chunk of the output, returns the action entries completed by it"""
+		self.text += chunk
+		if self._finished:
+			return []
+
+		if self._root_depth is None and not self._skip_reasoning():
+			return []
+
+		entries: list[dict] = []
+		text = self.text
+		for match in JSON_STRUCTURE_RE.finditer(text, self._position):
+			i = match.start()
+			char = match.group()
+			if i == self._escaped_position:
+				continue
+
+			if self._in_string:
+				if char == '\\':
+					self._escaped_position = i + 1
+				elif char == '"':
+					self._in_string = False
+					if self._depth == self._root_depth:
+						self._member_name = text[self._string_start : i + 1]
+				continue
+
+			if char == '"':
+				self._in_string = True
+				self._string_start = i
+			elif char == ':':
+				if self._depth == self._root_depth and self._member_name is not None:
+					self._current_key = json.loads(self._member_name)
+			elif char == ',':
+				if self._depth == self._root_depth:
+					self._member_name = self._current_key = None
+			elif char in '{[':
+				self._depth += 1
+				if self._root_depth is None:
+					if char == '{':
+						self._root_depth = self._depth
+				elif char == '[' and self._depth == self._root_depth + 1 and self._current_key == self.key:
+					self._array_depth = self._depth + 1
+				elif char == '{' and self._depth == self._array_depth:
+					self._entry_start = i
+			elif char in '}]':
+				if self._entry_start is not None and self._depth == self._array_depth:
+					entry = self._parse_entry(text[self._entry_start : i + 1])
+					self._entry_start = None
+					if entry is None:
+						break
+					entries.append(entry)
+				elif self._array_depth is not None and self._depth == self._array_depth - 1:
+					self._finished = True  # the action array is closed, nothing left to stream
+					break
+				self._depth -= 1
+
+		self._position = len(text)
+		return entries
+
+	def _skip_reasoning(self) -> bool:
+		"""Reasoning models think in <think> tags before answering, the output only starts after them"""
+		stripped = self.text.lstrip()
+		if '<think>'.startswith(stripped):
+			return False  # too little output to tell yet
+		if not stripped.startswith('<think>'):
+			return True
+		end = self.text.find('</think>')
+		if end == -1:
+			return False
+		self._position = max(self._position, end + len('</think>'))
+		return True
+
+	def _parse_entry(self, entry_text: str) -> dict | None:
+		try:
+			return json.loads(entry_text)
+		except json.JSONDecodeError as e:
+			# e.g. invalid escapes, stop streaming and leave the error to the parsing of the complete output
+			logger.debug(f'Could not parse streamed action, waiting for the complete output: {e}')
+			self._finished = True
+			return None
+
+
+class StreamedActions:
+	"""
+	Actions of a streaming model output, handed to multi_act one by one as soon as each is complete and valid.
+	Iterating stops at close() once the complete output is known, or right away at abort().
+	"""
+
+	def __init__(self, action_model: type[ActionModel], max_actions: int):
+		self.action_model = action_model
+		self.max_actions = max_actions
+		self.parser = IncrementalActionParser()
+		self.dispatched: list[ActionModel] = []
+		self._queue: asyncio.Queue[ActionModel | None] = asyncio.Queue()
+		self._accepting = True
+		self._closed = False
+		self._aborted = False
+
+	def feed(self, chunk: str) -> None:
+		"""Add the next chunk of the streamed output, dispatches every action it completes"""
+		for entry in self.parser.feed(chunk):
+			if not self._accepting or len(self.dispatched) >= self.max_actions:
+				return
+			try:
+				action = self.action_model.model_validate(entry)
+			except ValidationError as e:
+				# later actions must not run before an invalid one, the complete output decides what happens
+				logger.debug(f'Streamed action is invalid, waiting for the complete output: {e}')
+				self._accepting = False
+				return
+			if not action.model_dump(exclude_unset=True):
+				self._accepting = False
+				return
+			self._put(action)
+
+	def close(self, actions: list[ActionModel]) -> None:
+		"""The output is complete, hand over its actions that were not streamed yet and end the iteration"""
+		if self._closed:
+			return
+		self._closed = True
+		for action in actions[len(self.dispatched) :]:
+			self._put(action)
+		self._queue.put_nowait(None)
+
+	def abort(self) -> None:
+		"""The output was rejected, no further action is handed over"""
+		self._aborted = True
+		self._closed = True
+		self._queue.put_nowait(None)
+
+	def _put(self, action: ActionModel) -> None:
+		self.dispatched.append(action)
+		self._queue.put_nowait(action)
+
+	async def __aiter__(self) -> AsyncIterator[ActionModel]:
+		while True:
+			action = await self._queue.get()
+			if action is None or self._aborted:
+				return
+			yield action
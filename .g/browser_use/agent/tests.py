@@ -195,3 +195,560 @@ def test_action_creation(action_registry):
 
 # run this with:
 # pytest browser_use/agent/tests.py
+
+
+def stream_in_chunks(parser, text: str, chunk_size: int) -> list[tuple[int, dict]]:
+	"""Feed text in chunks, returns every completed entry with the length of the output at the time it was returned"""
+	entries = []
+	for start in range(0, len(text), chunk_size):
+		for entry in parser.feed(text[start : start + chunk_size]):
+			entries.append((start + chunk_size, entry))
+	return entries
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64])
+def test_incremental_action_parser_returns_each_action_once_complete(chunk_size: int):
+	from browser_use.agent.streaming import IncrementalActionParser
+
+	output = (
+		'<think>maybe {"action": [{"wrong": 1}]}</think>```json\n'
+		'{"current_state": {"memory": "a \\"quoted\\" ] } [ { memory", "next_goal": "click"}, '
+		'"action": [{"click_element_by_index": {"index": 5}}, {"input_text": {"index": 7, "text": "}{\\\\"}}], "extra": 1}\n```'
+	)
+	entries = stream_in_chunks(IncrementalActionParser(), output, chunk_size)
+
+	assert [entry for _, entry in entries] == [
+		{'click_element_by_index': {'index': 5}},
+		{'input_text': {'index': 7, 'text': '}{\\'}},
+	]
+	# the first action is returned long before the output is complete
+	assert entries[0][0] <= output.index('{"input_text"') + chunk_size
+
+
+def test_streamed_actions_stop_at_the_first_invalid_action():
+	from browser_use.agent.streaming import StreamedActions
+	from browser_use.controller.service import Controller
+
+	action_model = Controller().registry.create_action_model()
+	streamed_actions = StreamedActions(action_model, max_actions=3)
+	streamed_actions.feed('{"action": [{"go_back": {}}, {"no_such_action": {}}, {"go_back": {}}]}')
+
+	assert [action.model_dump(exclude_unset=True) for action in streamed_actions.dispatched] == [{'go_back': {}}]
+
+
+def test_action_model_and_descriptions_are_built_once_per_action_set():
+	from browser_use.controller.service import Controller
+
+	registry = Controller().registry
+
+	class SheetsPage:
+		url = 'https://docs.google.com/spreadsheets/d/1'
+
+	action_model = registry.create_action_model(page=SheetsPage())
+	assert registry.create_action_model(page=SheetsPage()) is action_model
+	assert registry.create_action_model() is not action_model
+	assert AgentOutput.type_with_custom_actions(action_model) is AgentOutput.type_with_custom_actions(action_model)
+	assert registry.get_prompt_description(SheetsPage()) is registry.get_prompt_description(SheetsPage())
+
+	@registry.action('Newly registered action')
+	async def newly_registered(text: str):
+		pass
+
+	assert 'newly_registered' in registry.create_action_model().model_fields
+	assert 'newly_registered' in registry.get_prompt_description()
+
+
+def test_agent_output_models_are_released_with_their_registry():
+	import gc
+	import weakref
+
+	from browser_use.controller.service import Controller
+
+	registry = Controller().registry
+	action_model = registry.create_action_model()
+	agent_output = weakref.ref(AgentOutput.type_with_custom_actions(action_model))
+	assert agent_output() is AgentOutput.type_with_custom_actions(action_model)
+
+	del registry, action_model
+	gc.collect()
+	assert agent_output() is None
+
+
+def test_actions_declare_their_side_effects():
+	from browser_use.controller.registry.views import SideEffect
+	from browser_use.controller.service import Controller
+
+	registry = Controller().registry
+
+	@registry.action('Count the links on the page', side_effect=SideEffect.READ_ONLY)
+	async def count_links():
+		pass
+
+	@registry.action('Custom action without a declared side effect')
+	async def custom_action():
+		pass
+
+	assert registry.is_read_only('extract_content') and registry.is_read_only('count_links')
+	assert not registry.is_read_only('click_element_by_index')
+	assert not registry.is_read_only('custom_action')  # unknown side effects are assumed to change the page
+	assert not registry.is_read_only('no_such_action')
+	assert registry.registry.actions['go_to_url'].side_effect == SideEffect.NAVIGATION
+	assert not registry.is_read_only('save_pdf')  # changes the media emulation of the page
+	assert registry.registry.actions['done'].side_effect == SideEffect.COMPLETION
+	assert not registry.is_read_only('done')
+
+
+def test_page_markdown_is_split_on_structure_without_losing_text():
+	from browser_use.controller.extraction import select_relevant_chunks, split_markdown
+
+	markdown = '\n\n'.join(
+		f'# Section {i}\n' + 'filler text ' * 300 + ('opening hours' if i in (2, 7) else '') for i in range(10)
+	)
+	chunks = split_markdown(markdown, 5000)
+
+	assert ''.join(chunks) == markdown
+	assert all(len(chunk) <= 5000 for chunk in chunks)
+	assert all(chunk.lstrip('\n').startswith('# Section') for chunk in chunks)
+	assert split_markdown('x' * 12000, 5000) == ['x' * 5000, 'x' * 5000, 'x' * 2000]
+
+	selected = select_relevant_chunks(chunks, 'find the opening hours', max_chunks=3)
+	assert [chunk for i, chunk in enumerate(chunks) if 'opening hours' in chunk] == [chunks[i] for i in selected]
+	assert select_relevant_chunks(chunks, 'summarize', max_chunks=3) == [0, 1, 2]
+
+
+async def test_page_content_cache_evicts_least_recently_used_frames():
+	from browser_use.browser.content_cache import PageContentCache
+
+	cache = PageContentCache(max_chars=250)
+	first = cache.put_frame(('https://a', 'epoch', 0), '<p>a</p>' * 10)
+	cache.put_frame(('https://b', 'epoch', 0), '<p>b</p>' * 10)
+	assert cache.get_frame(('https://a', 'epoch', 0)) is first
+	assert cache.get_frame(('https://a', 'epoch', 1)) is None  # the page mutated since
+
+	assert await cache.get_markdown(first, strip_links=True) == 'a\n\n' * 9 + 'a'
+	await cache.get_markdown(first, strip_links=True)
+	cache.put_frame(('https://c', 'epoch', 0), '<p>c</p>' * 10)
+	assert cache.get_frame(('https://b', 'epoch', 0)) is None
+	assert cache.get_frame(('https://a', 'epoch', 0)) is first
+
+	cache.put_extraction('markdown', 'goal', '{"result": 1}')
+	assert cache.get_extraction('markdown', 'goal') == '{"result": 1}'
+	assert cache.get_extraction('other markdown', 'goal') is None
+	assert (cache.stats.html_hits, cache.stats.html_misses, cache.stats.markdown_hits, cache.stats.evictions) == (2, 2, 1, 1)
+
+
+async def test_markdown_is_cached_by_html_without_the_content_cache(monkeypatch):
+	from browser_use.browser import content_cache
+
+	conversions = []
+
+	async def html_to_markdown(html: str, strip_links: bool) -> str:
+		conversions.append(html)
+		return html.upper()
+
+	monkeypatch.setattr(content_cache, 'html_to_markdown', html_to_markdown)
+	cache = content_cache.MarkdownCache(max_entries=2)
+	for html in ('<p>a</p>', '<p>a</p>', '<p>b</p>', '<p>a</p>', '<p>c</p>', '<p>b</p>'):
+		assert await cache.get_markdown(html, strip_links=True) == html.upper()
+	assert conversions == ['<p>a</p>', '<p>b</p>', '<p>c</p>', '<p>b</p>']  # b was the least recently used when c came
+
+
+def test_history_store_appends_steps_and_reads_screenshots_on_demand(tmp_path):
+	import base64
+
+	from browser_use.agent.history_store import HistoryStore
+
+	screenshot = base64.b64encode(b'\x89PNG\r\n\x1a\nimage').decode()
+	store = HistoryStore(tmp_path / 'run')
+	for url in ('https://a.com', 'https://b.com'):
+		store.append(
+			AgentHistory(
+				model_output=None,
+				result=[ActionResult(extracted_content=url)],
+				state=BrowserStateHistory(url=url, title='', tabs=[], interacted_element=[None], screenshot=screenshot),
+			)
+		)
+	with open(store.history_file, 'a') as f:
+		f.write('{"model_output": null, "result": [')  # killed while writing the next step
+
+	assert len(list(store.screenshots_dir.iterdir())) == 1  # identical screenshots are stored once
+	assert screenshot not in store.history_file.read_text()
+
+	items = list(store.iter_history(AgentOutput))
+	assert [item.state.url for item in items] == ['https://a.com', 'https://b.com']
+	assert all(item.state.screenshot is None for item in items)
+	assert AgentHistoryList(history=items).screenshots() == [screenshot, screenshot]
+	assert store.load(AgentOutput, load_screenshots=True).history[1].state.screenshot == screenshot
+
+	# a new run in the same directory keeps the previous history apart instead of appending to it
+	store.start_run(items[:1])
+	assert (store.directory / 'history.1.jsonl').exists()
+	assert [item.state.url for item in store.iter_history(AgentOutput)] == ['https://a.com']
+	assert store.load(AgentOutput).screenshots() == [screenshot]
+
+
+def test_history_gif_is_written_frame_by_frame(tmp_path):
+	import base64
+	import io
+
+	Image = pytest.importorskip('PIL.Image')
+	from browser_use.agent.gif import create_history_gif
+
+	def screenshot(color: str) -> str:
+		buffer = io.BytesIO()
+		Image.new('RGB', (320, 200), color).save(buffer, 'PNG')
+		return base64.b64encode(buffer.getvalue()).decode()
+
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[ActionResult()],
+				state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[None], screenshot=screenshot(color)),
+			)
+			for color in ('red', 'red', 'blue')
+		]
+	)
+	output_path = tmp_path / 'history.gif'
+	create_history_gif('task', history, output_path=str(output_path), show_task=False, max_dimension=160)
+
+	gif = Image.open(output_path)
+	assert gif.size == (160, 100)
+	assert gif.n_frames == 2  # identical consecutive screenshots become one longer frame
+	assert gif.info['duration'] == 6000
+
+
+def make_agent(monkeypatch, **kwargs):
+	from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+	from browser_use.agent.service import Agent
+
+	monkeypatch.setenv('ANONYMIZED_TELEMETRY', 'false')
+	llm = FakeListChatModel(responses=[])
+	llm._verified_api_keys = True
+	return Agent(task='task', llm=llm, tool_calling_method='raw', enable_memory=False, **kwargs)
+
+
+@pytest.mark.parametrize('evicted_screenshots', ['disk', 'drop'])
+async def test_agent_evicts_old_screenshots_from_memory(monkeypatch, evicted_screenshots):
+	import base64
+	import gc
+	import os
+
+	agent = make_agent(monkeypatch, max_screenshots_in_memory=2, evicted_screenshots=evicted_screenshots)
+
+	screenshots = [base64.b64encode(f'\x89PNG\r\n\x1a\nimage {i}'.encode()).decode() for i in range(4)]
+	for screenshot in screenshots:
+		await agent._add_history_item(
+			AgentHistory(
+				model_output=None,
+				result=[ActionResult()],
+				state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[None], screenshot=screenshot),
+			)
+		)
+
+	states = [item.state for item in agent.state.history.history]
+	assert [state.screenshot for state in states] == [None, None, *screenshots[2:]]
+	if evicted_screenshots == 'drop':
+		assert agent._screenshot_spill_dir is None
+		assert agent.state.history.screenshots() == [None, None, *screenshots[2:]]
+		return
+
+	assert agent.state.history.screenshots() == screenshots
+	spill_dir = agent._screenshot_spill_dir.name
+	assert len(os.listdir(os.path.join(spill_dir, 'screenshots'))) == 2
+
+	# closing the agent keeps the screenshots of its history, which outlives it
+	await agent.close()
+	history = agent.state.history
+	del agent
+	gc.collect()
+	assert history.screenshots() == screenshots
+
+	# the temporary directory is removed with the history
+	del history
+	gc.collect()
+	with pytest.raises(FileNotFoundError):
+		os.listdir(spill_dir)
+
+
+def test_interacted_elements_are_recorded_before_the_tree_is_patched(action_registry):
+	from browser_use.dom.history_tree_processor.service import HistoryTreeProcessor
+	from browser_use.dom.service import DomService
+
+	def button(name: str) -> dict:
+		return {'tagName': 'button', 'xpath': 'body/button', 'attributes': {'name': name}, 'children': [], 'highlightIndex': 0}
+
+	dom_service = DomService(page=None, incremental=True)  # type: ignore
+	body = {'tagName': 'body', 'xpath': 'body', 'children': ['1']}
+	_, selector_map = dom_service._apply_dom_snapshot(
+		{'rootId': '0', 'snapshotId': 's1', 'map': {'0': body, '1': button('submit')}}
+	)
+	model_output = AgentOutput(
+		current_state=AgentBrain(evaluation_previous_goal='', memory='', next_goal=''),
+		action=[action_registry(click_element={'index': 0})],
+	)
+
+	# what multi_act does before a recapture, which patches the nodes of the step's selector map in place
+	history_elements = {
+		index: HistoryTreeProcessor.convert_dom_element_to_history_element(e) for index, e in selector_map.items()
+	}
+	dom_service._apply_dom_snapshot(
+		{'rootId': '0', 'snapshotId': 's2', 'baseSnapshotId': 's1', 'map': {'1': button('cancel')}, 'removed': []}
+	)
+
+	assert selector_map[0].attributes == {'name': 'cancel'}
+	[interacted] = AgentHistory.get_interacted_element(model_output, selector_map, history_elements)
+	assert interacted is not None and interacted.attributes == {'name': 'submit'}
+
+
+class FakeMultiActSession:
+	"""
+	The parts of BrowserSession multi_act uses. A click changes the page while there are selector maps left, the next
+	recapture moves on to the next of them.
+	"""
+
+	def __init__(self, *selector_maps: dict):
+		self.selector_maps = list(selector_maps)
+		self.selector_map = self.selector_maps.pop(0)
+		self.stale = False
+		self.captures = 0
+		self.waits = 0
+		session = self
+
+		class Profile:
+			incremental_dom_snapshots = False
+
+			@property
+			def wait_between_actions(self) -> float:
+				session.waits += 1
+				return 0
+
+		self.browser_profile = Profile()
+
+	async def get_selector_map(self):
+		return self.selector_map
+
+	async def remove_highlights(self):
+		pass
+
+	async def is_state_stale(self) -> bool:
+		return self.stale
+
+	async def get_state_summary(self, cache_clickable_elements_hashes: bool):
+		from types import SimpleNamespace
+
+		self.captures += 1
+		self.stale = False
+		self.selector_map = self.selector_maps.pop(0)
+		return SimpleNamespace(selector_map=self.selector_map)
+
+
+class StubMultiActController:
+	"""
+	Records the actions it runs. extract_content waits for the goal named by its value to start first (concurrent
+	read-only actions) and fails for the value 'fail'.
+	"""
+
+	def __init__(self):
+		import asyncio
+
+		from browser_use.controller.service import Controller
+
+		self.registry = Controller().registry
+		self.log: list[str] = []
+		self.started: dict[str, asyncio.Event] = {}
+
+	def event(self, name: str):
+		import asyncio
+
+		return self.started.setdefault(name, asyncio.Event())
+
+	async def act(self, action, browser_session, **kwargs) -> ActionResult:
+		import asyncio
+
+		[(name, params)] = action.model_dump(exclude_unset=True).items()
+		if name == 'click_element_by_index':
+			self.log.append(f'click {params["index"]}')
+			browser_session.stale = bool(browser_session.selector_maps)
+			return ActionResult(extracted_content=f'clicked {params["index"]}')
+		if name == 'done':
+			self.log.append('done')
+			return ActionResult(is_done=True, extracted_content=params['text'])
+
+		goal, after = params['value'], params.get('after')
+		self.log.append(f'start {goal}')
+		self.event(goal).set()
+		if after:
+			await asyncio.wait_for(self.event(after).wait(), 1)
+		await asyncio.sleep(0)
+		self.log.append(f'end {goal}')
+		if goal == 'fail':
+			return ActionResult(error='extraction failed')
+		return ActionResult(extracted_content=goal)
+
+
+def multi_act_agent(monkeypatch, *selector_maps: dict):
+	agent = make_agent(monkeypatch)
+	agent.browser_session = FakeMultiActSession(*selector_maps)  # type: ignore
+	agent.controller = StubMultiActController()  # type: ignore
+	return agent, agent.browser_session, agent.controller
+
+
+def multi_act_actions(*actions: dict) -> list:
+	from pydantic import create_model
+
+	from browser_use.controller.service import Controller
+
+	# extract_content gets an optional 'after' parameter for the stub controller
+	ActionModel = Controller().registry.create_action_model()
+	ExtractAction = create_model('ExtractAction', value=(str, ...), after=(str | None, None))
+	StubActionModel = create_model('StubActionModel', __base__=ActionModel, extract_content=(ExtractAction | None, None))
+	return [StubActionModel(**action) for action in actions]
+
+
+def selector_map(*tags: str) -> dict:
+	body = DOMElementNode(tag_name='body', xpath='body', attributes={}, children=[], is_visible=True, parent=None)
+	nodes = [
+		DOMElementNode(
+			tag_name=tag, xpath=f'body/{tag}', attributes={}, children=[], is_visible=True, parent=body, highlight_index=i
+		)
+		for i, tag in enumerate(tags)
+	]
+	body.children = nodes  # type: ignore
+	return dict(enumerate(nodes))
+
+
+async def test_multi_act_runs_read_only_actions_concurrently_and_keeps_their_order(monkeypatch):
+	agent, session, controller = multi_act_agent(monkeypatch, selector_map('button'))
+
+	results = await agent.multi_act(
+		multi_act_actions(
+			{'extract_content': {'value': 'first', 'after': 'second'}},
+			{'extract_content': {'value': 'second'}},
+			{'click_element_by_index': {'index': 0}},
+			{'click_element_by_index': {'index': 0}},
+		)
+	)
+
+	# the first extraction only finishes once the second started
+	assert controller.log[:3] == ['start first', 'start second', 'end second']
+	assert [r.extracted_content for r in results] == ['first', 'second', 'clicked 0', 'clicked 0']
+	# no wait after the read-only actions, one after the first click
+	assert session.waits == 1
+	# the first click did not change the page, the second one needs no fresh state
+	assert session.captures == 0
+
+
+@pytest.mark.parametrize(
+	'last_read_only, expected',
+	[
+		({'extract_content': {'value': 'fail'}}, ['first', None]),
+		({'done': {'text': 'finished', 'success': True}}, ['first', 'finished']),
+	],
+)
+async def test_multi_act_stops_when_a_read_only_action_ends_the_step(monkeypatch, last_read_only, expected):
+	agent, session, controller = multi_act_agent(monkeypatch, selector_map('button'))
+
+	results = await agent.multi_act(
+		multi_act_actions(
+			{'extract_content': {'value': 'first'}},
+			last_read_only,
+			{'click_element_by_index': {'index': 0}},
+		)
+	)
+
+	assert [r.extracted_content for r in results] == expected
+	assert results[-1].is_done or results[-1].error
+	assert 'click 0' not in controller.log
+
+
+async def test_multi_act_checks_indices_against_the_recaptured_state(monkeypatch):
+	# clicking the button removes the div, the link takes over its index
+	agent, session, controller = multi_act_agent(
+		monkeypatch, selector_map('button', 'input', 'div', 'a'), selector_map('button', 'input', 'a')
+	)
+
+	results = await agent.multi_act(
+		multi_act_actions(
+			{'click_element_by_index': {'index': 0}},
+			{'click_element_by_index': {'index': 1}},
+			{'extract_content': {'value': 'text'}},
+			{'click_element_by_index': {'index': 2}},
+		)
+	)
+
+	# the second click recaptures the state, its element kept its index. The page did not change after the second click,
+	# but the last click is still checked against the recaptured state, in which index 2 is the link
+	assert session.captures == 1
+	assert controller.log == ['click 0', 'click 1', 'start text', 'end text']
+	assert [r.extracted_content for r in results[:3]] == ['clicked 0', 'clicked 1', 'text']
+	assert 'Element index changed after action 3' in results[3].extracted_content
+
+
+async def test_multi_act_stops_when_new_elements_appear(monkeypatch):
+	agent, session, controller = multi_act_agent(monkeypatch, selector_map('button'), selector_map('button', 'dialog'))
+
+	results = await agent.multi_act(
+		multi_act_actions({'click_element_by_index': {'index': 0}}, {'click_element_by_index': {'index': 0}})
+	)
+
+	assert controller.log == ['click 0']
+	assert 'Something new appeared after action 1' in results[-1].extracted_content
+
+
+async def test_cookie_saves_are_debounced_and_skip_unchanged_jars(tmp_path, monkeypatch):
+	import asyncio
+	import json
+
+	from browser_use.browser import cookies as cookies_module
+	from browser_use.browser.cookies import CookiePersister
+
+	jar = [{'name': 'session', 'value': '1'}]
+	reads = 0
+
+	async def get_cookies():
+		nonlocal reads
+		reads += 1
+		return list(jar)
+
+	writes = []
+	write_file_atomically = cookies_module.write_file_atomically
+	monkeypatch.setattr(
+		cookies_module, 'write_file_atomically', lambda path, text: (writes.append(text), write_file_atomically(path, text))
+	)
+	path = tmp_path / 'cookies' / 'cookies.json'
+	persister = CookiePersister(path, get_cookies, debounce=0.05)
+
+	# saves requested within the debounce window are coalesced into one
+	for _ in range(5):
+		persister.schedule()
+	await asyncio.sleep(0.1)
+	assert (reads, len(writes)) == (1, 1)
+	assert json.loads(path.read_text()) == jar
+
+	# an unchanged jar is not written again
+	persister.schedule()
+	await asyncio.sleep(0.1)
+	assert (reads, len(writes)) == (2, 1)
+
+	# flush replaces the save still waiting for the debounce window
+	jar.append({'name': 'theme', 'value': 'dark'})
+	persister.schedule()
+	await persister.flush()
+	await asyncio.sleep(0.1)
+	assert (reads, len(writes)) == (3, 2)
+	assert json.loads(path.read_text()) == jar
+
+	# the file is replaced atomically, no temporary file is left next to it
+	assert [file.name for file in path.parent.iterdir()] == ['cookies.json']
+
+	# a write that fails midway leaves the previous file and no temporary file behind
+	def fail(*args):
+		raise OSError('disk full')
+
+	monkeypatch.setattr(cookies_module.os, 'replace', fail)
+	with pytest.raises(OSError):
+		write_file_atomically(path, '[]')
+	assert json.loads(path.read_text()) == jar
+	assert [file.name for file in path.parent.iterdir()] == ['cookies.json']
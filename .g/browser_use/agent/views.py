@@ -8,9 +8,10 @@ from typing import Any, Literal
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from openai import RateLimitError
-from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, ValidationError, create_model
 from uuid_extensions import uuid7str
 
+from browser_use.agent.message_manager.token_counter import Tokenizer
 from browser_use.agent.message_manager.views import MessageManagerState
 from browser_use.browser.views import BrowserStateHistory
 from browser_use.controller.registry.views import ActionModel
@@ -41,9 +42,17 @@ class AgentSettings(BaseModel):
 	use_vision_for_planner: bool = False
 	save_conversation_path: str | None = None
 	save_conversation_path_encoding: str | None = 'utf-8'
+	save_history_path: str | None = None  # directory, each step is appended to a HistoryStore as soon as it finishes
+	max_screenshots_in_memory: int | None = None  # older screenshots in the history are evicted, None keeps all
+	# spill evicted screenshots to disk, or drop them. Without save_history_path they are spilled to a temporary
+	# directory that is removed when the agent is closed
+	evicted_screenshots: Literal['disk', 'drop'] = 'disk'
 	max_failures: int = 3
 	retry_delay: int = 10
 	max_input_tokens: int = 128000
+	tokenizer: Tokenizer = 'estimate'
+	max_elements_tokens: int | None = None
+	cache_friendly_prompt: bool = False
 	validate_output: bool = False
 	message_context: str | None = None
 	generate_gif: bool | str = False
@@ -63,8 +72,11 @@ class AgentSettings(BaseModel):
 		'aria-expanded',
 	]
 	max_actions_per_step: int = 10
+	pipelined_steps: bool = False
 
 	tool_calling_method: ToolCallingMethod | None = 'auto'
+	stream_llm_output: bool = False  # raw tool calling method only
+	stream_actions: bool = False  # raw tool calling method only, execute actions while the output still streams in
 	page_extraction_llm: BaseChatModel | None = None
 	planner_llm: BaseChatModel | None = None
 	planner_interval: int = 1  # Run planner every N steps
@@ -120,6 +132,8 @@ class StepMetadata(BaseModel):
 	step_end_time: float
 	input_tokens: int  # Approximate tokens from message manager for this step
 	step_number: int
+	cacheable_prefix_ratio: float | None = None  # share of input tokens unchanged since the previous request
+	page_load_wait_seconds: float | None = None  # waiting for the page to settle, before the state capture and in actions
 
 	@property
 	def duration_seconds(self) -> float:
@@ -163,7 +177,15 @@ class AgentOutput(BaseModel):
 
 	@staticmethod
 	def type_with_custom_actions(custom_actions: type[ActionModel]) -> type[AgentOutput]:
-		"""Extend actions with custom actions"""
+		"""
+		Extend actions with custom actions, built once per action model. The model is kept on the action model class,
+		so it is released with it instead of piling up in a module-wide cache.
+		"""
+		# __dict__ rather than getattr, a subclass of the action model must not get the model of its base
+		model_ = custom_actions.__dict__.get('_agent_output_model')
+		if model_ is not None:
+			return model_
+
 		model_ = create_model(
 			'AgentOutput',
 			__base__=AgentOutput,
@@ -174,6 +196,7 @@ class AgentOutput(BaseModel):
 			__module__=AgentOutput.__module__,
 		)
 		model_.__doc__ = 'AgentOutput model with custom actions'
+		custom_actions._agent_output_model = model_  # type: ignore
 		return model_
 
 
@@ -188,17 +211,37 @@ class AgentHistory(BaseModel):
 	model_config = ConfigDict(arbitrary_types_allowed=True, protected_namespaces=())
 
 	@staticmethod
-	def get_interacted_element(model_output: AgentOutput, selector_map: SelectorMap) -> list[DOMHistoryElement | None]:
+	def get_interacted_element(
+		model_output: AgentOutput,
+		selector_map: SelectorMap,
+		history_elements: dict[int, DOMHistoryElement] | None = None,
+	) -> list[DOMHistoryElement | None]:
+		"""history_elements are elements of selector_map converted before their nodes were patched in place"""
 		elements = []
 		for action in model_output.action:
 			index = action.get_index()
-			if index is not None and index in selector_map:
+			if history_elements and index in history_elements:
+				elements.append(history_elements[index])
+			elif index is not None and index in selector_map:
 				el: DOMElementNode = selector_map[index]
 				elements.append(HistoryTreeProcessor.convert_dom_element_to_history_element(el))
 			else:
 				elements.append(None)
 		return elements
 
+	@staticmethod
+	def load_from_dict(data: dict[str, Any], output_model: type[AgentOutput]) -> AgentHistory:
+		"""Load a history item saved with model_dump()"""
+		# validate output_model actions to enrich with custom actions
+		if data['model_output']:
+			if isinstance(data['model_output'], dict):
+				data['model_output'] = output_model.model_validate(data['model_output'])
+			else:
+				data['model_output'] = None
+		if 'interacted_element' not in data['state']:
+			data['state']['interacted_element'] = None
+		return AgentHistory.model_validate(data)
+
 	def model_dump(self, **kwargs) -> dict[str, Any]:
 		"""Custom serialization handling circular references"""
 
@@ -223,6 +266,8 @@ class AgentHistoryList(BaseModel):
 	"""List of AgentHistory messages, i.e. the history of the agent's actions and thoughts."""
 
 	history: list[AgentHistory]
+	# temporary directory of the screenshots evicted from memory, removed once neither the history nor its agent use it
+	_screenshot_spill_dir: Any = PrivateAttr(default=None)
 
 	def total_duration_seconds(self) -> float:
 		"""Get total duration of all steps in seconds"""
@@ -309,17 +354,7 @@ class AgentHistoryList(BaseModel):
 		"""Load history from JSON file"""
 		with open(filepath, encoding='utf-8') as f:
 			data = json.load(f)
-		# loop through history and validate output_model actions to enrich with custom actions
-		for h in data['history']:
-			if h['model_output']:
-				if isinstance(h['model_output'], dict):
-					h['model_output'] = output_model.model_validate(h['model_output'])
-				else:
-					h['model_output'] = None
-			if 'interacted_element' not in h['state']:
-				h['state']['interacted_element'] = None
-		history = cls.model_validate(data)
-		return history
+		return cls(history=[AgentHistory.load_from_dict(h, output_model) for h in data['history']])
 
 	def last_action(self) -> None | dict:
 		"""Last action in history"""
@@ -367,8 +402,8 @@ class AgentHistoryList(BaseModel):
 		return [h.state.url if h.state.url is not None else None for h in self.history]
 
 	def screenshots(self) -> list[str | None]:
-		"""Get all screenshots from history"""
-		return [h.state.screenshot if h.state.screenshot is not None else None for h in self.history]
+		"""Get all screenshots from history, screenshots stored on disk are read back"""
+		return [h.state.get_screenshot() for h in self.history]
 
 	def action_names(self) -> list[str]:
 		"""Get all action names from history"""
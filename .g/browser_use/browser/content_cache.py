@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ContentCacheStats:
+	"""
+	Hit/miss counters of a PageContentCache
+	"""
+
+	html_hits: int = 0
+	html_misses: int = 0
+	markdown_hits: int = 0
+	markdown_misses: int = 0
+	extraction_hits: int = 0
+	extraction_misses: int = 0
+	evictions: int = 0
+
+	def __str__(self) -> str:
+		return (
+			f'html {self.html_hits}/{self.html_hits + self.html_misses} hits, '
+			f'markdown {self.markdown_hits}/{self.markdown_hits + self.markdown_misses} hits, '
+			f'extractions {self.extraction_hits}/{self.extraction_hits + self.extraction_misses} hits, '
+			f'{self.evictions} evictions'
+		)
+
+
+@dataclass
+class FrameContent:
+	"""
+	HTML of a frame at one DOM version and the markdown converted from it
+	"""
+
+	key: tuple
+	html: str
+	markdown: dict[bool, str] = field(default_factory=dict)  # keyed by strip_links
+
+	@property
+	def size(self) -> int:
+		return len(self.html) + sum(len(markdown) for markdown in self.markdown.values())
+
+
+class PageContentCache:
+	"""
+	LRU cache of frame HTML, its markdown and extract_content results, bounded by the characters it holds.
+	Frames are keyed by url plus the DOM mutation counter of DOM_FINGERPRINT_JS, so any change to the page is a miss.
+	Extraction results are keyed by a hash of the markdown they were extracted from and the goal.
+	"""
+
+	def __init__(self, max_chars: int):
+		self.max_chars = max_chars
+		self.stats = ContentCacheStats()
+		self._frames: OrderedDict[tuple, FrameContent] = OrderedDict()
+		self._extractions: OrderedDict[tuple[bytes, str], str] = OrderedDict()
+		self._size = 0
+
+	def get_frame(self, key: tuple) -> FrameContent | None:
+		content = self._frames.get(key)
+		if content is None:
+			self.stats.html_misses += 1
+			return None
+		self.stats.html_hits += 1
+		self._frames.move_to_end(key)
+		return content
+
+	def put_frame(self, key: tuple, html: str) -> FrameContent:
+		content = FrameContent(key=key, html=html)
+		if key in self._frames:
+			self._size -= self._frames.pop(key).size
+		self._frames[key] = content
+		self._size += content.size
+		self._evict()
+		return content
+
+	async def get_markdown(self, content: FrameContent, strip_links: bool) -> str:
+		"""Markdown of the frame, converted in a worker thread on a miss so big pages don't block the event loop"""
+		markdown = content.markdown.get(strip_links)
+		if markdown is not None:
+			self.stats.markdown_hits += 1
+			return markdown
+
+		self.stats.markdown_misses += 1
+		markdown = await html_to_markdown(content.html, strip_links)
+		content.markdown[strip_links] = markdown
+		if self._frames.get(content.key) is content:
+			self._size += len(markdown)
+			self._evict()
+		return markdown
+
+	def get_extraction(self, markdown: str, goal: str) -> str | None:
+		key = (_hash_text(markdown), goal)
+		extraction = self._extractions.get(key)
+		if extraction is None:
+			self.stats.extraction_misses += 1
+			return None
+		self.stats.extraction_hits += 1
+		self._extractions.move_to_end(key)
+		return extraction
+
+	def put_extraction(self, markdown: str, goal: str, extraction: str) -> None:
+		key = (_hash_text(markdown), goal)
+		if key in self._extractions:
+			self._size -= len(self._extractions.pop(key))
+		self._extractions[key] = extraction
+		self._size += len(extraction)
+		self._evict()
+
+	def clear(self) -> None:
+		self._frames.clear()
+		self._extractions.clear()
+		self._size = 0
+
+	def _evict(self) -> None:
+		# frames are much larger than extractions and go first, extractions only once no frame is left
+		while self._size > self.max_chars and (self._frames or self._extractions):
+			if self._frames:
+				_, content = self._frames.popitem(last=False)
+				self._size -= content.size
+			else:
+				_, extraction = self._extractions.popitem(last=False)
+				self._size -= len(extraction)
+			self.stats.evictions += 1
+
+
+class MarkdownCache:
+	"""
+	Small LRU of converted markdown keyed by a hash of the html, so repeated extract_content calls on an unchanged page
+	skip markdownify even when the PageContentCache is disabled
+	"""
+
+	def __init__(self, max_entries: int = 32):
+		self.max_entries = max_entries
+		self._markdown: OrderedDict[tuple[bytes, bool], str] = OrderedDict()
+
+	async def get_markdown(self, html: str, strip_links: bool) -> str:
+		key = (_hash_text(html), strip_links)
+		markdown = self._markdown.get(key)
+		if markdown is not None:
+			self._markdown.move_to_end(key)
+			return markdown
+
+		markdown = await html_to_markdown(html, strip_links)
+		self._markdown[key] = markdown
+		if len(self._markdown) > self.max_entries:
+			self._markdown.popitem(last=False)
+		return markdown
+
+
+async def html_to_markdown(html: str, strip_links: bool) -> str:
+	"""markdownify in a worker thread, links and images are stripped unless the goal needs them"""
+	import markdownify
+
+	return await asyncio.to_thread(markdownify.markdownify, html, strip=['a', 'img'] if strip_links else [])
+
+
+def _hash_text(text: str) -> bytes:
+	return hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
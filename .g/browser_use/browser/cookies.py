@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class CookiePersister:
+	"""
+	Keeps a cookies file in sync with the browser without writing it on every step: saves requested within the debounce
+	window are coalesced into one, jars identical to the last one written are skipped and the file is replaced atomically
+	from a worker thread, so concurrent sessions neither race on the file nor block the event loop.
+	"""
+
+	def __init__(self, path: Path, get_cookies: Callable[[], Awaitable[list[dict[str, Any]]]], debounce: float = 1.0):
+		self.path = path
+		self.get_cookies = get_cookies
+		self.debounce = debounce
+		self._pending: asyncio.Task | None = None
+		self._lock = asyncio.Lock()
+		self._persisted_digest: bytes | None = None
+
+	def schedule(self) -> None:
+		"""Save the cookies once the debounce window is over, does nothing if a save is already pending"""
+		if self._pending is None or self._pending.done():
+			self._pending = asyncio.create_task(self._save_later())
+
+	async def flush(self) -> None:
+		"""Save the cookies right away, replaces a save that is still waiting for the debounce window"""
+		if self._pending is not None and not self._pending.done():
+			self._pending.cancel()
+		self._pending = None
+		await self._save()
+
+	async def _save_later(self) -> None:
+		await asyncio.sleep(self.debounce)
+		# once started the save is not cancelled by flush(), which waits for it on the lock instead
+		await asyncio.shield(self._save_logged())
+
+	async def _save_logged(self) -> None:
+		try:
+			await self._save()
+		except Exception as e:
+			logger.debug(f'❌ Failed to save cookies to {self.path}: {type(e).__name__}: {e}')
+
+	async def _save(self) -> None:
+		async with self._lock:
+			cookies = await self.get_cookies()
+			text = await asyncio.to_thread(json.dumps, cookies, indent=4)
+			digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+			if digest == self._persisted_digest:
+				return
+			await asyncio.to_thread(write_file_atomically, self.path, text)
+			self._persisted_digest = digest
+			logger.debug(f'🍪 Saved {len(cookies)} cookies to {self.path}')
+
+
+def write_file_atomically(path: Path, text: str) -> None:
+	"""Write to a temporary file next to path and rename it over path, readers never see a partially written file"""
+	path.parent.mkdir(parents=True, exist_ok=True)
+	fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+	try:
+		with os.fdopen(fd, 'w') as f:
+			f.write(text)
+		os.replace(tmp_path, path)
+	except BaseException:
+		Path(tmp_path).unlink(missing_ok=True)
+		raise
@@ -296,6 +296,12 @@ class RecordHarMode(str, Enum):
 	MINIMAL = 'minimal'
 
 
+class ScreenshotFormat(str, Enum):
+	PNG = 'png'
+	JPEG = 'jpeg'
+	WEBP = 'webp'
+
+
 class BrowserChannel(str, Enum):
 	CHROMIUM = 'chromium'
 	CHROME = 'chrome'
@@ -577,11 +583,50 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
 	maximum_wait_page_load_time: float = Field(default=5.0, description='Maximum time to wait for page load.')
 	wait_between_actions: float = Field(default=0.5, description='Time to wait between actions.')
+	wait_for_dom_quiet_time: float = Field(
+		default=0.0,
+		description='Also wait until the DOM had no mutations for this long (0 to disable), capped by maximum_wait_page_load_time.',
+	)
 
 	# --- UI/viewport/DOM ---
 	include_dynamic_attributes: bool = Field(default=True, description='Include dynamic attributes in selectors.')
 	highlight_elements: bool = Field(default=True, description='Highlight interactive elements on the page.')
+	bulk_text_input: bool = Field(
+		default=False,
+		description='Insert text into plain text fields in one round-trip instead of typing it key by key, fields that need key events are still typed.',
+	)
 	viewport_expansion: int = Field(default=500, description='Viewport expansion in pixels for LLM context.')
+	incremental_dom_snapshots: bool = Field(
+		default=False,
+		description='Keep a mutation-tracked DOM snapshot inside the page and only transfer the nodes that changed between steps.',
+	)
+	compact_dom_transport: bool = Field(
+		default=False,
+		description='Transfer the DOM tree as int32 columns plus a string table instead of nested JSON (ignored with incremental_dom_snapshots).',
+	)
+
+	# --- Screenshots ---
+	screenshot_format: ScreenshotFormat = Field(
+		default=ScreenshotFormat.PNG,
+		description='Image format of state screenshots, webp and downscaling are re-encoded with Pillow.',
+	)
+	screenshot_quality: int | None = Field(
+		default=None, ge=0, le=100, description='JPEG/WebP quality of state screenshots, ignored for PNG.'
+	)
+	screenshot_max_dimension: int | None = Field(
+		default=None, gt=0, description='Downscale state screenshots so their longest side is at most this many pixels.'
+	)
+	screenshot_reuse_unchanged: bool = Field(
+		default=False,
+		description='Reuse the previous screenshot when url, scroll position, form values and DOM tree are unchanged.',
+	)
+
+	# --- Page content cache ---
+	content_cache_max_chars: int = Field(
+		default=0,
+		ge=0,
+		description='Cache page HTML, markdown and extract_content results up to this many characters, keyed by url and DOM mutations (0 to only cache the markdown of recent pages).',
+	)
 
 	profile_directory: str = 'Default'  # e.g. 'Profile 1', 'Profile 2', 'Custom Profile', etc.
 
@@ -2,34 +2,41 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
+import io
 import json
 import logging
 import os
 import re
 import time
+import weakref
+from collections.abc import Awaitable, Iterable
 from dataclasses import dataclass
-from functools import wraps
+from functools import cache, wraps
 from pathlib import Path
-from typing import Any, Self
+from typing import Any, Self, TypeVar
 from urllib.parse import urlparse
 
 import psutil
 from patchright.async_api import Playwright as PatchrightPlaywright
 from playwright.async_api import Browser as PlaywrightBrowser
 from playwright.async_api import BrowserContext as PlaywrightBrowserContext
-from playwright.async_api import ElementHandle, FrameLocator, Page, Playwright, async_playwright
+from playwright.async_api import ElementHandle, Frame, FrameLocator, Page, Playwright, async_playwright
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, InstanceOf, PrivateAttr, model_validator
 
-from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.content_cache import FrameContent, MarkdownCache, PageContentCache
+from browser_use.browser.cookies import CookiePersister, write_file_atomically
+from browser_use.browser.profile import BrowserProfile, ScreenshotFormat
 from browser_use.browser.views import (
 	BrowserError,
 	BrowserStateSummary,
+	PageLoadWaitMetrics,
 	TabInfo,
 	URLNotAllowedError,
 )
-from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
+from browser_use.dom.history_tree_processor.view import HashedDomElement
 from browser_use.dom.service import DomService
-from browser_use.dom.views import DOMElementNode, SelectorMap
+from browser_use.dom.views import DOMBaseNode, DOMElementNode, DOMState, DOMTextNode, SelectorMap
 from browser_use.utils import match_url_with_domain_pattern, time_execution_async, time_execution_sync
 
 # Check if running in Docker
@@ -37,6 +44,8 @@ IN_DOCKER = os.environ.get('IN_DOCKER', 'false').lower()[0] in 'ty1'
 
 logger = logging.getLogger('browser_use.browser.session')
 
+T = TypeVar('T')
+
 
 _GLOB_WARNING_SHOWN = False  # used inside _is_url_allowed to avoid spamming the logs with the same warning multiple times
 
@@ -88,6 +97,262 @@ def require_initialization(func):
 	return wrapper
 
 
+@cache
+def _warn_pillow_missing() -> None:
+	logger.warning('⚠️ Pillow is not installed, screenshots are sent as captured (pip install pillow for webp and downscaling)')
+
+
+def _encode_screenshot(
+	screenshot: bytes,
+	image_format: ScreenshotFormat,
+	quality: int | None,
+	max_dimension: int | None,
+) -> str:
+	"""Downscale / convert a captured screenshot if needed and base64 encode it, runs in a worker thread"""
+	if image_format == ScreenshotFormat.WEBP or max_dimension is not None:
+		try:
+			from PIL import Image
+		except ImportError:
+			_warn_pillow_missing()
+		else:
+			image = Image.open(io.BytesIO(screenshot))
+			too_large = max_dimension is not None and max(image.size) > max_dimension
+			if too_large or (image.format or '').lower() != image_format.value:
+				if too_large:
+					image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+				if image_format == ScreenshotFormat.JPEG and image.mode not in ('RGB', 'L'):
+					image = image.convert('RGB')
+
+				save_kwargs = {'quality': quality} if quality is not None and image_format != ScreenshotFormat.PNG else {}
+				output = io.BytesIO()
+				image.save(output, format=image_format.value.upper(), **save_kwargs)
+				screenshot = output.getvalue()
+
+	return base64.b64encode(screenshot).decode('utf-8')
+
+
+# Everything outside the DOM tree that changes what a screenshot shows: scroll, viewport, focus and form values
+SCREENSHOT_SIGNATURE_JS = """() => {
+	const fields = Array.from(document.querySelectorAll('input, textarea, select'), el => `${el.value}|${el.checked ?? ''}`);
+	const active = document.activeElement;
+	return [window.scrollX, window.scrollY, window.innerWidth, window.innerHeight, active ? active.tagName : '', fields.join('\\n')];
+}"""
+
+
+# Cheap fingerprint of the page for validating a state captured ahead of time. A MutationObserver installed on first
+# use counts DOM changes, the highlight overlay drawn and removed by browser-use itself is not counted.
+DOM_FINGERPRINT_JS = """() => {
+	let tracker = window.__browserUseDomVersion;
+	if (!tracker) {
+		tracker = window.__browserUseDomVersion = { epoch: Math.random().toString(36).slice(2), mutations: 0 };
+		const isHighlight = node => node.id === 'playwright-highlight-container';
+		new MutationObserver(records => {
+			for (const record of records) {
+				const target = record.target.nodeType === 1 ? record.target : record.target.parentElement;
+				if (target && target.closest('#playwright-highlight-container')) continue;
+				if (record.type === 'attributes' && record.attributeName === 'browser-user-highlight-id') continue;
+				if (record.type === 'childList' && [...record.addedNodes, ...record.removedNodes].every(isHighlight)) continue;
+				tracker.mutations++;
+			}
+		}).observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+	}
+	const fields = Array.from(document.querySelectorAll('input, textarea, select'), el => `${el.value}|${el.checked ?? ''}`);
+	const active = document.activeElement;
+	return [
+		location.href, tracker.epoch, tracker.mutations, window.scrollX, window.scrollY, window.innerWidth, window.innerHeight,
+		active ? active.tagName : '', fields.join('\\n'),
+	];
+}"""
+
+
+def _fingerprint_screenshot_inputs(url: str, page_signature: list, element_tree: DOMElementNode) -> str:
+	hasher = hashlib.blake2b(json.dumps([url, page_signature]).encode(), digest_size=16)
+	stack: list[DOMBaseNode] = [element_tree]
+	while stack:
+		node = stack.pop()
+		if isinstance(node, DOMTextNode):
+			hasher.update(f'{node.is_visible}{node.text}\0'.encode())
+		elif isinstance(node, DOMElementNode):
+			hasher.update(f'<{node.tag_name} {node.attributes} {node.is_visible} {node.highlight_index}\0'.encode())
+			stack.extend(node.children)
+	return hasher.hexdigest()
+
+
+# Requests that count towards "the page is still loading", see _wait_for_stable_network()
+RELEVANT_RESOURCE_TYPES = frozenset({'document', 'stylesheet', 'image', 'font', 'script', 'iframe'})
+
+RELEVANT_CONTENT_TYPES_RE = re.compile(r'text/html|text/css|application/javascript|image/|font/|application/json')
+
+STREAMING_CONTENT_TYPES_RE = re.compile(r'streaming|video|audio|webm|mp4|event-stream|websocket|protobuf')
+
+IGNORED_URL_PATTERNS_RE = re.compile(
+	'|'.join(
+		re.escape(pattern)
+		for pattern in (
+			# Analytics and tracking
+			'analytics',
+			'tracking',
+			'telemetry',
+			'beacon',
+			'metrics',
+			# Ad-related
+			'doubleclick',
+			'adsystem',
+			'adserver',
+			'advertising',
+			# Social media widgets
+			'facebook.com/plugins',
+			'platform.twitter',
+			'linkedin.com/embed',
+			# Live chat and support
+			'livechat',
+			'zendesk',
+			'intercom',
+			'crisp.chat',
+			'hotjar',
+			# Push notifications
+			'push-notifications',
+			'onesignal',
+			'pushwoosh',
+			# Background sync/heartbeat
+			'heartbeat',
+			'ping',
+			'alive',
+			# WebRTC and streaming
+			'webrtc',
+			'rtmp://',
+			'wss://',
+			# Common CDNs for dynamic content
+			'cloudfront.net',
+			'fastly.net',
+		)
+	)
+)
+
+
+def _is_relevant_request(request) -> bool:
+	if request.resource_type not in RELEVANT_RESOURCE_TYPES:
+		return False
+
+	# Filter out data URLs, blob URLs and known background traffic
+	url = request.url.lower()
+	if url.startswith(('data:', 'blob:')) or IGNORED_URL_PATTERNS_RE.search(url):
+		return False
+
+	# Filter out prefetches and media
+	headers = request.headers
+	return headers.get('purpose') != 'prefetch' and headers.get('sec-fetch-dest') not in ('video', 'audio')
+
+
+def _is_relevant_response(response) -> bool:
+	content_type = response.headers.get('content-type', '').lower()
+	if STREAMING_CONTENT_TYPES_RE.search(content_type) or not RELEVANT_CONTENT_TYPES_RE.search(content_type):
+		return False
+
+	# Skip if response is too large (likely not essential for page load)
+	content_length = response.headers.get('content-length', '')
+	return not (content_length.isdigit() and int(content_length) > 5 * 1024 * 1024)  # 5MB
+
+
+# visibility check and scroll in a single round-trip, also tells whether a cached handle is still attached
+LOCATE_ELEMENT_JS = """(el, scroll) => {
+	if (!el.isConnected) return { connected: false, visible: false };
+	const rect = el.getBoundingClientRect();
+	const visible = rect.width > 0 && rect.height > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+	if (visible && scroll) {
+		if (typeof el.scrollIntoViewIfNeeded === 'function') el.scrollIntoViewIfNeeded();
+		else el.scrollIntoView({ block: 'center', inline: 'center' });
+	}
+	return { connected: true, visible };
+}"""
+
+# Probes an element for text input in a single round-trip and, with insert set, replaces the content of plain text
+# fields right away like a paste: trusted beforeinput/input events but no key events. Returns 'inserted', or how the
+# text still has to be entered: 'type' key by key or 'fill', the same choice as before there was an insert path.
+INPUT_TEXT_JS = """(el, [text, insert]) => {
+	const tag = el.tagName.toLowerCase();
+	const editable = (el.isContentEditable || tag === 'input' || tag === 'textarea') && !el.readOnly && !el.disabled;
+	const method = editable && (el.isContentEditable || tag === 'input') ? 'type' : 'fill';
+	if (!insert || !editable) return method;
+
+	const rect = el.getBoundingClientRect();
+	const visible = rect.width > 0 && rect.height > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+	const textTypes = ['text', 'search', 'url', 'tel', 'password', 'email'];
+	const plainText = el.isContentEditable || tag === 'textarea' || textTypes.includes(el.type);
+	// typed newlines press enter (e.g. to submit), fields with key handlers or suggestions react to the keys themselves
+	const pressesEnter = tag !== 'textarea' && /[\\r\\n]/.test(text);
+	const keyHandlers = ['onkeydown', 'onkeyup', 'onkeypress'].some(name => el.hasAttribute(name));
+	const suggestions = el.getAttribute('role') === 'combobox' || el.hasAttribute('list')
+		|| (el.getAttribute('aria-autocomplete') || 'none') !== 'none';
+	if (!visible || !plainText || pressesEnter || keyHandlers || suggestions) return method;
+
+	const doc = el.ownerDocument;
+	el.focus({ preventScroll: true });
+	const active = doc.activeElement;
+	if (active !== el && !(el.isContentEditable && active && active.contains(el))) return method;
+	if (el.isContentEditable) {
+		const range = doc.createRange();
+		range.selectNodeContents(el);
+		doc.getSelection().removeAllRanges();
+		doc.getSelection().addRange(range);
+	} else {
+		el.select();
+	}
+	const done = doc.execCommand(text ? 'insertText' : 'delete', false, text);
+	// the page may have rejected or reformatted the insert, enter the text the usual way then
+	const inserted = el.isContentEditable ? el.textContent.includes(text) : el.value === text;
+	return done && inserted ? 'inserted' : method;
+}"""
+
+# Resolves once the document had no mutations for quietMs (or after timeoutMs)
+WAIT_FOR_DOM_QUIET_JS = """([quietMs, timeoutMs]) => new Promise(resolve => {
+	let quietTimer = null;
+	const done = () => {
+		observer.disconnect();
+		clearTimeout(quietTimer);
+		clearTimeout(timeoutTimer);
+		resolve();
+	};
+	const observer = new MutationObserver(() => {
+		clearTimeout(quietTimer);
+		quietTimer = setTimeout(done, quietMs);
+	});
+	const timeoutTimer = setTimeout(done, timeoutMs);
+	observer.observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+	quietTimer = setTimeout(done, quietMs);
+})"""
+
+
+async def _timed(timings: dict[str, float], name: str, awaitable: Awaitable[T]) -> T:
+	"""Await and record how long it took under timings[name]"""
+	start_time = time.perf_counter()
+	try:
+		return await awaitable
+	finally:
+		timings[name] = time.perf_counter() - start_time
+
+
+# keeps the background disposals referenced until they finish
+_disposing_handles: set[asyncio.Task] = set()
+
+
+def _dispose_in_background(locators: Iterable[CachedLocator]) -> None:
+	"""Release the handles of dropped locators in the page without waiting for it, the page may be gone already"""
+
+	async def dispose(element_handle: ElementHandle) -> None:
+		try:
+			await element_handle.dispose()
+		except Exception:
+			pass
+
+	for locator in locators:
+		if locator.element_handle is not None:
+			task = asyncio.create_task(dispose(locator.element_handle))
+			_disposing_handles.add(task)
+			task.add_done_callback(_disposing_handles.discard)
+			locator.element_handle = None
+
+
 DEFAULT_BROWSER_PROFILE = BrowserProfile()
 
 
@@ -98,7 +363,38 @@ class CachedClickableElementHashes:
 	"""
 
 	url: str
-	hashes: set[str]
+	hashes: set[HashedDomElement]
+
+
+@dataclass
+class CachedScreenshot:
+	"""
+	Last state screenshot and a fingerprint of the page it was taken from
+	"""
+
+	signature: str
+	screenshot: str
+
+
+@dataclass
+class StatePrefetch:
+	"""
+	A state captured ahead of time and the page it was captured from
+	"""
+
+	page: Page
+	state: BrowserStateSummary
+
+
+@dataclass
+class CachedLocator:
+	"""
+	Selectors generated for an element and the handle they last resolved to
+	"""
+
+	frame_selectors: tuple[str, ...]
+	css_selector: str
+	element_handle: ElementHandle | None = None
 
 
 class BrowserSession(BaseModel):
@@ -181,6 +477,15 @@ class BrowserSession(BaseModel):
 
 	_cached_browser_state_summary: BrowserStateSummary | None = PrivateAttr(default=None)
 	_cached_clickable_element_hashes: CachedClickableElementHashes | None = PrivateAttr(default=None)
+	_cached_screenshot: CachedScreenshot | None = PrivateAttr(default=None)
+	_content_cache: PageContentCache | None = PrivateAttr(default=None)
+	_markdown_cache: MarkdownCache = PrivateAttr(default_factory=MarkdownCache)
+	_page_load_wait_seconds: float = PrivateAttr(default=0.0)
+	_cookie_persister: CookiePersister | None = PrivateAttr(default=None)
+	_dom_services: weakref.WeakKeyDictionary[Page, DomService] = PrivateAttr(default_factory=weakref.WeakKeyDictionary)
+	_locator_caches: weakref.WeakKeyDictionary[Page, dict[HashedDomElement, CachedLocator]] = PrivateAttr(
+		default_factory=weakref.WeakKeyDictionary
+	)
 
 	@model_validator(mode='after')
 	def apply_session_overrides_to_profile(self) -> Self:
@@ -253,6 +558,13 @@ class BrowserSession(BaseModel):
 
 		self.initialized = False
 
+		# write out the last cookies while the browser is still there to ask for them
+		if self._cookie_persister and self.browser_context:
+			try:
+				await self._cookie_persister.flush()
+			except Exception as e:
+				logger.debug(f'❌ Error saving cookies to {self._cookie_persister.path}: {type(e).__name__}: {e}')
+
 		if self.browser_profile.keep_alive:
 			return  # nothing to do if keep_alive=True, leave the browser running
 
@@ -880,20 +1192,20 @@ class BrowserSession(BaseModel):
 
 	@time_execution_async('--get_tabs_info')
 	async def get_tabs_info(self) -> list[TabInfo]:
-		"""Get information about all tabs"""
+		"""Get information about all tabs, titles are fetched from all tabs concurrently"""
 
-		tabs_info = []
-		for page_id, page in enumerate(self.browser_context.pages):
+		async def get_tab_info(page_id: int, page: Page) -> TabInfo:
 			try:
-				tab_info = TabInfo(page_id=page_id, url=page.url, title=await asyncio.wait_for(page.title(), timeout=1))
+				return TabInfo(page_id=page_id, url=page.url, title=await asyncio.wait_for(page.title(), timeout=1))
 			except TimeoutError:
 				# page.title() can hang forever on tabs that are crashed/disappeared/about:blank
 				# we dont want to try automating those tabs because they will hang the whole script
 				logger.debug('⚠  Failed to get tab info for tab #%s: %s (ignoring)', page_id, page.url)
-				tab_info = TabInfo(page_id=page_id, url='about:blank', title='ignore this tab and do not use it')
-			tabs_info.append(tab_info)
+				return TabInfo(page_id=page_id, url='about:blank', title='ignore this tab and do not use it')
 
-		return tabs_info
+		return list(
+			await asyncio.gather(*(get_tab_info(page_id, page) for page_id, page in enumerate(self.browser_context.pages)))
+		)
 
 	@require_initialization
 	async def close_tab(self, tab_index: int | None = None) -> None:
@@ -942,16 +1254,32 @@ class BrowserSession(BaseModel):
 		"""
 		Save cookies to the specified path or the default cookies_file in the downloads_dir.
 		"""
-		if self.browser_context:
-			cookies = await self.browser_context.cookies()
-			out_path = path or self.browser_profile.cookies_file
-			if out_path:
-				# If out_path is not absolute, resolve relative to downloads_dir
-				out_path = Path(out_path)
-				if not out_path.is_absolute():
-					out_path = Path(self.browser_profile.downloads_dir) / out_path
-				out_path.parent.mkdir(parents=True, exist_ok=True)
-				out_path.write_text(json.dumps(cookies, indent=4))  # TODO: replace with anyio asyncio or anyio write
+		if not self.browser_context:
+			return
+		if path is None:
+			cookie_persister = self._get_cookie_persister()
+			if cookie_persister:
+				await cookie_persister.flush()
+			return
+
+		cookies = await self.browser_context.cookies()
+		text = await asyncio.to_thread(json.dumps, cookies, indent=4)
+		await asyncio.to_thread(write_file_atomically, self._resolve_cookies_path(path), text)
+
+	def _resolve_cookies_path(self, path: str | Path) -> Path:
+		# If path is not absolute, resolve relative to downloads_dir
+		path = Path(path)
+		if not path.is_absolute():
+			path = Path(self.browser_profile.downloads_dir) / path
+		return path
+
+	def _get_cookie_persister(self) -> CookiePersister | None:
+		"""Debounced writer of browser_profile.cookies_file, None if no cookies_file is set"""
+		if self._cookie_persister is None and self.browser_profile.cookies_file:
+			self._cookie_persister = CookiePersister(
+				self._resolve_cookies_path(self.browser_profile.cookies_file), self.get_cookies
+			)
+		return self._cookie_persister
 
 	# @property
 	# def browser_extension_pages(self) -> list[Page]:
@@ -966,182 +1294,101 @@ class BrowserSession(BaseModel):
 	# 	"""
 	# 	return list(Path(self.browser_profile.downloads_dir).glob('*'))
 
-	async def _wait_for_stable_network(self):
-		pending_requests = set()
-		last_activity = asyncio.get_event_loop().time()
+	async def _wait_for_stable_network(self) -> float:
+		"""Wait until no relevant request was in flight for wait_for_network_idle_page_load_time.
 
+		Driven by the page's request/response events: every change re-arms a timer that sets an
+		asyncio.Event once the page has been idle long enough, nothing polls. Returns the time waited.
+		"""
 		page = await self.get_current_page()
+		loop = asyncio.get_running_loop()
+		idle_time = self.browser_profile.wait_for_network_idle_page_load_time
 
-		# Define relevant resource types and content types
-		RELEVANT_RESOURCE_TYPES = {
-			'document',
-			'stylesheet',
-			'image',
-			'font',
-			'script',
-			'iframe',
-		}
-
-		RELEVANT_CONTENT_TYPES = {
-			'text/html',
-			'text/css',
-			'application/javascript',
-			'image/',
-			'font/',
-			'application/json',
-		}
-
-		# Additional patterns to filter out
-		IGNORED_URL_PATTERNS = {
-			# Analytics and tracking
-			'analytics',
-			'tracking',
-			'telemetry',
-			'beacon',
-			'metrics',
-			# Ad-related
-			'doubleclick',
-			'adsystem',
-			'adserver',
-			'advertising',
-			# Social media widgets
-			'facebook.com/plugins',
-			'platform.twitter',
-			'linkedin.com/embed',
-			# Live chat and support
-			'livechat',
-			'zendesk',
-			'intercom',
-			'crisp.chat',
-			'hotjar',
-			# Push notifications
-			'push-notifications',
-			'onesignal',
-			'pushwoosh',
-			# Background sync/heartbeat
-			'heartbeat',
-			'ping',
-			'alive',
-			# WebRTC and streaming
-			'webrtc',
-			'rtmp://',
-			'wss://',
-			# Common CDNs for dynamic content
-			'cloudfront.net',
-			'fastly.net',
-		}
-
-		async def on_request(request):
-			# Filter by resource type
-			if request.resource_type not in RELEVANT_RESOURCE_TYPES:
-				return
-
-			# Filter out streaming, websocket, and other real-time requests
-			if request.resource_type in {
-				'websocket',
-				'media',
-				'eventsource',
-				'manifest',
-				'other',
-			}:
-				return
-
-			# Filter out by URL patterns
-			url = request.url.lower()
-			if any(pattern in url for pattern in IGNORED_URL_PATTERNS):
-				return
-
-			# Filter out data URLs and blob URLs
-			if url.startswith(('data:', 'blob:')):
-				return
-
-			# Filter out requests with certain headers
-			headers = request.headers
-			if headers.get('purpose') == 'prefetch' or headers.get('sec-fetch-dest') in [
-				'video',
-				'audio',
-			]:
+		pending_requests = set()
+		settled = asyncio.Event()
+		idle_timer: asyncio.TimerHandle | None = None
+		start_time = last_activity = loop.time()
+
+		def rearm_idle_timer() -> None:
+			nonlocal idle_timer
+			if idle_timer is not None:
+				idle_timer.cancel()
+				idle_timer = None
+			if not pending_requests:
+				idle_timer = loop.call_later(max(last_activity + idle_time - loop.time(), 0), settled.set)
+
+		def on_request(request) -> None:
+			nonlocal last_activity
+			if not _is_relevant_request(request):
 				return
 
-			nonlocal last_activity
 			pending_requests.add(request)
-			last_activity = asyncio.get_event_loop().time()
+			last_activity = loop.time()
+			rearm_idle_timer()
 			# logger.debug(f'Request started: {request.url} ({request.resource_type})')
 
-		async def on_response(response):
+		def on_response(response) -> None:
+			nonlocal last_activity
 			request = response.request
 			if request not in pending_requests:
 				return
 
-			# Filter by content type if available
-			content_type = response.headers.get('content-type', '').lower()
-
-			# Skip if content type indicates streaming or real-time data
-			if any(
-				t in content_type
-				for t in [
-					'streaming',
-					'video',
-					'audio',
-					'webm',
-					'mp4',
-					'event-stream',
-					'websocket',
-					'protobuf',
-				]
-			):
-				pending_requests.remove(request)
-				return
-
-			# Only process relevant content types
-			if not any(ct in content_type for ct in RELEVANT_CONTENT_TYPES):
-				pending_requests.remove(request)
-				return
-
-			# Skip if response is too large (likely not essential for page load)
-			content_length = response.headers.get('content-length')
-			if content_length and int(content_length) > 5 * 1024 * 1024:  # 5MB
-				pending_requests.remove(request)
-				return
-
-			nonlocal last_activity
 			pending_requests.remove(request)
-			last_activity = asyncio.get_event_loop().time()
-			# logger.debug(f'Request resolved: {request.url} ({content_type})')
+			# streaming, irrelevant or huge responses finish the request but don't count as activity
+			if _is_relevant_response(response):
+				last_activity = loop.time()
+			rearm_idle_timer()
+			# logger.debug(f'Request resolved: {request.url}')
+
+		def on_request_failed(request) -> None:
+			# failed requests never get a response, don't wait for them until the timeout
+			if request in pending_requests:
+				pending_requests.remove(request)
+				rearm_idle_timer()
 
 		# Attach event listeners
 		page.on('request', on_request)
 		page.on('response', on_response)
+		page.on('requestfailed', on_request_failed)
 
-		now = asyncio.get_event_loop().time()
 		try:
-			# Wait for idle time
-			start_time = asyncio.get_event_loop().time()
-			while True:
-				await asyncio.sleep(0.1)
-				now = asyncio.get_event_loop().time()
-				if (
-					len(pending_requests) == 0
-					and (now - last_activity) >= self.browser_profile.wait_for_network_idle_page_load_time
-				):
-					break
-				if now - start_time > self.browser_profile.maximum_wait_page_load_time:
-					logger.debug(
-						f'Network timeout after {self.browser_profile.maximum_wait_page_load_time}s with {len(pending_requests)} '
-						f'pending requests: {[r.url for r in pending_requests]}'
-					)
-					break
-
+			rearm_idle_timer()
+			await asyncio.wait_for(settled.wait(), timeout=self.browser_profile.maximum_wait_page_load_time)
+		except TimeoutError:
+			logger.debug(
+				f'Network timeout after {self.browser_profile.maximum_wait_page_load_time}s with {len(pending_requests)} '
+				f'pending requests: {[r.url for r in pending_requests]}'
+			)
 		finally:
 			# Clean up event listeners
+			if idle_timer is not None:
+				idle_timer.cancel()
 			page.remove_listener('request', on_request)
 			page.remove_listener('response', on_response)
+			page.remove_listener('requestfailed', on_request_failed)
 
-		elapsed = now - start_time
+		elapsed = loop.time() - start_time
 		if elapsed > 1:
-			logger.debug(f'💤 Page network traffic calmed down after {now - start_time:.2f} seconds')
+			logger.debug(f'💤 Page network traffic calmed down after {elapsed:.2f} seconds')
+		return elapsed
 
-	async def _wait_for_page_and_frames_load(self, timeout_overwrite: float | None = None):
+	async def _wait_for_dom_quiet(self, page: Page) -> float:
+		"""Wait until the DOM had no mutations for wait_for_dom_quiet_time, returns the time waited"""
+		start_time = time.monotonic()
+		try:
+			await page.evaluate(
+				WAIT_FOR_DOM_QUIET_JS,
+				[
+					int(self.browser_profile.wait_for_dom_quiet_time * 1000),
+					int(self.browser_profile.maximum_wait_page_load_time * 1000),
+				],
+			)
+		except Exception as e:
+			# a navigation destroys the execution context while we wait, the network wait covers that case
+			logger.debug(f'DOM quiet period wait interrupted: {type(e).__name__}: {e}')
+		return time.monotonic() - start_time
+
+	async def _wait_for_page_and_frames_load(self, timeout_overwrite: float | None = None) -> PageLoadWaitMetrics:
 		"""
 		Ensures page is fully loaded before continuing.
 		Waits for either network to be idle or minimum WAIT_TIME, whichever is longer.
@@ -1149,11 +1396,18 @@ class BrowserSession(BaseModel):
 		"""
 		# Start timing
 		start_time = time.time()
+		network_idle_time = dom_quiet_time = 0.0
 
 		# Wait for page load
 		page = await self.get_current_page()
 		try:
-			await self._wait_for_stable_network()
+			if self.browser_profile.wait_for_dom_quiet_time:
+				network_idle_time, dom_quiet_time = await asyncio.gather(
+					self._wait_for_stable_network(),
+					self._wait_for_dom_quiet(page),
+				)
+			else:
+				network_idle_time = await self._wait_for_stable_network()
 
 			# Check if the loaded URL is allowed
 			await self._check_and_handle_navigation(page)
@@ -1167,20 +1421,22 @@ class BrowserSession(BaseModel):
 		elapsed = time.time() - start_time
 		remaining = max((timeout_overwrite or self.browser_profile.minimum_wait_page_load_time) - elapsed, 0)
 
-		# just for logging, calculate how much data was downloaded
+		# just for logging, calculate how much data was downloaded (skipped unless debug logging, it costs a round-trip)
+		bytes_used = None
 		try:
-			bytes_used = await page.evaluate("""
-				() => {
-					let total = 0;
-					for (const entry of performance.getEntriesByType('resource')) {
-						total += entry.transferSize || 0;
-					}
-					for (const nav of performance.getEntriesByType('navigation')) {
-						total += nav.transferSize || 0;
+			if logger.isEnabledFor(logging.DEBUG):
+				bytes_used = await page.evaluate("""
+					() => {
+						let total = 0;
+						for (const entry of performance.getEntriesByType('resource')) {
+							total += entry.transferSize || 0;
+						}
+						for (const nav of performance.getEntriesByType('navigation')) {
+							total += nav.transferSize || 0;
+						}
+						return total;
 					}
-					return total;
-				}
-			""")
+				""")
 		except Exception:
 			bytes_used = None
 
@@ -1198,6 +1454,19 @@ class BrowserSession(BaseModel):
 		if remaining > 0:
 			await asyncio.sleep(remaining)
 
+		self._page_load_wait_seconds += elapsed + remaining
+		return PageLoadWaitMetrics(
+			network_idle=network_idle_time,
+			dom_quiet=dom_quiet_time,
+			minimum_wait=remaining,
+			total=elapsed + remaining,
+		)
+
+	@property
+	def page_load_wait_seconds(self) -> float:
+		"""Seconds spent waiting for pages to settle so far, before state captures as well as inside actions"""
+		return self._page_load_wait_seconds
+
 	def _is_url_allowed(self, url: str) -> bool:
 		"""
 		Check if a URL is allowed based on the whitelist configuration. SECURITY CRITICAL.
@@ -1315,7 +1584,54 @@ class BrowserSession(BaseModel):
 	async def get_page_html(self) -> str:
 		"""Get the HTML content of the agent's current page"""
 		page = await self.get_current_page()
-		return await page.content()
+		return (await self._get_frame_content(page.main_frame)).html
+
+	async def get_page_markdown(self, page: Page | None = None, include_links: bool = False) -> str:
+		"""Markdown of the page with the text of its iframes appended (includes cross-origin iframes)"""
+		page = page or await self.get_current_page()
+		iframes = [iframe for iframe in page.frames if iframe.url != page.url and not iframe.url.startswith('data:')]
+
+		# all frames are read and converted concurrently, links are only stripped from the page itself
+		contents = await asyncio.gather(*(self._get_frame_content(frame) for frame in (page.main_frame, *iframes)))
+		markdown, *iframe_markdowns = await asyncio.gather(
+			*(self._get_frame_markdown(content, strip_links=i == 0 and not include_links) for i, content in enumerate(contents))
+		)
+
+		for iframe, iframe_markdown in zip(iframes, iframe_markdowns):
+			markdown += f'\n\nIFRAME {iframe.url}:\n'
+			markdown += iframe_markdown
+		return markdown
+
+	@property
+	def content_cache(self) -> PageContentCache | None:
+		"""Cache of page HTML, markdown and extraction results, None unless browser_profile.content_cache_max_chars is set"""
+		if self._content_cache is None and self.browser_profile.content_cache_max_chars:
+			self._content_cache = PageContentCache(self.browser_profile.content_cache_max_chars)
+		return self._content_cache
+
+	async def _get_frame_content(self, frame: Frame) -> FrameContent:
+		cache = self.content_cache
+		if cache is None:
+			return FrameContent(key=(), html=await frame.content())
+
+		try:
+			# url, epoch and mutation counter, the rest of the fingerprint doesn't show up in the serialized html
+			key = tuple((await frame.evaluate(DOM_FINGERPRINT_JS))[:3])
+		except Exception as e:
+			logger.debug(f'Could not fingerprint frame {frame.url}, not caching its content: {type(e).__name__}: {e}')
+			return FrameContent(key=(), html=await frame.content())
+
+		content = cache.get_frame(key)
+		if content is None:
+			# read after the fingerprint, a mutation in between only makes the entry newer than its key
+			content = cache.put_frame(key, await frame.content())
+		return content
+
+	async def _get_frame_markdown(self, content: FrameContent, strip_links: bool) -> str:
+		cache = self.content_cache
+		if cache is None:
+			return await self._markdown_cache.get_markdown(content.html, strip_links)
+		return await cache.get_markdown(content, strip_links)
 
 	async def get_page_structure(self) -> str:
 		"""Get a debug view of the page structure including iframes"""
@@ -1402,34 +1718,88 @@ class BrowserSession(BaseModel):
 			This is used to calculate which elements are new to the LLM since the last message,
 			which helps reduce token usage.
 		"""
-		await self._wait_for_page_and_frames_load()
+		page_load_wait = await self._wait_for_page_and_frames_load()
 		updated_state = await self._get_updated_state()
+		updated_state.page_load_wait = page_load_wait
+		return self._commit_state_summary(updated_state, cache_clickable_elements_hashes)
+
+	async def prefetch_state_summary(self) -> StatePrefetch:
+		"""
+		Capture the next state summary without making it the current one, e.g. while the LLM is still thinking.
+		adopt_state_summary() only takes it over if the page did not change since.
+		"""
+		page_load_wait = await self._wait_for_page_and_frames_load()
+		page = await self.get_current_page()
+
+		last_known_state = getattr(self, 'browser_state_summary', None)
+		updated_state = await self._get_updated_state()
+		if updated_state is last_known_state:
+			raise BrowserError('State capture failed, only the last known state is available')
+		updated_state.page_load_wait = page_load_wait
+		return StatePrefetch(page=page, state=updated_state)
+
+	async def adopt_state_summary(
+		self, prefetch: StatePrefetch, cache_clickable_elements_hashes: bool
+	) -> BrowserStateSummary | None:
+		"""Make a prefetched state the current one, returns None if the page changed since it was captured"""
+		page = await self.get_current_page()
+		if page is not prefetch.page or not await self._page_unchanged_since(page, prefetch.state):
+			logger.debug('⏭️ Page changed since the state was prefetched, capturing it again')
+			return None
+
+		logger.debug('⏩ Page unchanged since the state was prefetched, reusing it')
+		return self._commit_state_summary(prefetch.state, cache_clickable_elements_hashes)
 
+	async def is_state_stale(self) -> bool:
+		"""Whether the page changed since the current state summary was captured, a cheap check instead of capturing it again"""
+		if self._cached_browser_state_summary is None:
+			return True
+		page = await self.get_current_page()
+		return not await self._page_unchanged_since(page, self._cached_browser_state_summary)
+
+	async def _page_unchanged_since(self, page: Page, state: BrowserStateSummary) -> bool:
+		if state.page_fingerprint is None:
+			return False
+		try:
+			return await self._get_page_fingerprint(page) == state.page_fingerprint
+		except Exception as e:
+			logger.debug(f'Could not fingerprint the page, assuming it changed: {type(e).__name__}: {e}')
+			return False
+
+	async def _get_page_fingerprint(self, page: Page) -> list:
+		assert self.browser_context is not None, 'BrowserContext is not set up'
+		return [len(self.browser_context.pages), *await page.evaluate(DOM_FINGERPRINT_JS)]
+
+	def _commit_state_summary(
+		self, updated_state: BrowserStateSummary, cache_clickable_elements_hashes: bool
+	) -> BrowserStateSummary:
+		"""Make updated_state the current state, the selector map of following actions is looked up in it"""
 		# Find out which elements are new
 		# Do this only if url has not changed
 		if cache_clickable_elements_hashes:
 			# if we are on the same url as the last state, we can use the cached hashes
+			# one top-down pass fingerprints every highlighted element, dom_element.hash is cached afterwards
+			hash_index = updated_state.hash_index
 			if self._cached_clickable_element_hashes and self._cached_clickable_element_hashes.url == updated_state.url:
 				# Pointers, feel free to edit in place
-				updated_state_clickable_elements = ClickableElementProcessor.get_clickable_elements(updated_state.element_tree)
-
-				for dom_element in updated_state_clickable_elements:
+				for dom_element in updated_state.selector_map.values():
 					dom_element.is_new = (
-						ClickableElementProcessor.hash_dom_element(dom_element)
+						dom_element.hash
 						not in self._cached_clickable_element_hashes.hashes  # see which elements are new from the last state where we cached the hashes
 					)
 			# in any case, we need to cache the new hashes
 			self._cached_clickable_element_hashes = CachedClickableElementHashes(
 				url=updated_state.url,
-				hashes=ClickableElementProcessor.get_clickable_elements_hashes(updated_state.element_tree),
+				hashes=set(hash_index),
 			)
 
 		assert updated_state
 		self._cached_browser_state_summary = updated_state
 
-		# Save cookies if a file is specified
-		if self.browser_profile.cookies_file:
-			asyncio.create_task(self.save_cookies())
+		# Save cookies if a file is specified, writes are coalesced and skipped while the cookies are unchanged
+		cookie_persister = self._get_cookie_persister()
+		if cookie_persister:
+			cookie_persister.schedule()
 
 		return self._cached_browser_state_summary
 
@@ -1447,15 +1817,37 @@ class BrowserSession(BaseModel):
 			raise BrowserError('Browser closed: no valid pages available')
 
 		try:
-			await self.remove_highlights()
-			dom_service = DomService(page)
-			content = await dom_service.get_clickable_elements(
-				focus_element=focus_element,
-				viewport_expansion=self.browser_profile.viewport_expansion,
-				highlight_elements=self.browser_profile.highlight_elements,
-			)
+			timings: dict[str, float] = {}
+			start_time = time.perf_counter()
 
-			tabs_info = await self.get_tabs_info()
+			# taken before the capture, so a change while capturing also shows up as a changed page later
+			try:
+				page_fingerprint = await _timed(timings, 'fingerprint', self._get_page_fingerprint(page))
+			except Exception as e:
+				logger.debug(f'Could not fingerprint the page: {type(e).__name__}: {e}')
+				page_fingerprint = None
+
+			async def capture_dom() -> DOMState:
+				# highlights are removed and redrawn by the dom build, the screenshot has to wait for both
+				await _timed(timings, 'remove_highlights', self.remove_highlights())
+				dom_service = self._get_dom_service(page)
+				return await _timed(
+					timings,
+					'dom',
+					dom_service.get_clickable_elements(
+						focus_element=focus_element,
+						viewport_expansion=self.browser_profile.viewport_expansion,
+						highlight_elements=self.browser_profile.highlight_elements,
+					),
+				)
+
+			# independent round-trips run concurrently with the dom build
+			content, tabs_info, (pixels_above, pixels_below), title = await asyncio.gather(
+				capture_dom(),
+				_timed(timings, 'tabs', self.get_tabs_info()),
+				_timed(timings, 'scroll_info', self.get_scroll_info(page)),
+				_timed(timings, 'title', page.title()),
+			)
 
 			# Get all cross-origin iframes within the page and open them in new tabs
 			# mark the titles of the new tabs so the LLM knows to check them for additional content
@@ -1478,19 +1870,24 @@ class BrowserSession(BaseModel):
 			# 		)
 			# 	)
 
-			screenshot_b64 = await self.take_screenshot()
-			pixels_above, pixels_below = await self.get_scroll_info(page)
+			screenshot_b64 = await _timed(timings, 'screenshot', self._take_state_screenshot(page, content.element_tree))
+			timings['total'] = time.perf_counter() - start_time
 
 			self.browser_state_summary = BrowserStateSummary(
 				element_tree=content.element_tree,
 				selector_map=content.selector_map,
 				url=page.url,
-				title=await page.title(),
+				title=title,
 				tabs=tabs_info,
 				screenshot=screenshot_b64,
 				pixels_above=pixels_above,
 				pixels_below=pixels_below,
+				timings=timings,
+				page_fingerprint=page_fingerprint,
 			)
+			logger.debug('📊 State capture timings: ' + ', '.join(f'{name}={seconds:.3f}s' for name, seconds in timings.items()))
+
+			self._prune_locator_cache(page, self.browser_state_summary.hash_index)
 
 			return self.browser_state_summary
 		except Exception as e:
@@ -1500,6 +1897,31 @@ class BrowserSession(BaseModel):
 				return self.browser_state_summary
 			raise
 
+	def _get_dom_service(self, page: Page) -> DomService:
+		"""Incremental snapshots patch the tree of the previous step, so their DomService lives as long as the page"""
+		if not self.browser_profile.incremental_dom_snapshots:
+			return DomService(page, compact_transport=self.browser_profile.compact_dom_transport)
+
+		dom_service = self._dom_services.get(page)
+		if dom_service is None:
+			dom_service = self._dom_services[page] = DomService(page, incremental=True)
+		return dom_service
+
+	async def _take_state_screenshot(self, page: Page, element_tree: DOMElementNode) -> str:
+		"""Screenshot for the state summary, reused from the last capture when nothing visible can have changed"""
+		if not self.browser_profile.screenshot_reuse_unchanged:
+			return await self.take_screenshot()
+
+		page_signature = await page.evaluate(SCREENSHOT_SIGNATURE_JS)
+		signature = _fingerprint_screenshot_inputs(page.url, page_signature, element_tree)
+		if self._cached_screenshot and self._cached_screenshot.signature == signature:
+			logger.debug('📸 Page unchanged since the last screenshot, reusing it')
+			return self._cached_screenshot.screenshot
+
+		screenshot_b64 = await self.take_screenshot()
+		self._cached_screenshot = CachedScreenshot(signature=signature, screenshot=screenshot_b64)
+		return screenshot_b64
+
 	# region - Browser Actions
 	@time_execution_async('--take_screenshot')
 	async def take_screenshot(self, full_page: bool = False) -> str:
@@ -1513,13 +1935,27 @@ class BrowserSession(BaseModel):
 		page = await self.get_current_page()
 		await page.wait_for_load_state()
 
+		profile = self.browser_profile
+		# jpeg can come straight from the browser, anything that needs resizing is captured lossless first
+		capture_as_jpeg = profile.screenshot_format == ScreenshotFormat.JPEG and profile.screenshot_max_dimension is None
 		screenshot = await self.agent_current_page.screenshot(
 			full_page=full_page,
 			animations='disabled',
 			caret='initial',
+			type='jpeg' if capture_as_jpeg else 'png',
+			quality=profile.screenshot_quality if capture_as_jpeg else None,
+			# device pixels on hidpi screens would be thrown away again by the downscale
+			scale='css' if profile.screenshot_max_dimension else 'device',
 		)
 
-		screenshot_b64 = base64.b64encode(screenshot).decode('utf-8')
+		# re-encoding and base64 of a multi-MB image would block the event loop
+		screenshot_b64 = await asyncio.to_thread(
+			_encode_screenshot,
+			screenshot,
+			profile.screenshot_format,
+			profile.screenshot_quality,
+			profile.screenshot_max_dimension,
+		)
 
 		# await self.remove_highlights()
 
@@ -1727,49 +2163,80 @@ class BrowserSession(BaseModel):
 	@time_execution_async('--get_locate_element')
 	async def get_locate_element(self, element: DOMElementNode) -> ElementHandle | None:
 		page = await self.get_current_page()
-		current_frame = page
-
-		# Start with the target element and collect all parents
-		parents: list[DOMElementNode] = []
-		current = element
-		while current.parent is not None:
-			parent = current.parent
-			parents.append(parent)
-			current = parent
-
-		# Reverse the parents list to process from top to bottom
-		parents.reverse()
-
-		# Process all iframe parents in sequence
-		iframes = [item for item in parents if item.tag_name == 'iframe']
-		for parent in iframes:
-			css_selector = self._enhanced_css_selector_for_element(
-				parent,
-				include_dynamic_attributes=self.browser_profile.include_dynamic_attributes,
-			)
-			current_frame = current_frame.frame_locator(css_selector)
+		locator_cache = self._get_locator_cache(page)
+		cached_locator = locator_cache.get(element.hash)
+		if cached_locator is None:
+			cached_locator = locator_cache[element.hash] = self._build_locator(element)
 
-		css_selector = self._enhanced_css_selector_for_element(
-			element, include_dynamic_attributes=self.browser_profile.include_dynamic_attributes
-		)
+		# elements inside iframes are returned as-is, top level elements are scrolled into view if visible
+		scroll = not cached_locator.frame_selectors
+
+		if cached_locator.element_handle is not None:
+			try:
+				located = await cached_locator.element_handle.evaluate(LOCATE_ELEMENT_JS, scroll)
+				if located['connected']:
+					return cached_locator.element_handle
+			except Exception:
+				pass
+			# the element was detached or re-rendered since we last resolved it, resolve the selectors again
+			_dispose_in_background([cached_locator])
+
+		current_frame: Page | FrameLocator = page
+		for frame_selector in cached_locator.frame_selectors:
+			current_frame = current_frame.frame_locator(frame_selector)
 
 		try:
 			if isinstance(current_frame, FrameLocator):
-				element_handle = await current_frame.locator(css_selector).element_handle()
-				return element_handle
+				element_handle = await current_frame.locator(cached_locator.css_selector).element_handle()
 			else:
-				# Try to scroll into view if hidden
-				element_handle = await current_frame.query_selector(css_selector)
+				element_handle = await current_frame.query_selector(cached_locator.css_selector)
 				if element_handle:
-					is_visible = await self._is_visible(element_handle)
-					if is_visible:
-						await element_handle.scroll_into_view_if_needed()
-					return element_handle
-				return None
+					await element_handle.evaluate(LOCATE_ELEMENT_JS, scroll)
+			cached_locator.element_handle = element_handle
+			return element_handle
 		except Exception as e:
+			locator_cache.pop(element.hash, None)
 			logger.error(f'❌  Failed to locate element: {str(e)}')
 			return None
 
+	def _build_locator(self, element: DOMElementNode) -> CachedLocator:
+		"""Generate the css selectors for every iframe ancestor of the element (top to bottom) and for the element itself"""
+		iframes: list[DOMElementNode] = []
+		current = element.parent
+		while current is not None:
+			if current.tag_name == 'iframe':
+				iframes.append(current)
+			current = current.parent
+
+		include_dynamic_attributes = self.browser_profile.include_dynamic_attributes
+		return CachedLocator(
+			frame_selectors=tuple(
+				self._enhanced_css_selector_for_element(iframe, include_dynamic_attributes=include_dynamic_attributes)
+				for iframe in reversed(iframes)
+			),
+			css_selector=self._enhanced_css_selector_for_element(element, include_dynamic_attributes=include_dynamic_attributes),
+		)
+
+	def _get_locator_cache(self, page: Page) -> dict[HashedDomElement, CachedLocator]:
+		"""Locators by element fingerprint, dropped whenever a frame of the page navigates"""
+		locator_cache = self._locator_caches.get(page)
+		if locator_cache is None:
+			locator_cache = self._locator_caches[page] = {}
+
+			def clear(frame: Frame) -> None:
+				_dispose_in_background(locator_cache.values())
+				locator_cache.clear()
+
+			page.on('framenavigated', clear)
+		return locator_cache
+
+	def _prune_locator_cache(self, page: Page, hash_index: dict[HashedDomElement, DOMElementNode]) -> None:
+		"""Drop the locators of elements that are gone from the new state, they can never be hit again"""
+		locator_cache = self._locator_caches.get(page)
+		if locator_cache:
+			stale_hashes = locator_cache.keys() - hash_index.keys()
+			_dispose_in_background([locator_cache.pop(stale_hash) for stale_hash in stale_hashes])
+
 	@require_initialization
 	@time_execution_async('--get_locate_element_by_xpath')
 	async def get_locate_element_by_xpath(self, xpath: str) -> ElementHandle | None:
@@ -1868,31 +2335,17 @@ class BrowserSession(BaseModel):
 			if element_handle is None:
 				raise BrowserError(f'Element: {repr(element_node)} not found')
 
-			# Ensure element is ready for input
-			try:
-				await element_handle.wait_for_element_state('stable', timeout=1000)
-				is_visible = await self._is_visible(element_handle)
-				if is_visible:
-					await element_handle.scroll_into_view_if_needed(timeout=1000)
-			except Exception:
-				pass
-
-			# Get element properties to determine input method
-			tag_handle = await element_handle.get_property('tagName')
-			tag_name = (await tag_handle.json_value()).lower()
-			is_contenteditable = await element_handle.get_property('isContentEditable')
-			readonly_handle = await element_handle.get_property('readOnly')
-			disabled_handle = await element_handle.get_property('disabled')
-
-			readonly = await readonly_handle.json_value() if readonly_handle else False
-			disabled = await disabled_handle.json_value() if disabled_handle else False
+			# kind, editability and visibility in one round-trip, plain text fields are filled in right away if enabled
+			input_method = await element_handle.evaluate(INPUT_TEXT_JS, [text, self.browser_profile.bulk_text_input])
+			if input_method == 'inserted':
+				return
 
 			# always click the element first to make sure it's in the focus
 			await element_handle.click()
 			await asyncio.sleep(0.1)
 
 			try:
-				if (await is_contenteditable.json_value() or tag_name == 'input') and not (readonly or disabled):
+				if input_method == 'type':
 					await element_handle.evaluate('el => {el.textContent = ""; el.value = "";}')
 					await element_handle.type(text, delay=5)
 				else:
@@ -2088,9 +2541,9 @@ class BrowserSession(BaseModel):
 	@require_initialization
 	async def get_scroll_info(self, page: Page) -> tuple[int, int]:
 		"""Get scroll position information for the current page."""
-		scroll_y = await page.evaluate('window.scrollY')
-		viewport_height = await page.evaluate('window.innerHeight')
-		total_height = await page.evaluate('document.documentElement.scrollHeight')
+		scroll_y, viewport_height, total_height = await page.evaluate(
+			'[window.scrollY, window.innerHeight, document.documentElement.scrollHeight]'
+		)
 		pixels_above = scroll_y
 		pixels_below = total_height - (scroll_y + viewport_height)
 		return pixels_above, pixels_below
@@ -0,0 +1,148 @@
+"""
+Runs INPUT_TEXT_JS, the probe and insert path of BrowserSession._input_text_element_node, on real pages.
+"""
+
+import pytest
+from playwright.async_api import async_playwright
+
+from browser_use.browser.session import INPUT_TEXT_JS
+
+
+@pytest.fixture(scope='module')
+async def browser():
+	async with async_playwright() as playwright:
+		browser = await playwright.chromium.launch(headless=True)
+		yield browser
+		await browser.close()
+
+
+@pytest.fixture
+async def page(browser):
+	page = await browser.new_page()
+	yield page
+	await page.close()
+
+
+async def input_text(page, html: str, text: str = 'hello', insert: bool = True) -> tuple[str, str]:
+	"""The input method INPUT_TEXT_JS returns for the element #field and the text of the field afterwards"""
+	await page.set_content(html)
+	field = await page.query_selector('#field')
+	method = await field.evaluate(INPUT_TEXT_JS, [text, insert])
+	return method, await field.evaluate('el => el.isContentEditable ? el.textContent : el.value')
+
+
+@pytest.mark.parametrize(
+	'html, text',
+	[
+		('<input id="field" value="old">', 'hello'),
+		('<input id="field" type="search" value="old">', 'hello'),
+		('<input id="field" value="old">', ''),
+		('<textarea id="field">old</textarea>', 'first line\nsecond line'),
+		('<div id="field" contenteditable>old</div>', 'hello'),
+	],
+)
+async def test_plain_text_fields_are_inserted(page, html, text):
+	assert await input_text(page, html, text) == ('inserted', text)
+
+
+async def test_insert_fires_input_events_but_no_key_events(page):
+	await page.set_content(
+		"""<input id="field"><script>
+			window.events = [];
+			for (const type of ['keydown', 'keypress', 'keyup', 'beforeinput', 'input'])
+				field.addEventListener(type, e => events.push(e.type));
+		</script>"""
+	)
+	field = await page.query_selector('#field')
+
+	assert await field.evaluate(INPUT_TEXT_JS, ['hello', True]) == 'inserted'
+	events = await page.evaluate('events')
+	assert 'input' in events
+	assert not {'keydown', 'keypress', 'keyup'} & set(events)
+
+
+@pytest.mark.parametrize(
+	'html, method',
+	[
+		('<input id="field" value="old">', 'type'),
+		('<textarea id="field">old</textarea>', 'fill'),
+		('<div id="field" contenteditable>old</div>', 'type'),
+	],
+)
+async def test_without_insert_only_the_input_method_is_returned(page, html, method):
+	assert await input_text(page, html, insert=False) == (method, 'old')
+
+
+@pytest.mark.parametrize(
+	'html, text, method',
+	[
+		# fields that react to the keys themselves
+		('<input id="field" value="old" onkeydown="">', 'hello', 'type'),
+		('<input id="field" value="old" onkeyup="">', 'hello', 'type'),
+		('<textarea id="field" onkeypress="">old</textarea>', 'hello', 'fill'),
+		('<input id="field" value="old" role="combobox">', 'hello', 'type'),
+		('<input id="field" value="old" list="options"><datalist id="options"></datalist>', 'hello', 'type'),
+		('<input id="field" value="old" aria-autocomplete="list">', 'hello', 'type'),
+		# a typed newline presses enter, except in a textarea
+		('<input id="field" value="old">', 'hello\n', 'type'),
+		('<div id="field" contenteditable>old</div>', 'hello\r\n', 'type'),
+		# not plain text
+		('<input id="field" type="number" value="1">', '2', 'type'),
+		('<input id="field" type="date" value="2024-01-01">', '2025-01-01', 'type'),
+		# hidden fields
+		('<input id="field" value="old" style="display: none">', 'hello', 'type'),
+		('<input id="field" value="old" style="visibility: hidden">', 'hello', 'type'),
+		('<textarea id="field" style="width: 0; height: 0; padding: 0; border: 0">old</textarea>', 'hello', 'fill'),
+	],
+)
+async def test_fields_that_need_the_keys_are_left_to_type_or_fill(page, html, text, method):
+	_, old_value = await input_text(page, html, insert=False)
+
+	assert await input_text(page, html, text) == (method, old_value)
+
+
+@pytest.mark.parametrize(
+	'html',
+	[
+		'<input id="field" value="old" readonly>',
+		'<input id="field" value="old" disabled>',
+		'<textarea id="field" readonly>old</textarea>',
+		'<textarea id="field" disabled>old</textarea>',
+		'<div id="field">old</div>',
+	],
+)
+async def test_fields_that_cannot_be_edited_are_filled(page, html):
+	assert await input_text(page, html) == ('fill', 'old')
+
+
+@pytest.mark.parametrize(
+	'html, method, value',
+	[
+		# the page rejects the insert
+		(
+			'<input id="field" value="old"><script>field.addEventListener("input", () => field.value = "old")</script>',
+			'type',
+			'old',
+		),
+		# the page reformats the inserted text
+		(
+			'<input id="field"><script>field.addEventListener("input", () => field.value = field.value.toUpperCase())</script>',
+			'type',
+			'HELLO',
+		),
+		(
+			'<div id="field" contenteditable></div>'
+			'<script>field.addEventListener("input", () => field.textContent = field.textContent.toUpperCase())</script>',
+			'type',
+			'HELLO',
+		),
+	],
+)
+async def test_inserts_that_did_not_stick_are_entered_again(page, html, method, value):
+	assert await input_text(page, html) == (method, value)
+
+
+async def test_fields_that_do_not_keep_the_focus_are_typed(page):
+	html = '<input id="field" value="old"><input id="other"><script>field.addEventListener("focus", () => other.focus())</script>'
+
+	assert await input_text(page, html) == ('type', 'old')
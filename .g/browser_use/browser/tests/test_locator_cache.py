@@ -0,0 +1,88 @@
+"""
+Reuses, re-resolves and drops the element handles BrowserSession.get_locate_element caches per page.
+"""
+
+import asyncio
+
+from browser_use.browser.session import BrowserSession
+from browser_use.dom.views import DOMElementNode
+
+
+class FakeElementHandle:
+	def __init__(self):
+		self.connected = True
+		self.disposed = False
+
+	async def evaluate(self, expression: str, arg=None):
+		return {'connected': self.connected, 'visible': True}
+
+	async def dispose(self):
+		self.disposed = True
+
+
+class FakePage:
+	def __init__(self):
+		self.queries: list[str] = []
+		self.handles: list[FakeElementHandle] = []
+		self.listeners = {}
+
+	def is_closed(self) -> bool:
+		return False
+
+	def on(self, event: str, callback):
+		self.listeners[event] = callback
+
+	async def query_selector(self, selector: str) -> FakeElementHandle:
+		self.queries.append(selector)
+		self.handles.append(FakeElementHandle())
+		return self.handles[-1]
+
+
+def element(tag: str, parent: DOMElementNode) -> DOMElementNode:
+	node = DOMElementNode(
+		tag_name=tag, xpath=f'{parent.xpath}/{tag}', attributes={}, children=[], is_visible=True, parent=parent, highlight_index=0
+	)
+	parent.children.append(node)
+	return node
+
+
+async def test_locators_are_reused_re_resolved_and_dropped(monkeypatch):
+	page = FakePage()
+
+	async def get_current_page(self):
+		return page
+
+	monkeypatch.setattr(BrowserSession, 'get_current_page', get_current_page)
+	browser_session = BrowserSession(is_initialized=True)
+	browser_session.agent_current_page = page  # type: ignore
+
+	body = DOMElementNode(tag_name='body', xpath='body', attributes={}, children=[], is_visible=True, parent=None)
+	button, link = element('button', body), element('a', body)
+
+	# the second lookup of the same element is a hit, the selector is not queried again
+	first_handle = await browser_session.get_locate_element(button)
+	assert await browser_session.get_locate_element(button) is first_handle
+	assert len(page.queries) == 1
+
+	# a detached handle is released and the selector resolved again
+	first_handle.connected = False
+	second_handle = await browser_session.get_locate_element(button)
+	assert second_handle is not first_handle
+	assert page.queries == [page.queries[0]] * 2
+	await asyncio.sleep(0)
+	assert first_handle.disposed and not second_handle.disposed
+
+	# locators of elements missing from the new state are dropped with their handles
+	link_handle = await browser_session.get_locate_element(link)
+	browser_session._prune_locator_cache(page, {link.hash: link})  # type: ignore
+	await asyncio.sleep(0)
+	assert second_handle.disposed and not link_handle.disposed
+	assert await browser_session.get_locate_element(link) is link_handle
+	assert len(page.queries) == 3
+
+	# a navigation drops all of them
+	page.listeners['framenavigated'](None)
+	await asyncio.sleep(0)
+	assert link_handle.disposed
+	assert await browser_session.get_locate_element(link) is not link_handle
+	assert len(page.queries) == 4
@@ -1,4 +1,6 @@
+import base64
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
@@ -17,6 +19,16 @@ class TabInfo(BaseModel):
 	parent_page_id: int | None = None  # parent page that contains this popup or cross-origin iframe
 
 
+@dataclass
+class PageLoadWaitMetrics:
+	"""Seconds spent waiting for the page to settle before a state capture"""
+
+	network_idle: float = 0.0
+	dom_quiet: float = 0.0
+	minimum_wait: float = 0.0
+	total: float = 0.0
+
+
 @dataclass
 class BrowserStateSummary(DOMState):
 	"""The summary of the browser's current state designed for an LLM to process"""
@@ -32,6 +44,9 @@ class BrowserStateSummary(DOMState):
 	pixels_above: int = 0
 	pixels_below: int = 0
 	browser_errors: list[str] = field(default_factory=list)
+	page_load_wait: PageLoadWaitMetrics | None = field(default=None, repr=False)
+	timings: dict[str, float] = field(default_factory=dict, repr=False)  # seconds per state capture sub-stage
+	page_fingerprint: list | None = field(default=None, repr=False)  # taken right before the capture, see DOM_FINGERPRINT_JS
 
 
 @dataclass
@@ -43,17 +58,35 @@ class BrowserStateHistory:
 	tabs: list[TabInfo]
 	interacted_element: list[DOMHistoryElement | None] | list[None]
 	screenshot: str | None = None
+	screenshot_path: str | None = None  # image file of the screenshot once it is stored outside of memory
+
+	def get_screenshot(self) -> str | None:
+		"""The base64 screenshot, read back from screenshot_path if it is not kept in memory"""
+		if self.screenshot is None and self.screenshot_path:
+			return base64.b64encode(Path(self.screenshot_path).read_bytes()).decode()
+		return self.screenshot
 
 	def to_dict(self) -> dict[str, Any]:
 		data = {}
 		data['tabs'] = [tab.model_dump() for tab in self.tabs]
 		data['screenshot'] = self.screenshot
+		if self.screenshot_path:
+			data['screenshot_path'] = self.screenshot_path
 		data['interacted_element'] = [el.to_dict() if el else None for el in self.interacted_element]
 		data['url'] = self.url
 		data['title'] = self.title
 		return data
 
 
+def screenshot_media_type(screenshot_b64: str) -> str:
+	"""Media type of a base64 screenshot, sniffed from its magic bytes since the format is configurable"""
+	if screenshot_b64.startswith('/9j/'):
+		return 'image/jpeg'
+	if screenshot_b64.startswith('UklGR'):
+		return 'image/webp'
+	return 'image/png'
+
+
 class BrowserError(Exception):
 	"""Base class for all browser errors"""
 
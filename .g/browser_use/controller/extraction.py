@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.prompts import PromptTemplate
+
+from browser_use.agent.message_manager.compression import extract_task_keywords
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_PROMPT = 'Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}'
+
+CHUNK_EXTRACTION_PROMPT = 'Your task is to extract the content of one part of a page. You will be given part {part} of {parts} of the page and a goal and you should extract all relevant information around this goal from this part. If the goal is vague, summarize the part. If nothing in this part is relevant, respond with an empty json object {{}}. Respond in json format. Extraction goal: {goal}, Page part: {page}'
+
+MERGE_PROMPT = 'Your task is to merge extractions from consecutive parts of the same page into one. You will be given a goal and the extractions in page order and you should combine them into a single response for the goal, dropping duplicates and keeping all relevant information. Respond in json format. Extraction goal: {goal}, Extractions: {extractions}'
+
+# structural boundaries the markdown is split on, coarsest first, zero width so no text is lost
+SPLIT_PATTERNS = (
+	re.compile(r'(?=\n#{1,6} )'),  # headings
+	re.compile(r'(?<=\n\n)(?!\n)'),  # paragraphs, lists and tables
+	re.compile(r'(?<=\n)'),  # lines
+)
+
+EMPTY_EXTRACTION_RE = re.compile(r'^\s*(```(json)?\s*)?(\{\s*\}|\[\s*\]|null)?\s*(```)?\s*$')
+
+
+def split_markdown(markdown: str, max_chunk_chars: int) -> list[str]:
+	"""Split markdown into chunks of at most max_chunk_chars, at headings if possible, then paragraphs, then lines"""
+	if len(markdown) <= max_chunk_chars:
+		return [markdown]
+
+	def split_block(block: str, level: int) -> list[str]:
+		if len(block) <= max_chunk_chars:
+			return [block]
+		if level == len(SPLIT_PATTERNS):
+			return [block[i : i + max_chunk_chars] for i in range(0, len(block), max_chunk_chars)]
+		return [piece for part in SPLIT_PATTERNS[level].split(block) for piece in split_block(part, level + 1)]
+
+	# pack neighbouring blocks back together as long as they fit
+	chunks: list[str] = []
+	current = ''
+	for block in split_block(markdown, 0):
+		if current and len(current) + len(block) > max_chunk_chars:
+			chunks.append(current)
+			current = block
+		else:
+			current += block
+	if current:
+		chunks.append(current)
+	return chunks
+
+
+def select_relevant_chunks(chunks: list[str], goal: str, max_chunks: int) -> list[int]:
+	"""Indices of the chunks worth sending to the LLM, in page order, ranked by goal keyword hits"""
+	if len(chunks) <= max_chunks:
+		return list(range(len(chunks)))
+
+	keywords = extract_task_keywords(goal)
+	scores = []
+	for chunk in chunks:
+		lowered = chunk.lower()
+		# distinct keywords count more than repetitions of the same one
+		scores.append(sum(min(lowered.count(keyword), 5) + 5 for keyword in keywords if keyword in lowered))
+
+	if not any(scores):
+		# nothing to rank by (e.g. "summarize the page"), the top of the page usually matters most
+		return list(range(max_chunks))
+
+	# ties are broken by page order
+	ranked = sorted((i for i, score in enumerate(scores) if score), key=lambda i: (-scores[i], i))
+	return sorted(ranked[:max_chunks])
+
+
+class ContentExtractor:
+	"""
+	Map-reduce extraction for extract_content: the page markdown is split on structural boundaries, the chunks most
+	relevant to the goal are extracted concurrently and the partial results are merged.
+	Pages that fit into a single chunk are extracted with one LLM call, exactly as before.
+	"""
+
+	def __init__(
+		self,
+		max_chunk_chars: int = 40_000,
+		max_chunks: int = 8,
+		max_concurrency: int = 4,
+	):
+		self.max_chunk_chars = max_chunk_chars
+		self.max_chunks = max_chunks
+		self.max_concurrency = max_concurrency
+
+	async def extract(self, goal: str, content: str, llm: BaseChatModel) -> str:
+		"""Extract the information for goal from the page content"""
+		chunks = split_markdown(content, self.max_chunk_chars)
+		if len(chunks) == 1:
+			template = PromptTemplate(input_variables=['goal', 'page'], template=EXTRACTION_PROMPT)
+			output = await llm.ainvoke(template.format(goal=goal, page=content))
+			return str(output.content)
+
+		selected = select_relevant_chunks(chunks, goal, self.max_chunks)
+		logger.debug(f'📑 Extracting from {len(selected)} of {len(chunks)} page chunks ({len(content)} characters)')
+
+		semaphore = asyncio.Semaphore(self.max_concurrency)
+		template = PromptTemplate(input_variables=['part', 'parts', 'goal', 'page'], template=CHUNK_EXTRACTION_PROMPT)
+
+		async def extract_chunk(index: int) -> str:
+			async with semaphore:
+				prompt = template.format(part=index + 1, parts=len(chunks), goal=goal, page=chunks[index])
+				output = await llm.ainvoke(prompt)
+				return str(output.content)
+
+		extractions = await asyncio.gather(*(extract_chunk(index) for index in selected))
+		extractions = [extraction for extraction in extractions if not EMPTY_EXTRACTION_RE.match(extraction)]
+		if not extractions:
+			return '{}'
+		return await self._merge(goal, extractions, llm)
+
+	async def _merge(self, goal: str, extractions: list[str], llm: BaseChatModel) -> str:
+		"""Merge partial extractions, in rounds of batches that fit one prompt when there are many"""
+		template = PromptTemplate(input_variables=['goal', 'extractions'], template=MERGE_PROMPT)
+		while len(extractions) > 1:
+			batches: list[list[str]] = [[]]
+			batch_chars = 0
+			for extraction in extractions:
+				if batches[-1] and batch_chars + len(extraction) > self.max_chunk_chars:
+					batches.append([])
+					batch_chars = 0
+				batches[-1].append(extraction)
+				batch_chars += len(extraction)
+			if len(batches) == len(extractions):
+				batches = [extractions]  # every extraction alone is too large to batch, merge them all at once
+
+			async def merge_batch(batch: list[str]) -> str:
+				if len(batch) == 1:
+					return batch[0]
+				joined = '\n\n'.join(f'Part {i + 1}:\n{extraction}' for i, extraction in enumerate(batch))
+				output = await llm.ainvoke(template.format(goal=goal, extractions=joined))
+				return str(output.content)
+
+			extractions = await asyncio.gather(*(merge_batch(batch) for batch in batches))
+		return extractions[0]
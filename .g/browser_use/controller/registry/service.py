@@ -16,6 +16,7 @@ from browser_use.controller.registry.views import (
 	ActionModel,
 	ActionRegistry,
 	RegisteredAction,
+	SideEffect,
 	SpecialActionParameters,
 )
 from browser_use.telemetry.service import ProductTelemetry
@@ -37,6 +38,8 @@ class Registry(Generic[Context]):
 		self.registry = ActionRegistry()
 		self.telemetry = ProductTelemetry()
 		self.exclude_actions = exclude_actions if exclude_actions is not None else []
+		# action models by the ids of their actions, the cached actions keep their ids from being reused
+		self._action_models: dict[tuple[int, ...], tuple[tuple[RegisteredAction, ...], type[ActionModel]]] = {}
 
 	def _get_special_param_types(self) -> dict[str, type]:
 		"""Get the expected types for special parameters from SpecialActionParameters"""
@@ -261,8 +264,9 @@ class Registry(Generic[Context]):
 		domains: list[str] | None = None,
 		allowed_domains: list[str] | None = None,
 		page_filter: Callable[[Any], bool] | None = None,
+		side_effect: SideEffect = SideEffect.DOM_MUTATING,
 	):
-		"""Decorator for registering actions"""
+		"""Decorator for registering actions, side_effect=SideEffect.READ_ONLY lets the agent run it alongside other read-only actions"""
 		# Handle aliases: domains and allowed_domains are the same parameter
 		if allowed_domains is not None and domains is not None:
 			raise ValueError("Cannot specify both 'domains' and 'allowed_domains' - they are aliases for the same parameter")
@@ -284,6 +288,7 @@ class Registry(Generic[Context]):
 				param_model=actual_param_model,
 				domains=final_domains,
 				page_filter=page_filter,
+				side_effect=side_effect,
 			)
 			self.registry.actions[func.__name__] = action
 
@@ -438,7 +443,10 @@ class Registry(Generic[Context]):
 
 	# @time_execution_sync('--create_action_model')
 	def create_action_model(self, include_actions: list[str] | None = None, page=None) -> type[ActionModel]:
-		"""Creates a Pydantic model from registered actions, used by LLM APIs that support tool calling & enforce a schema"""
+		"""
+		Creates a Pydantic model from registered actions, used by LLM APIs that support tool calling & enforce a schema.
+		The same set of available actions always returns the same model class, it is only built once.
+		"""
 
 		# Filter actions based on page if provided:
 		#   if page is None, only include actions with no filters
@@ -463,6 +471,11 @@ class Registry(Generic[Context]):
 			if domain_is_allowed and page_is_allowed:
 				available_actions[name] = action
 
+		key = tuple(id(action) for action in available_actions.values())
+		cached = self._action_models.get(key)
+		if cached is not None:
+			return cached[1]
+
 		fields = {
 			name: (
 				Optional[action.param_model],
@@ -480,7 +493,14 @@ class Registry(Generic[Context]):
 			)
 		)
 
-		return create_model('ActionModel', __base__=ActionModel, **fields)  # type:ignore
+		action_model = create_model('ActionModel', __base__=ActionModel, **fields)  # type:ignore
+		self._action_models[key] = (tuple(available_actions.values()), action_model)
+		return action_model
+
+	def is_read_only(self, action_name: str) -> bool:
+		"""Whether the action leaves the page as it is, unknown actions never are"""
+		action = self.registry.actions.get(action_name)
+		return action is not None and action.side_effect == SideEffect.READ_ONLY
 
 	def get_prompt_description(self, page=None) -> str:
 		"""Get a description of all actions for the prompt
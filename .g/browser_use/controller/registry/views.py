@@ -1,9 +1,10 @@
 from collections.abc import Callable
+from enum import Enum
 from typing import TYPE_CHECKING
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from playwright.async_api import Page
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from browser_use.browser import BrowserSession
 
@@ -11,6 +12,15 @@ if TYPE_CHECKING:
 	from browser_use.agent.service import Context
 
 
+class SideEffect(str, Enum):
+	"""What running an action can do to the page, lets the agent skip waits and run read-only actions concurrently"""
+
+	READ_ONLY = 'read_only'  # leaves the page as it is, e.g. extracting content
+	NAVIGATION = 'navigation'  # loads another page or switches tabs
+	DOM_MUTATING = 'dom_mutating'  # may change the current page, e.g. clicking or typing
+	COMPLETION = 'completion'  # ends the task, runs after the actions before it and needs no next state, e.g. done
+
+
 class RegisteredAction(BaseModel):
 	"""Model for a registered action"""
 
@@ -23,10 +33,19 @@ class RegisteredAction(BaseModel):
 	domains: list[str] | None = None  # e.g. ['*.google.com', 'www.bing.com', 'yahoo.*]
 	page_filter: Callable[[Page], bool] | None = None
 
+	side_effect: SideEffect = SideEffect.DOM_MUTATING
+
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
+	_prompt_description: str | None = PrivateAttr(default=None)
+
 	def prompt_description(self) -> str:
-		"""Get a description of the action for the prompt"""
+		"""Get a description of the action for the prompt, the param model's json schema is only generated once"""
+		if self._prompt_description is None:
+			self._prompt_description = self._build_prompt_description()
+		return self._prompt_description
+
+	def _build_prompt_description(self) -> str:
 		skip_keys = ['title']
 		s = f'{self.description}: \n'
 		s += '{' + str(self.name) + ': '
@@ -77,6 +96,9 @@ class ActionRegistry(BaseModel):
 
 	actions: dict[str, RegisteredAction] = {}
 
+	# joined descriptions by the ids of the described actions, the cached actions keep their ids from being reused
+	_prompt_descriptions: dict[tuple[int, ...], tuple[tuple[RegisteredAction, ...], str]] = PrivateAttr(default_factory=dict)
+
 	@staticmethod
 	def _match_domains(domains: list[str] | None, url: str) -> bool:
 		"""
@@ -121,10 +143,8 @@ class ActionRegistry(BaseModel):
 		"""
 		if page is None:
 			# For system prompt (no page provided), include only actions with no filters
-			return '\n'.join(
-				action.prompt_description()
-				for action in self.actions.values()
-				if action.page_filter is None and action.domains is None
+			return self._join_prompt_descriptions(
+				[action for action in self.actions.values() if action.page_filter is None and action.domains is None]
 			)
 
 		# only include filtered actions for the current page
@@ -140,7 +160,17 @@ class ActionRegistry(BaseModel):
 			if domain_is_allowed and page_is_allowed:
 				filtered_actions.append(action)
 
-		return '\n'.join(action.prompt_description() for action in filtered_actions)
+		return self._join_prompt_descriptions(filtered_actions)
+
+	def _join_prompt_descriptions(self, actions: list[RegisteredAction]) -> str:
+		key = tuple(id(action) for action in actions)
+		cached = self._prompt_descriptions.get(key)
+		if cached is None:
+			cached = self._prompt_descriptions[key] = (
+				tuple(actions),
+				'\n'.join(action.prompt_description() for action in actions),
+			)
+		return cached[1]
 
 
 class SpecialActionParameters(BaseModel):
@@ -6,7 +6,6 @@ import re
 from typing import Generic, TypeVar, cast
 
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.prompts import PromptTemplate
 from playwright.async_api import ElementHandle, Page
 
 # from lmnr.sdk.laminar import Laminar
@@ -14,7 +13,9 @@ from pydantic import BaseModel
 
 from browser_use.agent.views import ActionModel, ActionResult
 from browser_use.browser import BrowserSession
+from browser_use.controller.extraction import ContentExtractor
 from browser_use.controller.registry.service import Registry
+from browser_use.controller.registry.views import SideEffect
 from browser_use.controller.views import (
 	ClickElementAction,
 	CloseTabAction,
@@ -43,8 +44,10 @@ class Controller(Generic[Context]):
 		self,
 		exclude_actions: list[str] = [],
 		output_model: type[BaseModel] | None = None,
+		content_extractor: ContentExtractor | None = None,
 	):
 		self.registry = Registry[Context](exclude_actions)
+		self.content_extractor = content_extractor or ContentExtractor()
 
 		"""Register all default browser actions"""
 
@@ -57,6 +60,7 @@ class Controller(Generic[Context]):
 			@self.registry.action(
 				'Complete task - with return text and if the task is finished (success=True) or not yet  completely finished (success=False), because last step is reached',
 				param_model=ExtendedOutputModel,
+				side_effect=SideEffect.COMPLETION,
 			)
 			async def done(params: ExtendedOutputModel):
 				# Exclude success from the output JSON since it's an internal parameter
@@ -73,6 +77,7 @@ class Controller(Generic[Context]):
 			@self.registry.action(
 				'Complete task - with return text and if the task is finished (success=True) or not yet  completely finished (success=False), because last step is reached',
 				param_model=DoneAction,
+				side_effect=SideEffect.COMPLETION,
 			)
 			async def done(params: DoneAction):
 				return ActionResult(is_done=True, success=params.success, extracted_content=params.text)
@@ -81,6 +86,7 @@ class Controller(Generic[Context]):
 		@self.registry.action(
 			'Search the query in Google, the query should be a search query like humans search in Google, concrete and not vague or super long.',
 			param_model=SearchGoogleAction,
+			side_effect=SideEffect.NAVIGATION,
 		)
 		async def search_google(params: SearchGoogleAction, browser_session: BrowserSession):
 			search_url = f'https://www.google.com/search?q={params.query}&udm=14'
@@ -96,7 +102,7 @@ class Controller(Generic[Context]):
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
-		@self.registry.action('Navigate to URL in the current tab', param_model=GoToUrlAction)
+		@self.registry.action('Navigate to URL in the current tab', param_model=GoToUrlAction, side_effect=SideEffect.NAVIGATION)
 		async def go_to_url(params: GoToUrlAction, browser_session: BrowserSession):
 			page = await browser_session.get_current_page()
 			if page:
@@ -108,7 +114,7 @@ class Controller(Generic[Context]):
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
-		@self.registry.action('Go back', param_model=NoParamsAction)
+		@self.registry.action('Go back', param_model=NoParamsAction, side_effect=SideEffect.NAVIGATION)
 		async def go_back(params: NoParamsAction, browser_session: BrowserSession):
 			await browser_session.go_back()
 			msg = '🔙  Navigated back'
@@ -116,6 +122,7 @@ class Controller(Generic[Context]):
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
 		# wait for x seconds
+		# not read-only: whatever comes after a wait expects the page to have moved on in the meantime
 		@self.registry.action('Wait for x seconds default 3')
 		async def wait(seconds: int = 3):
 			msg = f'🕒  Waiting for {seconds} seconds'
@@ -180,7 +187,8 @@ class Controller(Generic[Context]):
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
 		# Save PDF
-		@self.registry.action('Save the current page as a PDF file')
+		# emulates screen media on the page, which other actions running at the same time would see
+		@self.registry.action('Save the current page as a PDF file', side_effect=SideEffect.DOM_MUTATING)
 		async def save_pdf(page: Page):
 			short_url = re.sub(r'^https?://(?:www\.)?|/$', '', page.url)
 			slug = re.sub(r'[^a-zA-Z0-9]+', '-', short_url).strip('-').lower()
@@ -193,7 +201,7 @@ class Controller(Generic[Context]):
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
 		# Tab Management Actions
-		@self.registry.action('Switch tab', param_model=SwitchTabAction)
+		@self.registry.action('Switch tab', param_model=SwitchTabAction, side_effect=SideEffect.NAVIGATION)
 		async def switch_tab(params: SwitchTabAction, browser_session: BrowserSession):
 			await browser_session.switch_to_tab(params.page_id)
 			# Wait for tab to be ready and ensure references are synchronized
@@ -203,14 +211,14 @@ class Controller(Generic[Context]):
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
-		@self.registry.action('Open a specific url in new tab', param_model=OpenTabAction)
+		@self.registry.action('Open a specific url in new tab', param_model=OpenTabAction, side_effect=SideEffect.NAVIGATION)
 		async def open_tab(params: OpenTabAction, browser_session: BrowserSession):
 			await browser_session.create_new_tab(params.url)
 			msg = f'🔗  Opened new tab with {params.url}'
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
-		@self.registry.action('Close an existing tab', param_model=CloseTabAction)
+		@self.registry.action('Close an existing tab', param_model=CloseTabAction, side_effect=SideEffect.NAVIGATION)
 		async def close_tab(params: CloseTabAction, browser_session: BrowserSession):
 			await browser_session.switch_to_tab(params.page_id)
 			page = await browser_session.get_current_page()
@@ -225,42 +233,40 @@ class Controller(Generic[Context]):
 		# Content Actions
 		@self.registry.action(
 			'Extract page content to retrieve specific information from the page, e.g. all company names, a specific description, all information about xyc, 4 links with companies in structured format. Use include_links true if the goal requires links',
+			side_effect=SideEffect.READ_ONLY,
 		)
 		async def extract_content(
 			goal: str,
 			page: Page,
+			browser_session: BrowserSession,
 			page_extraction_llm: BaseChatModel,
 			include_links: bool = False,
 		):
-			import markdownify
-
-			strip = []
-			if not include_links:
-				strip = ['a', 'img']
+			content = await browser_session.get_page_markdown(page, include_links)
 
-			content = markdownify.markdownify(await page.content(), strip=strip)
-
-			# manually append iframe text into the content so it's readable by the LLM (includes cross-origin iframes)
-			for iframe in page.frames:
-				if iframe.url != page.url and not iframe.url.startswith('data:'):
-					content += f'\n\nIFRAME {iframe.url}:\n'
-					content += markdownify.markdownify(await iframe.content())
+			# the same goal on unchanged content gives the same answer, no need to ask the LLM again
+			cache = browser_session.content_cache
+			extracted = cache.get_extraction(content, goal) if cache else None
+			if extracted is None:
+				try:
+					extracted = await self.content_extractor.extract(goal, content, page_extraction_llm)
+				except Exception as e:
+					logger.debug(f'Error extracting content: {e}')
+					msg = f'📄  Extracted from page\n: {content}\n'
+					logger.info(msg)
+					return ActionResult(extracted_content=msg)
+				if cache:
+					cache.put_extraction(content, goal, extracted)
+			if cache:
+				logger.debug(f'📦 Page content cache: {cache.stats}')
 
-			prompt = 'Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}'
-			template = PromptTemplate(input_variables=['goal', 'page'], template=prompt)
-			try:
-				output = await page_extraction_llm.ainvoke(template.format(goal=goal, page=content))
-				msg = f'📄  Extracted from page\n: {output.content}\n'
-				logger.info(msg)
-				return ActionResult(extracted_content=msg, include_in_memory=True)
-			except Exception as e:
-				logger.debug(f'Error extracting content: {e}')
-				msg = f'📄  Extracted from page\n: {content}\n'
-				logger.info(msg)
-				return ActionResult(extracted_content=msg)
+			msg = f'📄  Extracted from page\n: {extracted}\n'
+			logger.info(msg)
+			return ActionResult(extracted_content=msg, include_in_memory=True)
 
 		@self.registry.action(
 			'Get the accessibility tree of the page in the format "role name" with the number_of_elements to return',
+			side_effect=SideEffect.READ_ONLY,
 		)
 		async def get_ax_tree(number_of_elements: int, page: Page):
 			node = await page.accessibility.snapshot(interesting_only=True)
@@ -389,6 +395,7 @@ class Controller(Generic[Context]):
 
 		@self.registry.action(
 			description='Get all options from a native dropdown',
+			side_effect=SideEffect.READ_ONLY,
 		)
 		async def get_dropdown_options(index: int, browser_session: BrowserSession) -> ActionResult:
 			"""Get all options from a native dropdown"""
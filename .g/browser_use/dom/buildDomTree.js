@@ -4,9 +4,15 @@
     focusHighlightIndex: -1,
     viewportExpansion: 0,
     debugMode: false,
+    incremental: false,
+    knownSnapshotId: null,
+    compactTransport: false,
   }
 ) => {
   const { doHighlightElements, focusHighlightIndex, viewportExpansion, debugMode } = args;
+  const incremental = args.incremental === true;
+  const compactTransport = args.compactTransport === true;
+  const knownSnapshotId = args.knownSnapshotId ?? null;
   let highlightIndex = 0; // Reset highlight index
 
   // Add timing stack to handle recursion
@@ -214,6 +220,87 @@
 
   const HIGHLIGHT_CONTAINER_ID = "playwright-highlight-container";
 
+  /**
+   * Persistent per-document state for incremental snapshots.
+   *
+   * It lives on the window so it survives between evaluate() calls and is
+   * dropped together with the document on navigation. A MutationObserver
+   * (plus a few layout-affecting events) bumps `version` whenever the page
+   * changes, node ids are stable per DOM node, and `lastSnapshot` keeps the
+   * serialized node data of the previous call so only changed nodes are sent.
+   */
+  const SNAPSHOT_STATE = incremental ? getSnapshotState() : null;
+
+  function isOwnNode(node) {
+    if (!node) return false;
+    const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+    return !!element && (element.id === HIGHLIGHT_CONTAINER_ID || !!element.closest?.(`#${HIGHLIGHT_CONTAINER_ID}`));
+  }
+
+  function isOwnMutation(record) {
+    if (record.type === "attributes" && record.attributeName === "browser-user-highlight-id") return true;
+    if (isOwnNode(record.target)) return true;
+    if (record.type !== "childList") return false;
+    const changedNodes = [...record.addedNodes, ...record.removedNodes];
+    return changedNodes.length > 0 && changedNodes.every(isOwnNode);
+  }
+
+  function getSnapshotState() {
+    if (window.__browserUseSnapshotState) return window.__browserUseSnapshotState;
+
+    const state = {
+      nodeIds: new WeakMap(),
+      nextNodeId: 0,
+      nextSnapshotId: 0,
+      version: 0,
+      observedRoots: new WeakSet(),
+      observer: null,
+      lastSnapshot: null,
+    };
+    state.handleMutations = (records) => {
+      if (records.some(record => !isOwnMutation(record))) state.version++;
+    };
+    state.observer = new MutationObserver(state.handleMutations);
+
+    // Layout can change without any DOM mutation (scrolling, resizing, lazy images, css transitions)
+    const bump = () => { state.version++; };
+    for (const type of ["scroll", "load", "input", "change", "transitionend", "animationend"]) {
+      window.addEventListener(type, bump, true);
+    }
+    window.addEventListener("resize", bump);
+
+    Object.defineProperty(window, "__browserUseSnapshotState", { value: state, configurable: true });
+    return state;
+  }
+
+  function observeRoot(root) {
+    if (!SNAPSHOT_STATE || !root || SNAPSHOT_STATE.observedRoots.has(root)) return;
+    SNAPSHOT_STATE.observedRoots.add(root);
+    SNAPSHOT_STATE.observer.observe(root, { subtree: true, childList: true, attributes: true, characterData: true });
+  }
+
+  /**
+   * Returns the id for a node: sequential per call in the default mode,
+   * stable across calls in incremental mode so that changes can be diffed.
+   */
+  function getNodeId(node) {
+    if (!SNAPSHOT_STATE) return `${ID.current++}`;
+    let id = SNAPSHOT_STATE.nodeIds.get(node);
+    if (id === undefined) {
+      id = `${SNAPSHOT_STATE.nextNodeId++}`;
+      SNAPSHOT_STATE.nodeIds.set(node, id);
+    }
+    return id;
+  }
+
+  // Highlighted elements of this call, replayed when an unchanged snapshot is reused
+  const HIGHLIGHTED_ELEMENTS = [];
+
+  function drawHighlight(node, index, parentIframe) {
+    if (SNAPSHOT_STATE) HIGHLIGHTED_ELEMENTS.push([node, index, parentIframe]);
+    highlightElement(node, index, parentIframe);
+  }
+
   // Add a WeakMap cache for XPath strings
   const xpathCache = new WeakMap();
 
@@ -1148,10 +1235,10 @@
         if (doHighlightElements) {
           if (focusHighlightIndex >= 0) {
             if (focusHighlightIndex === nodeData.highlightIndex) {
-              highlightElement(node, nodeData.highlightIndex, parentIframe);
+              drawHighlight(node, nodeData.highlightIndex, parentIframe);
             }
           } else {
-            highlightElement(node, nodeData.highlightIndex, parentIframe);
+            drawHighlight(node, nodeData.highlightIndex, parentIframe);
           }
           return true; // Successfully highlighted
         }
@@ -1196,7 +1283,7 @@
         if (domElement) nodeData.children.push(domElement);
       }
 
-      const id = `${ID.current++}`;
+      const id = getNodeId(node);
       DOM_HASH_MAP[id] = nodeData;
       if (debugMode) PERF_METRICS.nodeMetrics.processedNodes++;
       return id;
@@ -1223,7 +1310,7 @@
         return null;
       }
 
-      const id = `${ID.current++}`;
+      const id = getNodeId(node);
       DOM_HASH_MAP[id] = {
         type: "TEXT_NODE",
         text: textContent,
@@ -1303,6 +1390,7 @@
         try {
           const iframeDoc = node.contentDocument || node.contentWindow?.document;
           if (iframeDoc) {
+            observeRoot(iframeDoc);
             for (const child of iframeDoc.childNodes) {
               const domElement = buildDomTree(child, node, false);
               if (domElement) nodeData.children.push(domElement);
@@ -1330,6 +1418,7 @@
         // Handle shadow DOM
         if (node.shadowRoot) {
           nodeData.shadowRoot = true;
+          observeRoot(node.shadowRoot);
           for (const child of node.shadowRoot.childNodes) {
             const domElement = buildDomTree(child, parentIframe, nodeWasHighlighted);
             if (domElement) nodeData.children.push(domElement);
@@ -1351,12 +1440,113 @@
       return null;
     }
 
-    const id = `${ID.current++}`;
+    const id = getNodeId(node);
     DOM_HASH_MAP[id] = nodeData;
     if (debugMode) PERF_METRICS.nodeMetrics.processedNodes++;
     return id;
   }
 
+  // Bit flags of the compact transport, keep in sync with COMPACT_* in service.py
+  const COMPACT_FLAGS = {
+    TEXT_NODE: 1,
+    VISIBLE: 2,
+    INTERACTIVE: 4,
+    TOP_ELEMENT: 8,
+    IN_VIEWPORT: 16,
+    SHADOW_ROOT: 32,
+  };
+
+  /**
+   * Little endian int32 column as a base64 string, far cheaper to serialize than an array of numbers.
+   */
+  function encodeInt32Column(values) {
+    const bytes = new Uint8Array(Int32Array.from(values).buffer);
+    let binary = "";
+    for (let i = 0; i < bytes.length; i += 0x8000) {
+      binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+    }
+    return btoa(binary);
+  }
+
+  /**
+   * Encodes DOM_HASH_MAP as parallel int32 columns plus a deduplicated string table.
+   *
+   * Nodes are emitted in pre-order starting with the root, so a node's parent
+   * always comes before it and children keep their document order. Text nodes
+   * store their text in the tag column. Missing values are -1.
+   */
+  function encodeCompactMap(rootId) {
+    const strings = [];
+    const stringIndex = new Map();
+    const intern = (value) => {
+      let index = stringIndex.get(value);
+      if (index === undefined) {
+        index = strings.length;
+        strings.push(value);
+        stringIndex.set(value, index);
+      }
+      return index;
+    };
+
+    const flags = [];
+    const parents = [];
+    const tags = [];
+    const xpaths = [];
+    const highlights = [];
+    const attributeOffsets = [0];
+    const attributes = [];
+
+    const stack = [[rootId, -1]];
+    while (stack.length > 0) {
+      const [id, parent] = stack.pop();
+      const nodeData = DOM_HASH_MAP[id];
+      if (!nodeData) continue;
+
+      const index = flags.length;
+      parents.push(parent);
+
+      if (nodeData.type === "TEXT_NODE") {
+        flags.push(COMPACT_FLAGS.TEXT_NODE | (nodeData.isVisible ? COMPACT_FLAGS.VISIBLE : 0));
+        tags.push(intern(nodeData.text));
+        xpaths.push(-1);
+        highlights.push(-1);
+        attributeOffsets.push(attributes.length);
+        continue;
+      }
+
+      flags.push(
+        (nodeData.isVisible ? COMPACT_FLAGS.VISIBLE : 0) |
+        (nodeData.isInteractive ? COMPACT_FLAGS.INTERACTIVE : 0) |
+        (nodeData.isTopElement ? COMPACT_FLAGS.TOP_ELEMENT : 0) |
+        (nodeData.isInViewport ? COMPACT_FLAGS.IN_VIEWPORT : 0) |
+        (nodeData.shadowRoot ? COMPACT_FLAGS.SHADOW_ROOT : 0)
+      );
+      tags.push(intern(nodeData.tagName));
+      xpaths.push(intern(nodeData.xpath));
+      highlights.push(nodeData.highlightIndex ?? -1);
+      for (const [name, value] of Object.entries(nodeData.attributes)) {
+        attributes.push(intern(name), intern(value));
+      }
+      attributeOffsets.push(attributes.length);
+
+      for (let i = nodeData.children.length - 1; i >= 0; i--) {
+        stack.push([nodeData.children[i], index]);
+      }
+    }
+
+    return {
+      count: flags.length,
+      strings,
+      flags: encodeInt32Column(flags),
+      parents: encodeInt32Column(parents),
+      tags: encodeInt32Column(tags),
+      xpaths: encodeInt32Column(xpaths),
+      highlights: encodeInt32Column(highlights),
+      attributeOffsets: encodeInt32Column(attributeOffsets),
+      attributes: encodeInt32Column(attributes),
+    };
+  }
+
   // After all functions are defined, wrap them with performance measurement
   // Remove buildDomTree from here as we measure it separately
   highlightElement = measureTime(highlightElement);
@@ -1367,6 +1557,34 @@
   isTextNodeVisible = measureTime(isTextNodeVisible);
   getEffectiveScroll = measureTime(getEffectiveScroll);
 
+  // In incremental mode, reuse the previous snapshot if nothing changed since it was taken
+  let snapshotKey = null;
+  if (SNAPSHOT_STATE) {
+    observeRoot(document);
+    SNAPSHOT_STATE.handleMutations(SNAPSHOT_STATE.observer.takeRecords());
+
+    snapshotKey = JSON.stringify([
+      doHighlightElements, focusHighlightIndex, viewportExpansion,
+      window.scrollX, window.scrollY, window.innerWidth, window.innerHeight,
+    ]);
+    const last = SNAPSHOT_STATE.lastSnapshot;
+    if (
+      last &&
+      knownSnapshotId !== null &&
+      last.snapshotId === knownSnapshotId &&
+      last.version === SNAPSHOT_STATE.version &&
+      last.key === snapshotKey
+    ) {
+      // the Python side cleared the highlights before calling us, draw them again
+      if (doHighlightElements) {
+        for (const [node, index, parentIframe] of last.highlighted) {
+          if (node.isConnected) highlightElement(node, index, parentIframe);
+        }
+      }
+      return { rootId: last.rootId, snapshotId: last.snapshotId, unchanged: true };
+    }
+  }
+
   const rootId = buildDomTree(document.body);
 
   // Clear the cache before starting
@@ -1422,7 +1640,44 @@
     }
   }
 
-  return debugMode ?
-    { rootId, map: DOM_HASH_MAP, perfMetrics: PERF_METRICS } :
-    { rootId, map: DOM_HASH_MAP };
+  if (!SNAPSHOT_STATE) {
+    if (compactTransport) {
+      const compact = encodeCompactMap(rootId);
+      return debugMode ? { rootId: 0, compact, perfMetrics: PERF_METRICS } : { rootId: 0, compact };
+    }
+    return debugMode ?
+      { rootId, map: DOM_HASH_MAP, perfMetrics: PERF_METRICS } :
+      { rootId, map: DOM_HASH_MAP };
+  }
+
+  // Diff against the previous snapshot, only if the caller still holds the tree built from it
+  const previous = SNAPSHOT_STATE.lastSnapshot;
+  const isDiff = !!previous && knownSnapshotId !== null && previous.snapshotId === knownSnapshotId;
+  const serialized = new Map();
+  const changed = {};
+  for (const [id, nodeData] of Object.entries(DOM_HASH_MAP)) {
+    const encoded = JSON.stringify(nodeData);
+    serialized.set(id, encoded);
+    if (!isDiff || previous.serialized.get(id) !== encoded) changed[id] = nodeData;
+  }
+  const removed = isDiff ? [...previous.serialized.keys()].filter(id => !serialized.has(id)) : [];
+
+  // Our own highlight overlays must not mark the snapshot dirty
+  SNAPSHOT_STATE.handleMutations(SNAPSHOT_STATE.observer.takeRecords());
+
+  const snapshotId = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 8)}-${SNAPSHOT_STATE.nextSnapshotId++}`;
+  SNAPSHOT_STATE.lastSnapshot = {
+    snapshotId,
+    rootId,
+    version: SNAPSHOT_STATE.version,
+    key: snapshotKey,
+    serialized,
+    highlighted: HIGHLIGHTED_ELEMENTS,
+  };
+
+  const result = isDiff ?
+    { rootId, snapshotId, baseSnapshotId: knownSnapshotId, map: changed, removed } :
+    { rootId, snapshotId, map: DOM_HASH_MAP };
+  if (debugMode) result.perfMetrics = PERF_METRICS;
+  return result;
 };
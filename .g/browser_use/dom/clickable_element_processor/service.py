@@ -25,13 +25,11 @@ class ClickableElementProcessor:
 
 	@staticmethod
 	def hash_dom_element(dom_element: DOMElementNode) -> str:
-		parent_branch_path = ClickableElementProcessor._get_parent_branch_path(dom_element)
-		branch_path_hash = ClickableElementProcessor._parent_branch_path_hash(parent_branch_path)
-		attributes_hash = ClickableElementProcessor._attributes_hash(dom_element.attributes)
-		xpath_hash = ClickableElementProcessor._xpath_hash(dom_element.xpath)
+		# same component hashes as HistoryTreeProcessor, cached on the element (filled for a whole tree by DOMState.hash_index)
+		hashed = dom_element.hash
 		# text_hash = DomTreeProcessor._text_hash(dom_element)
 
-		return ClickableElementProcessor._hash_string(f'{branch_path_hash}-{attributes_hash}-{xpath_hash}')
+		return ClickableElementProcessor._hash_string(f'{hashed.branch_path_hash}-{hashed.attributes_hash}-{hashed.xpath_hash}')
 
 	@staticmethod
 	def _get_parent_branch_path(dom_element: DOMElementNode) -> list[str]:
@@ -48,7 +46,7 @@ class ClickableElementProcessor:
 	@staticmethod
 	def _parent_branch_path_hash(parent_branch_path: list[str]) -> str:
 		parent_branch_path_string = '/'.join(parent_branch_path)
-		return hashlib.sha256(parent_branch_path_string.encode()).hexdigest()
+		return ClickableElementProcessor._hash_string(parent_branch_path_string)
 
 	@staticmethod
 	def _attributes_hash(attributes: dict[str, str]) -> str:
@@ -67,4 +65,4 @@ class ClickableElementProcessor:
 
 	@staticmethod
 	def _hash_string(string: str) -> str:
-		return hashlib.sha256(string.encode()).hexdigest()
+		return hashlib.blake2b(string.encode(), digest_size=8).hexdigest()
@@ -32,21 +32,52 @@ class HistoryTreeProcessor:
 
 	@staticmethod
 	def find_history_element_in_tree(dom_history_element: DOMHistoryElement, tree: DOMElementNode) -> DOMElementNode | None:
+		"""Prefer DOMState.hash_index when a state is at hand, it is built once per state"""
 		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(dom_history_element)
+		return HistoryTreeProcessor.build_hash_index(tree).get(hashed_dom_history_element)
+
+	@staticmethod
+	def find_history_element_in_index(
+		dom_history_element: DOMHistoryElement, hash_index: dict[HashedDomElement, DOMElementNode]
+	) -> DOMElementNode | None:
+		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(dom_history_element)
+		return hash_index.get(hashed_dom_history_element)
+
+	@staticmethod
+	def build_hash_index(tree: DOMElementNode) -> dict[HashedDomElement, DOMElementNode]:
+		"""Fingerprint every highlighted element of the tree in a single top-down pass.
+
+		The branch path hash of a child extends a copy of its parent's hasher instead of walking
+		back to the root, so it equals _parent_branch_path_hash() of the full path. The fingerprint
+		is cached on the element (DOMElementNode.hash). If fingerprints collide, the first element
+		in document order wins, like the recursive search used to.
+		"""
+		index: dict[HashedDomElement, DOMElementNode] = {}
+
+		root_path = HistoryTreeProcessor._get_parent_branch_path(tree)
+		root_hasher = _new_hasher()
+		root_hasher.update('/'.join(root_path).encode())
+
+		stack = [(tree, root_hasher, not root_path)]
+		while stack:
+			node, hasher, path_is_empty = stack.pop()
 
-		def process_node(node: DOMElementNode):
 			if node.highlight_index is not None:
-				hashed_node = HistoryTreeProcessor._hash_dom_element(node)
-				if hashed_node == hashed_dom_history_element:
-					return node
-			for child in node.children:
+				hashed = HashedDomElement(
+					hasher.hexdigest(),
+					HistoryTreeProcessor._attributes_hash(node.attributes),
+					HistoryTreeProcessor._xpath_hash(node.xpath),
+				)
+				node._hash = hashed  # prime the cache behind DOMElementNode.hash
+				index.setdefault(hashed, node)
+
+			for child in reversed(node.children):
 				if isinstance(child, DOMElementNode):
-					result = process_node(child)
-					if result is not None:
-						return result
-			return None
+					child_hasher = hasher.copy()
+					child_hasher.update((child.tag_name if path_is_empty else f'/{child.tag_name}').encode())
+					stack.append((child, child_hasher, False))
 
-		return process_node(tree)
+		return index
 
 	@staticmethod
 	def compare_history_element_and_dom_element(dom_history_element: DOMHistoryElement, dom_element: DOMElementNode) -> bool:
@@ -88,19 +119,29 @@ class HistoryTreeProcessor:
 	@staticmethod
 	def _parent_branch_path_hash(parent_branch_path: list[str]) -> str:
 		parent_branch_path_string = '/'.join(parent_branch_path)
-		return hashlib.sha256(parent_branch_path_string.encode()).hexdigest()
+		return _fingerprint(parent_branch_path_string)
 
 	@staticmethod
 	def _attributes_hash(attributes: dict[str, str]) -> str:
 		attributes_string = ''.join(f'{key}={value}' for key, value in attributes.items())
-		return hashlib.sha256(attributes_string.encode()).hexdigest()
+		return _fingerprint(attributes_string)
 
 	@staticmethod
 	def _xpath_hash(xpath: str) -> str:
-		return hashlib.sha256(xpath.encode()).hexdigest()
+		return _fingerprint(xpath)
 
 	@staticmethod
 	def _text_hash(dom_element: DOMElementNode) -> str:
 		""" """
 		text_string = dom_element.get_all_text_till_next_clickable_element()
-		return hashlib.sha256(text_string.encode()).hexdigest()
+		return _fingerprint(text_string)
+
+
+# Fingerprints only identify elements within one page or one saved history, they are recomputed from the raw
+# values on comparison, so a fast 64 bit digest is plenty; no security property is needed
+def _new_hasher() -> 'hashlib._Hash':
+	return hashlib.blake2b(digest_size=8)
+
+
+def _fingerprint(string: str) -> str:
+	return hashlib.blake2b(string.encode(), digest_size=8).hexdigest()
@@ -1,4 +1,7 @@
+import base64
 import logging
+import sys
+from array import array
 from dataclasses import dataclass
 from importlib import resources
 from typing import TYPE_CHECKING
@@ -14,10 +17,18 @@ from browser_use.dom.views import (
 	DOMTextNode,
 	SelectorMap,
 )
-from browser_use.utils import time_execution_async
+from browser_use.utils import time_execution_async, time_execution_sync
 
 logger = logging.getLogger(__name__)
 
+# Bit flags of the compact transport, keep in sync with COMPACT_FLAGS in buildDomTree.js
+COMPACT_TEXT_NODE = 1
+COMPACT_VISIBLE = 2
+COMPACT_INTERACTIVE = 4
+COMPACT_TOP_ELEMENT = 8
+COMPACT_IN_VIEWPORT = 16
+COMPACT_SHADOW_ROOT = 32
+
 
 @dataclass
 class ViewportInfo:
@@ -26,9 +37,18 @@ class ViewportInfo:
 
 
 class DomService:
-	def __init__(self, page: 'Page'):
+	def __init__(self, page: 'Page', incremental: bool = False, compact_transport: bool = False):
 		self.page = page
 		self.xpath_cache = {}
+		self.incremental = incremental
+		self.compact_transport = compact_transport
+
+		# tree kept between calls in incremental mode, patched with the nodes that changed in the page
+		self._snapshot_id: str | None = None
+		self._root: DOMElementNode | None = None
+		self._node_map: dict[str, DOMBaseNode] = {}
+		self._children_ids: dict[str, list[str]] = {}
+		self._selector_map: SelectorMap = {}
 
 		self.js_code = resources.files('browser_use.dom').joinpath('buildDomTree.js').read_text()
 
@@ -94,6 +114,9 @@ class DomService:
 			'focusHighlightIndex': focus_element,
 			'viewportExpansion': viewport_expansion,
 			'debugMode': debug_mode,
+			'incremental': self.incremental,
+			'knownSnapshotId': self._snapshot_id,
+			'compactTransport': self.compact_transport,
 		}
 
 		try:
@@ -127,6 +150,12 @@ class DomService:
 				# processed_nodes,
 			)
 
+		if self.incremental:
+			return self._apply_dom_snapshot(eval_page)
+
+		if 'compact' in eval_page:
+			return self._construct_compact_dom_tree(eval_page['compact'])
+
 		return await self._construct_dom_tree(eval_page)
 
 	@time_execution_async('--construct_dom_tree')
@@ -173,6 +202,153 @@ class DomService:
 
 		return html_to_dict, selector_map
 
+	@time_execution_sync('--construct_compact_dom_tree')
+	def _construct_compact_dom_tree(
+		self,
+		compact: dict,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		"""Build the tree from the columnar transport of buildDomTree.js.
+
+		Nodes arrive in pre-order, so every parent is constructed before its children
+		and children are appended in document order.
+		"""
+		strings: list[str] = compact['strings']
+		flags = _decode_int32_column(compact['flags'])
+		parents = _decode_int32_column(compact['parents'])
+		tags = _decode_int32_column(compact['tags'])
+		xpaths = _decode_int32_column(compact['xpaths'])
+		highlights = _decode_int32_column(compact['highlights'])
+		attribute_offsets = _decode_int32_column(compact['attributeOffsets'])
+		attributes = _decode_int32_column(compact['attributes'])
+
+		if not flags or flags[0] & COMPACT_TEXT_NODE:
+			raise ValueError('Failed to parse HTML to dictionary')
+
+		nodes: list[DOMBaseNode] = []
+		selector_map: SelectorMap = {}
+
+		for index in range(compact['count']):
+			node_flags = flags[index]
+			parent_index = parents[index]
+			parent = nodes[parent_index] if parent_index >= 0 else None
+
+			if node_flags & COMPACT_TEXT_NODE:
+				node = DOMTextNode(
+					text=strings[tags[index]],
+					is_visible=bool(node_flags & COMPACT_VISIBLE),
+					parent=parent,  # type: ignore
+				)
+			else:
+				highlight_index = highlights[index]
+				node = DOMElementNode(
+					tag_name=sys.intern(strings[tags[index]]),
+					xpath=strings[xpaths[index]],
+					attributes={
+						sys.intern(strings[attributes[i]]): strings[attributes[i + 1]]
+						for i in range(attribute_offsets[index], attribute_offsets[index + 1], 2)
+					},
+					children=[],
+					is_visible=bool(node_flags & COMPACT_VISIBLE),
+					is_interactive=bool(node_flags & COMPACT_INTERACTIVE),
+					is_top_element=bool(node_flags & COMPACT_TOP_ELEMENT),
+					is_in_viewport=bool(node_flags & COMPACT_IN_VIEWPORT),
+					highlight_index=highlight_index if highlight_index >= 0 else None,
+					shadow_root=bool(node_flags & COMPACT_SHADOW_ROOT),
+					parent=parent,  # type: ignore
+				)
+				if highlight_index >= 0:
+					selector_map[highlight_index] = node
+
+			if parent is not None:
+				parent.children.append(node)  # type: ignore
+			nodes.append(node)
+
+		root = nodes[0]
+		assert isinstance(root, DOMElementNode)
+		return root, selector_map
+
+	@time_execution_sync('--apply_dom_snapshot')
+	def _apply_dom_snapshot(
+		self,
+		eval_page: dict,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		"""Patch the tree kept from the previous call with the nodes that changed in the page since then.
+
+		Snapshots that are not based on the tree we hold (first call, navigation, reload) carry the full map
+		and are applied on top of an empty tree. Nodes keep their identity across calls, so the returned tree
+		is the same object as last time; only the selector map is a new dict.
+		"""
+		if eval_page.get('unchanged') and self._root is not None and eval_page.get('snapshotId') == self._snapshot_id:
+			logger.debug('🔎 DOM unchanged since last snapshot, reusing %d nodes', len(self._node_map))
+			return self._root, dict(self._selector_map)
+
+		if eval_page.get('baseSnapshotId') is None or eval_page['baseSnapshotId'] != self._snapshot_id:
+			self._node_map = {}
+			self._children_ids = {}
+			self._selector_map = {}
+
+		for node_id in eval_page.get('removed', []):
+			self._children_ids.pop(node_id, None)
+			self._unregister_highlight(self._node_map.pop(node_id, None))
+
+		changed: dict = eval_page['map']
+		for node_id, node_data in changed.items():
+			node, children_ids = self._parse_node(node_data)
+			if node is None:
+				continue
+
+			existing = self._node_map.get(node_id)
+			if existing is not None and type(existing) is type(node):
+				self._unregister_highlight(existing)
+				_update_node_in_place(existing, node)
+				node = existing
+
+			self._node_map[node_id] = node
+			self._children_ids[node_id] = children_ids
+
+			if isinstance(node, DOMElementNode) and node.highlight_index is not None:
+				self._selector_map[node.highlight_index] = node
+
+		# Unchanged elements still point at the right (possibly patched in place) children,
+		# only elements whose children list changed have to be relinked
+		for node_id in changed:
+			node = self._node_map.get(node_id)
+			if not isinstance(node, DOMElementNode):
+				continue
+
+			node.children = []
+			for child_id in self._children_ids[node_id]:
+				child_node = self._node_map.get(child_id)
+				if child_node is None:
+					continue
+
+				child_node.parent = node
+				node.children.append(child_node)
+
+		root = self._node_map.get(str(eval_page['rootId']))
+		if root is None or not isinstance(root, DOMElementNode):
+			raise ValueError('Failed to parse HTML to dictionary')
+
+		# is_new is recomputed for every clickable element on each step, don't leak the last value
+		for node in self._selector_map.values():
+			node.is_new = None
+
+		logger.debug(
+			'🔎 Applied DOM snapshot: %d changed, %d removed, %d total nodes',
+			len(changed),
+			len(eval_page.get('removed', [])),
+			len(self._node_map),
+		)
+
+		self._root = root
+		self._snapshot_id = eval_page.get('snapshotId')
+		return root, dict(self._selector_map)
+
+	def _unregister_highlight(self, node: DOMBaseNode | None) -> None:
+		if isinstance(node, DOMElementNode) and node.highlight_index is not None:
+			if self._selector_map.get(node.highlight_index) is node:
+				del self._selector_map[node.highlight_index]
+
 	def _parse_node(
 		self,
 		node_data: dict,
@@ -200,9 +376,10 @@ class DomService:
 			)
 
 		element_node = DOMElementNode(
-			tag_name=node_data['tagName'],
+			tag_name=sys.intern(node_data['tagName']),
 			xpath=node_data['xpath'],
-			attributes=node_data.get('attributes', {}),
+			# tag names and attribute keys repeat on every node, share one string object for each
+			attributes={sys.intern(key): value for key, value in node_data.get('attributes', {}).items()},
 			children=[],
 			is_visible=node_data.get('isVisible', False),
 			is_interactive=node_data.get('isInteractive', False),
@@ -217,3 +394,33 @@ class DomService:
 		children_ids = node_data.get('children', [])
 
 		return element_node, children_ids
+
+
+def _decode_int32_column(encoded: str) -> array:
+	"""Decode a base64 little endian int32 column produced by encodeInt32Column() in buildDomTree.js"""
+	column = array('i')
+	column.frombytes(base64.b64decode(encoded))
+	if sys.byteorder == 'big':
+		column.byteswap()
+	return column
+
+
+def _update_node_in_place(node: DOMBaseNode, updated: DOMBaseNode) -> None:
+	"""Copy the freshly parsed values onto the node that is already part of the tree"""
+	node.is_visible = updated.is_visible
+
+	if isinstance(node, DOMTextNode) and isinstance(updated, DOMTextNode):
+		node.text = updated.text
+		return
+
+	if isinstance(node, DOMElementNode) and isinstance(updated, DOMElementNode):
+		node.tag_name = updated.tag_name
+		node.xpath = updated.xpath
+		node.attributes = updated.attributes
+		node.is_interactive = updated.is_interactive
+		node.is_top_element = updated.is_top_element
+		node.is_in_viewport = updated.is_in_viewport
+		node.highlight_index = updated.highlight_index
+		node.shadow_root = updated.shadow_root
+		node.viewport_info = updated.viewport_info
+		node.invalidate_hash()
@@ -0,0 +1,171 @@
+"""
+Checks the single-pass clickable_elements_to_string against the original per-element implementation.
+"""
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMBaseNode, DOMElementNode, DOMTextNode
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+INCLUDE_ATTRIBUTES = ['title', 'type', 'name', 'role', 'aria-label', 'placeholder', 'value']
+
+
+def reference_clickable_elements_to_string(root: DOMElementNode, include_attributes: list[str] | None = None) -> str:
+	"""The previous implementation: re-walks the subtree per highlighted element and walks up to the root per text node"""
+	formatted_text = []
+
+	def has_parent_with_highlight_index(node: DOMBaseNode) -> bool:
+		current = node.parent
+		while current is not None:
+			if current.highlight_index is not None:
+				return True
+			current = current.parent
+		return False
+
+	def get_all_text_till_next_clickable_element(element: DOMElementNode) -> str:
+		text_parts = []
+
+		def collect_text(node: DOMBaseNode) -> None:
+			if isinstance(node, DOMElementNode) and node is not element and node.highlight_index is not None:
+				return
+			if isinstance(node, DOMTextNode):
+				text_parts.append(node.text)
+			elif isinstance(node, DOMElementNode):
+				for child in node.children:
+					collect_text(child)
+
+		collect_text(element)
+		return '\n'.join(text_parts).strip()
+
+	def process_node(node: DOMBaseNode, depth: int) -> None:
+		next_depth = int(depth)
+		depth_str = depth * '\t'
+
+		if isinstance(node, DOMElementNode):
+			if node.highlight_index is not None:
+				next_depth += 1
+
+				text = get_all_text_till_next_clickable_element(node)
+				attributes_html_str = ''
+				if include_attributes:
+					attributes_to_include = {
+						key: str(value) for key, value in node.attributes.items() if key in include_attributes
+					}
+					if node.tag_name == attributes_to_include.get('role'):
+						del attributes_to_include['role']
+					if (
+						attributes_to_include.get('aria-label')
+						and attributes_to_include.get('aria-label', '').strip() == text.strip()
+					):
+						del attributes_to_include['aria-label']
+					if (
+						attributes_to_include.get('placeholder')
+						and attributes_to_include.get('placeholder', '').strip() == text.strip()
+					):
+						del attributes_to_include['placeholder']
+					if attributes_to_include:
+						attributes_html_str = ' '.join(f"{key}='{value}'" for key, value in attributes_to_include.items())
+
+				highlight_indicator = f'*[{node.highlight_index}]*' if node.is_new else f'[{node.highlight_index}]'
+				line = f'{depth_str}{highlight_indicator}<{node.tag_name}'
+				if attributes_html_str:
+					line += f' {attributes_html_str}'
+				if text:
+					if not attributes_html_str:
+						line += ' '
+					line += f'>{text}'
+				elif not attributes_html_str:
+					line += ' '
+				line += ' />'
+				formatted_text.append(line)
+
+			for child in node.children:
+				process_node(child, next_depth)
+
+		elif isinstance(node, DOMTextNode):
+			if (
+				not has_parent_with_highlight_index(node)
+				and node.parent
+				and node.parent.is_visible
+				and node.parent.is_top_element
+			):
+				formatted_text.append(f'{depth_str}{node.text}')
+
+	process_node(root, 0)
+	return '\n'.join(formatted_text)
+
+
+def generate_tree(seed: int, size: int) -> DOMElementNode:
+	"""Random page-like tree: nested containers, highlighted controls inside highlighted controls, text everywhere"""
+	rng = random.Random(seed)
+	tags = ['div', 'span', 'button', 'a', 'input', 'li', 'ul', 'p', 'label']
+	words = ['Submit', 'Cancel', 'Next page', 'Search', '  padded  ', 'menu', 'Open']
+	root = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None)
+	elements = [root]
+	highlight_index = 0
+
+	for _ in range(size):
+		parent = rng.choice(elements[-50:] if rng.random() < 0.7 else elements)
+		if rng.random() < 0.35:
+			node = DOMTextNode(text=rng.choice(words), is_visible=True, parent=parent)
+		else:
+			tag = rng.choice(tags)
+			text = rng.choice(words)
+			attributes = {key: rng.choice([text, tag, 'other']) for key in rng.sample(INCLUDE_ATTRIBUTES + ['class'], 3)}
+			highlighted = rng.random() < 0.3
+			node = DOMElementNode(
+				tag_name=tag,
+				xpath=f'{parent.xpath}/{tag}',
+				attributes=attributes,
+				children=[],
+				is_visible=rng.random() < 0.9,
+				is_top_element=rng.random() < 0.9,
+				highlight_index=highlight_index if highlighted else None,
+				is_new=rng.random() < 0.2 if highlighted else None,
+				parent=parent,
+			)
+			highlight_index += highlighted
+			elements.append(node)
+		parent.children.append(node)
+
+	return root
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('include_attributes', [None, INCLUDE_ATTRIBUTES])
+def test_matches_reference_implementation(seed: int, include_attributes: list[str] | None):
+	root = generate_tree(seed, size=400)
+
+	assert root.clickable_elements_to_string(include_attributes) == reference_clickable_elements_to_string(
+		root, include_attributes
+	)
+
+
+def test_subtree_of_highlighted_element_matches_reference_implementation():
+	root = generate_tree(seed=1, size=400)
+	subtrees = [node for node in root.children if isinstance(node, DOMElementNode)]
+
+	for subtree in subtrees:
+		assert subtree.clickable_elements_to_string(INCLUDE_ATTRIBUTES) == reference_clickable_elements_to_string(
+			subtree, INCLUDE_ATTRIBUTES
+		)
+
+
+@pytest.mark.parametrize('fixture', ['news_front_page.json'])
+@pytest.mark.parametrize('include_attributes', [None, INCLUDE_ATTRIBUTES])
+async def test_saved_page_matches_reference_implementation(fixture: str, include_attributes: list[str] | None):
+	# element map of a real page layout in the format buildDomTree.js returns
+	eval_page = json.loads((FIXTURES_DIR / fixture).read_text())
+	root, selector_map = await DomService(page=None)._construct_dom_tree(eval_page)  # type: ignore
+	for index, node in selector_map.items():
+		node.is_new = index % 5 == 0
+
+	output = root.clickable_elements_to_string(include_attributes)
+	assert output == reference_clickable_elements_to_string(root, include_attributes)
+	assert all(f'[{index}]' in output for index in selector_map)
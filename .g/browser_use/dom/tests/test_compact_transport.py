@@ -0,0 +1,190 @@
+"""
+Builds the tree from the compact columnar transport of buildDomTree.js and checks it against the JSON map path.
+"""
+
+import base64
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from browser_use.dom.service import (
+	COMPACT_IN_VIEWPORT,
+	COMPACT_INTERACTIVE,
+	COMPACT_SHADOW_ROOT,
+	COMPACT_TEXT_NODE,
+	COMPACT_TOP_ELEMENT,
+	COMPACT_VISIBLE,
+	DomService,
+	_decode_int32_column,
+)
+from browser_use.dom.views import DOMBaseNode, DOMElementNode, DOMTextNode
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+
+def encode_int32_column(values: list[int]) -> str:
+	"""encodeInt32Column() of buildDomTree.js"""
+	return base64.b64encode(struct.pack(f'<{len(values)}i', *values)).decode()
+
+
+def encode_compact_map(eval_page: dict) -> dict:
+	"""encodeCompactMap() of buildDomTree.js, applied to the JSON map it would otherwise return"""
+	strings: list[str] = []
+	string_index: dict[str, int] = {}
+
+	def intern(value: str) -> int:
+		if value not in string_index:
+			string_index[value] = len(strings)
+			strings.append(value)
+		return string_index[value]
+
+	flags, parents, tags, xpaths, highlights, attribute_offsets, attributes = [], [], [], [], [], [0], []
+	stack = [(str(eval_page['rootId']), -1)]
+	while stack:
+		node_id, parent = stack.pop()
+		node_data = eval_page['map'].get(str(node_id))
+		if not node_data:
+			continue
+
+		index = len(flags)
+		parents.append(parent)
+		if node_data.get('type') == 'TEXT_NODE':
+			flags.append(COMPACT_TEXT_NODE | (COMPACT_VISIBLE if node_data['isVisible'] else 0))
+			tags.append(intern(node_data['text']))
+			xpaths.append(-1)
+			highlights.append(-1)
+			attribute_offsets.append(len(attributes))
+			continue
+
+		flags.append(
+			(COMPACT_VISIBLE if node_data.get('isVisible') else 0)
+			| (COMPACT_INTERACTIVE if node_data.get('isInteractive') else 0)
+			| (COMPACT_TOP_ELEMENT if node_data.get('isTopElement') else 0)
+			| (COMPACT_IN_VIEWPORT if node_data.get('isInViewport') else 0)
+			| (COMPACT_SHADOW_ROOT if node_data.get('shadowRoot') else 0)
+		)
+		tags.append(intern(node_data['tagName']))
+		xpaths.append(intern(node_data['xpath']))
+		highlight_index = node_data.get('highlightIndex')
+		highlights.append(-1 if highlight_index is None else highlight_index)
+		for name, value in node_data['attributes'].items():
+			attributes += [intern(name), intern(value)]
+		attribute_offsets.append(len(attributes))
+		stack += [(child_id, index) for child_id in reversed(node_data['children'])]
+
+	return {
+		'count': len(flags),
+		'strings': strings,
+		'flags': encode_int32_column(flags),
+		'parents': encode_int32_column(parents),
+		'tags': encode_int32_column(tags),
+		'xpaths': encode_int32_column(xpaths),
+		'highlights': encode_int32_column(highlights),
+		'attributeOffsets': encode_int32_column(attribute_offsets),
+		'attributes': encode_int32_column(attributes),
+	}
+
+
+def describe(node: DOMBaseNode) -> tuple:
+	"""Everything the transport carries about the node and its subtree, checking the parent links on the way"""
+	assert all(child.parent is node for child in getattr(node, 'children', []))
+	if isinstance(node, DOMTextNode):
+		return ('text', node.text, node.is_visible)
+	assert isinstance(node, DOMElementNode)
+	return (
+		node.tag_name,
+		node.xpath,
+		node.attributes,
+		node.is_visible,
+		node.is_interactive,
+		node.is_top_element,
+		node.is_in_viewport,
+		node.shadow_root,
+		node.highlight_index,
+		[describe(child) for child in node.children],
+	)
+
+
+def small_page() -> dict:
+	# in post-order like buildDomTree.js, the JSON map path relies on the children coming first
+	return {
+		'rootId': '0',
+		'map': {
+			'2': {'type': 'TEXT_NODE', 'text': 'Send', 'isVisible': True},
+			'1': {
+				'tagName': 'button',
+				'xpath': 'body/button',
+				'attributes': {'name': 'submit', 'aria-label': 'Send'},
+				'children': ['2'],
+				'isVisible': True,
+				'isTopElement': True,
+				'isInViewport': True,
+				'isInteractive': True,
+				'highlightIndex': 0,
+			},
+			'5': {
+				'tagName': 'a',
+				'xpath': 'body/my-widget/a',
+				'attributes': {'href': '/next', 'name': 'submit'},
+				'children': [],
+				'isVisible': True,
+				'isTopElement': True,
+				'isInteractive': True,
+				'highlightIndex': 1,
+			},
+			'4': {
+				'tagName': 'my-widget',
+				'xpath': 'body/my-widget',
+				'attributes': {},
+				'children': ['5'],
+				'isVisible': True,
+				'shadowRoot': True,
+			},
+			'7': {'type': 'TEXT_NODE', 'text': 'hidden', 'isVisible': False},
+			'8': {'type': 'TEXT_NODE', 'text': 'Send', 'isVisible': False},
+			'6': {'tagName': 'div', 'xpath': 'body/div', 'attributes': {}, 'children': ['7', '8'], 'isVisible': False},
+			# '9' was not recorded by buildDomTree.js, its id is still listed as a child
+			'0': {'tagName': 'body', 'xpath': 'body', 'attributes': {}, 'children': ['1', '4', '6', '9'], 'isVisible': True},
+		},
+	}
+
+
+@pytest.mark.parametrize(
+	'values', [[], [0], [-1, 0, 1], [2**31 - 1, -(2**31)], list(range(-1, 1000, 7))], ids=lambda values: str(len(values))
+)
+def test_int32_columns_round_trip(values: list[int]):
+	assert list(_decode_int32_column(encode_int32_column(values))) == values
+
+
+@pytest.mark.parametrize('load_page', [small_page, lambda: json.loads((FIXTURES_DIR / 'news_front_page.json').read_text())])
+async def test_compact_tree_matches_the_json_map_tree(load_page):
+	eval_page = load_page()
+	dom_service = DomService(page=None)  # type: ignore
+	root, selector_map = await dom_service._construct_dom_tree(load_page())
+	compact_root, compact_selector_map = dom_service._construct_compact_dom_tree(encode_compact_map(eval_page))
+
+	assert compact_root.parent is None
+	assert describe(compact_root) == describe(root)
+	assert {index: describe(node) for index, node in compact_selector_map.items()} == {
+		index: describe(node) for index, node in selector_map.items()
+	}
+	assert compact_root.clickable_elements_to_string() == root.clickable_elements_to_string()
+
+	# the selector map points into the tree that was built, not at copies
+	def walk(node: DOMBaseNode):
+		yield node
+		for child in getattr(node, 'children', []):
+			yield from walk(child)
+
+	tree_nodes = {id(node) for node in walk(compact_root)}
+	assert all(id(node) in tree_nodes for node in compact_selector_map.values())
+
+
+def test_compact_transport_without_a_root_element_is_rejected():
+	dom_service = DomService(page=None)  # type: ignore
+	with pytest.raises(ValueError):
+		dom_service._construct_compact_dom_tree(
+			encode_compact_map({'rootId': '0', 'map': {'0': {'type': 'TEXT_NODE', 'text': 'text', 'isVisible': True}}})
+		)
@@ -0,0 +1,117 @@
+"""
+Checks the single-pass HistoryTreeProcessor.build_hash_index against hashing every element on its own.
+"""
+
+import pytest
+
+from browser_use.dom.history_tree_processor.service import HistoryTreeProcessor
+from browser_use.dom.history_tree_processor.view import DOMHistoryElement
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+
+def element(tag: str, xpath: str, children: list, highlight_index: int | None = None, **attributes) -> DOMElementNode:
+	node = DOMElementNode(
+		tag_name=tag,
+		xpath=xpath,
+		attributes=attributes,
+		children=children,
+		is_visible=True,
+		parent=None,
+		highlight_index=highlight_index,
+	)
+	for child in children:
+		child.parent = node
+	return node
+
+
+def text(value: str) -> DOMTextNode:
+	return DOMTextNode(text=value, is_visible=True, parent=None)
+
+
+def page() -> DOMElementNode:
+	return element(
+		'html',
+		'html',
+		[
+			element(
+				'body',
+				'html/body',
+				[
+					element('button', 'html/body/button[1]', [text('Send')], highlight_index=0, name='submit'),
+					element(
+						'div',
+						'html/body/div',
+						[
+							element('a', 'html/body/div/a', [], highlight_index=1, href='/next'),
+							# a highlighted element inside another one
+							element(
+								'label',
+								'html/body/div/label',
+								[element('input', 'html/body/div/label/input', [], highlight_index=2, type='checkbox')],
+								highlight_index=3,
+							),
+							element(
+								'iframe',
+								'html/body/div/iframe',
+								[element('html', 'html', [element('button', 'html/button', [], 4)])],
+							),
+						],
+					),
+					element('button', 'html/body/button[2]', [], highlight_index=5, name='cancel'),
+					# the same fingerprint as the cancel button, e.g. after a re-render
+					element('button', 'html/body/button[2]', [], highlight_index=6, name='cancel'),
+				],
+			)
+		],
+	)
+
+
+def highlighted(node: DOMElementNode) -> list[DOMElementNode]:
+	nodes = [node] if node.highlight_index is not None else []
+	for child in node.children:
+		if isinstance(child, DOMElementNode):
+			nodes += highlighted(child)
+	return nodes
+
+
+def reference_find_history_element_in_tree(dom_history_element: DOMHistoryElement, tree: DOMElementNode) -> DOMElementNode | None:
+	"""The previous implementation: hashes every highlighted element from its own path to the root until one matches"""
+	hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(dom_history_element)
+	for node in highlighted(tree):
+		if HistoryTreeProcessor._hash_dom_element(node) == hashed_dom_history_element:
+			return node
+	return None
+
+
+@pytest.mark.parametrize('subtree', [False, True], ids=['page', 'subtree'])
+def test_hash_index_matches_hashing_each_element(subtree: bool):
+	root = page()
+	# a subtree still hashes the path from the root of the page
+	tree = root.children[0].children[1] if subtree else root
+	hash_index = HistoryTreeProcessor.build_hash_index(tree)
+
+	nodes = highlighted(tree)
+	assert {node.highlight_index for node in hash_index.values()} == {node.highlight_index for node in nodes} - {6}
+	for node in nodes:
+		hashed = HistoryTreeProcessor._hash_dom_element(node)
+		assert node.hash == hashed  # the cached fingerprint build_hash_index left on the element
+		assert hash_index[hashed] is next(n for n in nodes if HistoryTreeProcessor._hash_dom_element(n) == hashed)
+
+
+def test_history_elements_are_found_like_the_linear_search():
+	tree = page()
+	hash_index = HistoryTreeProcessor.build_hash_index(page())
+	gone = element('button', 'html/body/button[3]', [], highlight_index=7, name='gone')
+	element('body', 'html/body', [gone])
+
+	for node in [*highlighted(tree), gone]:
+		history_element = HistoryTreeProcessor.convert_dom_element_to_history_element(node)
+		expected = reference_find_history_element_in_tree(history_element, tree)
+		found = HistoryTreeProcessor.find_history_element_in_index(history_element, hash_index)
+
+		if expected is None:
+			assert node is gone and found is None
+		else:
+			# the index belongs to another copy of the same page, colliding fingerprints resolve to the first element
+			assert found is not None and found.highlight_index == expected.highlight_index
+			assert HistoryTreeProcessor.find_history_element_in_tree(history_element, tree) is expected
@@ -0,0 +1,134 @@
+"""
+Applies synthetic incremental snapshots, as returned by buildDomTree.js with incremental=True, to DomService.
+"""
+
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+
+def element(tag: str, xpath: str, children: list[str], highlight_index: int | None = None, **attributes) -> dict:
+	return {
+		'tagName': tag,
+		'xpath': xpath,
+		'attributes': attributes,
+		'children': children,
+		'isVisible': True,
+		'isTopElement': True,
+		'isInteractive': highlight_index is not None,
+		'highlightIndex': highlight_index,
+	}
+
+
+def text(value: str) -> dict:
+	return {'type': 'TEXT_NODE', 'text': value, 'isVisible': True}
+
+
+def full_snapshot() -> dict:
+	return {
+		'rootId': '0',
+		'snapshotId': 's1',
+		'map': {
+			'0': element('body', 'body', ['1', '2', '4']),
+			'1': element('button', 'body/button[1]', ['5'], highlight_index=0, name='submit'),
+			'2': element('div', 'body/div', ['3']),
+			'3': element('a', 'body/div/a', [], highlight_index=1, href='/next'),
+			'4': element('button', 'body/button[2]', [], highlight_index=2, name='cancel'),
+			'5': text('Submit'),
+		},
+	}
+
+
+def apply_full_snapshot() -> tuple[DomService, DOMElementNode, dict]:
+	dom_service = DomService(page=None, incremental=True)  # type: ignore
+	root, selector_map = dom_service._apply_dom_snapshot(full_snapshot())
+	return dom_service, root, selector_map
+
+
+def test_full_snapshot_builds_the_tree():
+	_, root, selector_map = apply_full_snapshot()
+
+	assert [child.tag_name for child in root.children] == ['button', 'div', 'button']
+	assert all(child.parent is root for child in root.children)
+	button_text = root.children[0].children[0]
+	assert isinstance(button_text, DOMTextNode) and button_text.text == 'Submit'
+	assert button_text.parent is root.children[0]
+	assert {index: node.attributes for index, node in selector_map.items()} == {
+		0: {'name': 'submit'},
+		1: {'href': '/next'},
+		2: {'name': 'cancel'},
+	}
+
+
+def test_changed_snapshot_patches_the_tree_in_place():
+	dom_service, root, selector_map = apply_full_snapshot()
+	submit, container, cancel = root.children
+	link = container.children[0]
+	submit_hash, link_hash = submit.hash, link.hash
+
+	# the submit button is renamed, the link moves from the div to the body and the cancel button is removed
+	new_root, new_selector_map = dom_service._apply_dom_snapshot(
+		{
+			'rootId': '0',
+			'snapshotId': 's2',
+			'baseSnapshotId': 's1',
+			'map': {
+				'0': element('body', 'body', ['1', '2', '3', '6']),
+				'1': element('button', 'body/button[1]', ['5'], highlight_index=0, name='send'),
+				'2': element('div', 'body/div', []),
+				'3': element('a', 'body/a', [], highlight_index=1, href='/next'),
+				'6': element('input', 'body/input', [], highlight_index=2, type='text'),
+			},
+			'removed': ['4'],
+		}
+	)
+
+	# nodes keep their identity, only their values change
+	assert new_root is root
+	assert all(node is expected for node, expected in zip(new_root.children, [submit, container, link]))
+	assert submit.attributes == {'name': 'send'}
+	assert submit.children[0].parent is submit  # unchanged text node stays linked to its patched parent
+
+	# the children of changed elements are relinked
+	assert container.children == []
+	assert link.parent is root
+	new_input = new_root.children[3]
+	assert new_input.tag_name == 'input' and new_input.parent is root
+	assert all(node is not cancel for node in new_root.children)
+
+	# the removed button does not linger in the selector map, its index now belongs to the new input
+	assert {index: id(node) for index, node in new_selector_map.items()} == {0: id(submit), 1: id(link), 2: id(new_input)}
+	assert new_selector_map is not selector_map
+	assert selector_map[2] is cancel  # the selector map of the previous state is not changed
+
+	# hashes of patched nodes are recomputed
+	assert submit.hash != submit_hash
+	assert link.hash.xpath_hash != link_hash.xpath_hash
+
+
+def test_unchanged_snapshot_reuses_the_tree():
+	dom_service, root, selector_map = apply_full_snapshot()
+
+	new_root, new_selector_map = dom_service._apply_dom_snapshot({'rootId': '0', 'snapshotId': 's1', 'unchanged': True})
+
+	assert new_root is root
+	assert new_selector_map is not selector_map
+	assert new_selector_map.keys() == selector_map.keys()
+	assert all(new_selector_map[index] is node for index, node in selector_map.items())
+
+
+def test_snapshot_from_another_base_rebuilds_the_tree():
+	dom_service, root, selector_map = apply_full_snapshot()
+
+	# e.g. after a navigation the page no longer knows the snapshot we hold and sends the full map
+	snapshot = full_snapshot()
+	snapshot['snapshotId'] = 's3'
+	new_root, new_selector_map = dom_service._apply_dom_snapshot(snapshot)
+
+	assert new_root is not root
+	assert new_selector_map.keys() == selector_map.keys()
+	assert all(new_selector_map[index] is not node for index, node in selector_map.items())
+
+	# a diff against a snapshot we never applied is not patched onto the tree either
+	stale_diff = {'rootId': '0', 'snapshotId': 's4', 'baseSnapshotId': 's1', 'map': full_snapshot()['map'], 'removed': []}
+	rebuilt_root, _ = dom_service._apply_dom_snapshot(stale_diff)
+	assert rebuilt_root is not new_root
@@ -1,5 +1,4 @@
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional
 
 from browser_use.dom.history_tree_processor.view import CoordinateSet, HashedDomElement, ViewportInfo
@@ -10,7 +9,8 @@ if TYPE_CHECKING:
 	from .views import DOMElementNode
 
 
-@dataclass(frozen=False)
+# Nodes are slotted: a large page has tens of thousands of them and a per-instance __dict__ dominates their size
+@dataclass(frozen=False, slots=True)
 class DOMBaseNode:
 	is_visible: bool
 	# Use None as default and set parent later to avoid circular reference issues
@@ -20,7 +20,7 @@ class DOMBaseNode:
 		raise NotImplementedError('DOMBaseNode is an abstract class')
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=False, slots=True)
 class DOMTextNode(DOMBaseNode):
 	text: str
 	type: str = 'TEXT_NODE'
@@ -52,7 +52,7 @@ class DOMTextNode(DOMBaseNode):
 		}
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=False, slots=True)
 class DOMElementNode(DOMBaseNode):
 	"""
 	xpath: the xpath of the element from the last root node (shadow root or iframe OR document if no shadow root or iframe).
@@ -79,6 +79,9 @@ class DOMElementNode(DOMBaseNode):
 	"""
 	is_new: bool | None = None
 
+	# lazily computed by .hash, reset with invalidate_hash() when the node is updated in place
+	_hash: HashedDomElement | None = field(default=None, init=False, repr=False, compare=False)
+
 	def __json__(self) -> dict:
 		return {
 			'tag_name': self.tag_name,
@@ -121,13 +124,18 @@ class DOMElementNode(DOMBaseNode):
 
 		return tag_str
 
-	@cached_property
+	@property
 	def hash(self) -> HashedDomElement:
-		from browser_use.dom.history_tree_processor.service import (
-			HistoryTreeProcessor,
-		)
+		if self._hash is None:
+			from browser_use.dom.history_tree_processor.service import (
+				HistoryTreeProcessor,
+			)
+
+			self._hash = HistoryTreeProcessor._hash_dom_element(self)
+		return self._hash
 
-		return HistoryTreeProcessor._hash_dom_element(self)
+	def invalidate_hash(self) -> None:
+		self._hash = None
 
 	def get_all_text_till_next_clickable_element(self, max_depth: int = -1) -> str:
 		text_parts = []
@@ -152,86 +160,135 @@ class DOMElementNode(DOMBaseNode):
 	@time_execution_sync('--clickable_elements_to_string')
 	def clickable_elements_to_string(self, include_attributes: list[str] | None = None) -> str:
 		"""Convert the processed DOM content to HTML."""
-		formatted_text = []
+		formatted_text, _, _ = self._format_clickable_elements(include_attributes)
+		return '\n'.join(formatted_text)
 
-		def process_node(node: DOMBaseNode, depth: int) -> None:
-			next_depth = int(depth)
+	def clickable_element_lines(
+		self, include_attributes: list[str] | None = None, dedupe_attributes: bool = False
+	) -> list['ClickableLine']:
+		"""The lines of clickable_elements_to_string() together with the node each line was rendered from.
+		dedupe_attributes also drops attributes that only repeat the text or another attribute's value.
+		"""
+		formatted_text, line_nodes, line_depths = self._format_clickable_elements(include_attributes, dedupe_attributes)
+		return [ClickableLine(node, depth, line) for line, node, depth in zip(formatted_text, line_nodes, line_depths)]
+
+	def _format_clickable_elements(
+		self, include_attributes: list[str] | None, dedupe_attributes: bool = False
+	) -> tuple[list[str], list[DOMBaseNode], list[int]]:
+		"""Single pass over the tree: the text of a highlighted element is collected while its
+		children are visited and its line is filled in afterwards, instead of re-walking the
+		subtree per element and walking up to the root per text node.
+		"""
+		formatted_text: list[str] = []
+		line_nodes: list[DOMBaseNode] = []
+		line_depths: list[int] = []
+
+		def format_clickable_line(node: DOMElementNode, depth: int, text: str) -> str:
 			depth_str = depth * '\t'
+			attributes_html_str = ''
+			if include_attributes:
+				attributes_to_include = {key: str(value) for key, value in node.attributes.items() if key in include_attributes}
+
+				# Easy LLM optimizations
+				# if tag == role attribute, don't include it
+				if node.tag_name == attributes_to_include.get('role'):
+					del attributes_to_include['role']
+
+				# if aria-label == text of the node, don't include it
+				if (
+					attributes_to_include.get('aria-label')
+					and attributes_to_include.get('aria-label', '').strip() == text.strip()
+				):
+					del attributes_to_include['aria-label']
 
+				# if placeholder == text of the node, don't include it
+				if (
+					attributes_to_include.get('placeholder')
+					and attributes_to_include.get('placeholder', '').strip() == text.strip()
+				):
+					del attributes_to_include['placeholder']
+
+				if dedupe_attributes:
+					seen_values = {text.strip()}
+					for key, value in list(attributes_to_include.items()):
+						if value.strip() in seen_values:
+							del attributes_to_include[key]
+						else:
+							seen_values.add(value.strip())
+
+				if attributes_to_include:
+					# Format as key1='value1' key2='value2'
+					attributes_html_str = ' '.join(f"{key}='{value}'" for key, value in attributes_to_include.items())
+
+			# Build the line
+			if node.is_new:
+				highlight_indicator = f'*[{node.highlight_index}]*'
+			else:
+				highlight_indicator = f'[{node.highlight_index}]'
+
+			line = f'{depth_str}{highlight_indicator}<{node.tag_name}'
+
+			if attributes_html_str:
+				line += f' {attributes_html_str}'
+
+			if text:
+				# Add space before >text only if there were NO attributes added before
+				if not attributes_html_str:
+					line += ' '
+				line += f'>{text}'
+			# Add space before /> only if neither attributes NOR text were added
+			elif not attributes_html_str:
+				line += ' '
+
+			line += ' />'  # 1 token
+			return line
+
+		def process_node(node: DOMBaseNode, depth: int, text_parts: list[str] | None) -> None:
+			"""text_parts collects text for the closest highlighted ancestor, None if there is no such ancestor"""
 			if isinstance(node, DOMElementNode):
 				# Add element with highlight_index
 				if node.highlight_index is not None:
-					next_depth += 1
-
-					text = node.get_all_text_till_next_clickable_element()
-					attributes_html_str = ''
-					if include_attributes:
-						attributes_to_include = {
-							key: str(value) for key, value in node.attributes.items() if key in include_attributes
-						}
-
-						# Easy LLM optimizations
-						# if tag == role attribute, don't include it
-						if node.tag_name == attributes_to_include.get('role'):
-							del attributes_to_include['role']
-
-						# if aria-label == text of the node, don't include it
-						if (
-							attributes_to_include.get('aria-label')
-							and attributes_to_include.get('aria-label', '').strip() == text.strip()
-						):
-							del attributes_to_include['aria-label']
-
-						# if placeholder == text of the node, don't include it
-						if (
-							attributes_to_include.get('placeholder')
-							and attributes_to_include.get('placeholder', '').strip() == text.strip()
-						):
-							del attributes_to_include['placeholder']
-
-						if attributes_to_include:
-							# Format as key1='value1' key2='value2'
-							attributes_html_str = ' '.join(f"{key}='{value}'" for key, value in attributes_to_include.items())
-
-					# Build the line
-					if node.is_new:
-						highlight_indicator = f'*[{node.highlight_index}]*'
-					else:
-						highlight_indicator = f'[{node.highlight_index}]'
-
-					line = f'{depth_str}{highlight_indicator}<{node.tag_name}'
-
-					if attributes_html_str:
-						line += f' {attributes_html_str}'
-
-					if text:
-						# Add space before >text only if there were NO attributes added before
-						if not attributes_html_str:
-							line += ' '
-						line += f'>{text}'
-					# Add space before /> only if neither attributes NOR text were added
-					elif not attributes_html_str:
-						line += ' '
-
-					line += ' />'  # 1 token
-					formatted_text.append(line)
-
-				# Process children regardless
-				for child in node.children:
-					process_node(child, next_depth)
+					line_index = len(formatted_text)
+					formatted_text.append('')  # filled in once the text of the children is known
+					line_nodes.append(node)
+					line_depths.append(depth)
+
+					own_text_parts: list[str] = []
+					for child in node.children:
+						process_node(child, depth + 1, own_text_parts)
+
+					text = '\n'.join(own_text_parts).strip()
+					formatted_text[line_index] = format_clickable_line(node, depth, text)
+				else:
+					for child in node.children:
+						process_node(child, depth, text_parts)
 
 			elif isinstance(node, DOMTextNode):
-				# Add text only if it doesn't have a highlighted parent
-				if (
-					not node.has_parent_with_highlight_index()
-					and node.parent
-					and node.parent.is_visible
-					and node.parent.is_top_element
-				):  # and node.is_parent_top_element()
+				if text_parts is not None:
+					# text belongs to the highlighted ancestor, it is not listed separately
+					text_parts.append(node.text)
+				elif node.parent and node.parent.is_visible and node.parent.is_top_element:
+					depth_str = depth * '\t'
 					formatted_text.append(f'{depth_str}{node.text}')
+					line_nodes.append(node)
+					line_depths.append(depth)
 
-		process_node(self, 0)
-		return '\n'.join(formatted_text)
+		# highlighted ancestors above this node swallow its free text too
+		ancestor = self.parent
+		while ancestor is not None and ancestor.highlight_index is None:
+			ancestor = ancestor.parent
+
+		process_node(self, 0, [] if ancestor is not None else None)
+		return formatted_text, line_nodes, line_depths
+
+
+@dataclass(slots=True)
+class ClickableLine:
+	"""One line of the clickable elements listing: a highlighted element or a free text node"""
+
+	node: DOMBaseNode
+	depth: int
+	line: str
 
 
 SelectorMap = dict[int, DOMElementNode]
@@ -241,3 +298,14 @@ SelectorMap = dict[int, DOMElementNode]
 class DOMState:
 	element_tree: DOMElementNode
 	selector_map: SelectorMap
+
+	_hash_index: dict[HashedDomElement, DOMElementNode] | None = field(default=None, init=False, repr=False, compare=False)
+
+	@property
+	def hash_index(self) -> dict[HashedDomElement, DOMElementNode]:
+		"""Highlighted elements by fingerprint, built in one top-down pass on first access"""
+		if self._hash_index is None:
+			from browser_use.dom.history_tree_processor.service import HistoryTreeProcessor
+
+			self._hash_index = HistoryTreeProcessor.build_hash_index(self.element_tree)
+		return self._hash_index
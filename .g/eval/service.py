@@ -540,11 +540,12 @@ async def reformat_agent_history(
 	# Process history items
 	for step_num, history_item in enumerate(agent_history.history):
 		# Save screenshot
-		if history_item.state and history_item.state.screenshot:
+		screenshot = history_item.state.get_screenshot() if history_item.state else None
+		if screenshot:
 			screenshot_path = trajectory_with_highlights_dir / f'step_{step_num}.png'
 			screenshot_paths.append(str(screenshot_path))
 			# Save the actual screenshot
-			screenshot_data = base64.b64decode(history_item.state.screenshot)
+			screenshot_data = base64.b64decode(screenshot)
 			async with await anyio.open_file(screenshot_path, 'wb') as f:
 				await f.write(screenshot_data)
 
@@ -1007,8 +1008,161 @@ async def load_existing_result(task_folder: Path) -> dict:
 	return existing_result
 
 
-async def setup_browser_session(task: Task, headless: bool) -> BrowserSession:
+@dataclass
+class BrowserPoolMetrics:
+	launches: int = 0
+	recycles: int = 0
+	crashes: int = 0
+	sessions_served: int = 0
+	launch_seconds: float = 0.0
+	acquire_wait_seconds: float = 0.0
+
+	def to_dict(self) -> dict[str, Any]:
+		return {
+			'launches': self.launches,
+			'recycles': self.recycles,
+			'crashes': self.crashes,
+			'sessions_served': self.sessions_served,
+			'avg_launch_seconds': self.launch_seconds / self.launches if self.launches else 0.0,
+			'avg_acquire_wait_seconds': self.acquire_wait_seconds / self.sessions_served if self.sessions_served else 0.0,
+		}
+
+
+@dataclass
+class PooledBrowser:
+	browser_session: BrowserSession  # owns the launched browser process, never handed out to tasks
+	tasks_served: int = 0
+
+	@property
+	def is_alive(self) -> bool:
+		browser = self.browser_session.browser
+		return browser is not None and browser.is_connected()
+
+
+class BrowserPool:
+	"""
+	Keeps `size` warm browsers launched and hands out a BrowserSession on a fresh, isolated BrowserContext per task.
+	Browsers are relaunched after `recycle_after` tasks, or as soon as they are found disconnected (crashed).
+	"""
+
+	def __init__(self, size: int, headless: bool, recycle_after: int = 20):
+		self.size = size
+		self.headless = headless
+		self.recycle_after = recycle_after
+		self.metrics = BrowserPoolMetrics()
+		# None marks a free slot whose browser still has to be (re)launched
+		self._idle: asyncio.Queue[PooledBrowser | None] = asyncio.Queue()
+		self._leased: dict[int, PooledBrowser] = {}
+
+	def _browser_profile(self) -> BrowserProfile:
+		return BrowserProfile(user_data_dir=None, headless=self.headless, chromium_sandbox=False)
+
+	async def start(self) -> 'BrowserPool':
+		"""Pre-launch all browsers concurrently, slots that fail to launch are retried on first use"""
+		launched = await asyncio.gather(*(self._launch() for _ in range(self.size)), return_exceptions=True)
+		for pooled in launched:
+			if isinstance(pooled, BaseException):
+				logger.warning(f'Browser pool: Failed to pre-launch browser: {type(pooled).__name__}: {pooled}')
+				pooled = None
+			self._idle.put_nowait(pooled)
+		return self
+
+	async def _launch(self) -> PooledBrowser:
+		start_time = time.time()
+		browser_session = BrowserSession(browser_profile=self._browser_profile().model_copy(update={'keep_alive': False}))
+		await browser_session.start()
+		self.metrics.launches += 1
+		self.metrics.launch_seconds += time.time() - start_time
+		return PooledBrowser(browser_session=browser_session)
+
+	async def _retire(self, pooled: PooledBrowser) -> None:
+		browser = pooled.browser_session.browser
+		await cleanup_browser_safe(pooled.browser_session)
+		try:
+			if browser and browser.is_connected():
+				await browser.close()
+		except Exception as e:
+			logger.debug(f'Browser pool: Failed to close retired browser: {type(e).__name__}: {e}')
+
+	async def new_session(self) -> BrowserSession:
+		"""Wait for a free browser and open a new BrowserContext in it for one task"""
+		start_time = time.time()
+		pooled = await self._idle.get()
+		browser_context = None
+		try:
+			if pooled is not None and not pooled.is_alive:
+				logger.warning('Browser pool: Browser disconnected while idle, relaunching')
+				self.metrics.crashes += 1
+				await self._retire(pooled)
+				pooled = None
+			if pooled is None:
+				pooled = await self._launch()
+
+			browser_profile = self._browser_profile()
+			browser_context = await pooled.browser_session.browser.new_context(
+				**browser_profile.kwargs_for_new_context().model_dump()
+			)
+			# keep_alive=False: stopping the task session closes only its own context, the browser stays warm
+			browser_session = BrowserSession(
+				browser_profile=browser_profile.model_copy(update={'keep_alive': False}),
+				browser_context=browser_context,
+				playwright=pooled.browser_session.playwright,
+			)
+			await browser_session.start()
+		except BaseException:
+			if browser_context is not None:
+				# the browser goes back to the pool, the context opened for this task must not stay behind in it
+				try:
+					await browser_context.close()
+				except Exception as e:
+					logger.debug(f'Browser pool: Failed to close the context of a session that did not start: {e}')
+			# give the slot back so the pool does not shrink, it gets relaunched on next use
+			self._idle.put_nowait(pooled if pooled is not None and pooled.is_alive else None)
+			raise
+
+		pooled.tasks_served += 1
+		self._leased[id(browser_session)] = pooled
+		self.metrics.sessions_served += 1
+		self.metrics.acquire_wait_seconds += time.time() - start_time
+		return browser_session
+
+	async def release(self, browser_session: BrowserSession) -> None:
+		"""Close the task's context and return its browser to the pool, recycling it if it is worn out or crashed"""
+		pooled = self._leased.pop(id(browser_session))
+		await cleanup_browser_safe(browser_session)
+
+		if not pooled.is_alive:
+			logger.warning('Browser pool: Browser crashed during task, relaunching on next use')
+			self.metrics.crashes += 1
+		elif pooled.tasks_served >= self.recycle_after:
+			logger.debug(f'Browser pool: Recycling browser after {pooled.tasks_served} tasks')
+			self.metrics.recycles += 1
+		else:
+			self._idle.put_nowait(pooled)
+			return
+
+		await self._retire(pooled)
+		self._idle.put_nowait(None)
+
+	async def close(self) -> None:
+		"""Shut down every idle browser, call once all sessions have been released"""
+		while not self._idle.empty():
+			pooled = self._idle.get_nowait()
+			if pooled is not None:
+				await self._retire(pooled)
+		logger.info(f'Browser pool: {self.metrics.to_dict()}')
+
+
+async def setup_browser_session(task: Task, headless: bool, browser_pool: BrowserPool | None = None) -> BrowserSession:
 	"""Setup browser session for the task"""
+	if browser_pool:
+		logger.debug(f'Browser setup: Taking a warm browser from the pool for task {task.task_id}')
+		browser_session = await browser_pool.new_session()
+		if task.website:
+			logger.debug(f'Browser setup: Navigating to {task.website} for task {task.task_id}')
+			await browser_session.navigate(task.website)
+		return browser_session
+
 	logger.debug(f'Browser setup: Creating unique user data directory for task {task.task_id}')
 	# Create unique user data directory
 	base_user_data_dir = Path(BrowserProfile().user_data_dir).parent
@@ -1090,8 +1244,12 @@ def save_result_to_server(convex_url: str, secret_key: str, payload: dict) -> bo
 	return save_task_result_to_server(convex_url, secret_key, payload)
 
 
-async def cleanup_browser_safe(browser_session: BrowserSession):
+async def cleanup_browser_safe(browser_session: BrowserSession, browser_pool: BrowserPool | None = None):
 	"""Safe browser cleanup with timeout"""
+	if browser_pool:
+		await browser_pool.release(browser_session)
+		return
+
 	try:
 		logger.debug('Browser cleanup: Starting close operation for session')
 		await asyncio.wait_for(browser_session.close(), timeout=30)
@@ -1139,6 +1297,7 @@ async def run_task_with_semaphore(
 	validate_output: bool = False,
 	planner_llm: BaseChatModel | None = None,
 	planner_interval: int = 1,
+	browser_pool: BrowserPool | None = None,
 ) -> dict:
 	"""Clean pipeline approach for running tasks"""
 	logger.info(f'Task {task.task_id}: Waiting to acquire semaphore (current value: ~{semaphore_runs._value})')
@@ -1175,7 +1334,7 @@ async def run_task_with_semaphore(
 					try:
 						logger.info(f'Task {task.task_id}: Browser setup starting.')
 						browser_session = await run_stage(
-							Stage.SETUP_BROWSER, lambda: setup_browser_session(task, headless), timeout=120
+							Stage.SETUP_BROWSER, lambda: setup_browser_session(task, headless, browser_pool), timeout=120
 						)
 						task_result.stage_completed(Stage.SETUP_BROWSER)
 						logger.info(f'Task {task.task_id}: Browser session started successfully.')
@@ -1342,7 +1501,7 @@ async def run_task_with_semaphore(
 			# Always cleanup browser if it was created
 			if browser_session:
 				logger.info(f'Task {task.task_id}: Starting browser cleanup')
-				await cleanup_browser_safe(browser_session)
+				await cleanup_browser_safe(browser_session, browser_pool)
 				logger.info(f'Task {task.task_id}: Browser cleanup completed')
 			else:
 				logger.info(f'Task {task.task_id}: No browser to cleanup')
@@ -1376,6 +1535,8 @@ async def run_multiple_tasks(
 	validate_output: bool = False,
 	planner_llm: BaseChatModel | None = None,
 	planner_interval: int = 1,
+	use_browser_pool: bool = False,
+	browser_recycle_after: int = 20,
 ) -> dict:
 	"""
 	Run multiple tasks in parallel and evaluate results.
@@ -1384,35 +1545,47 @@ async def run_multiple_tasks(
 	semaphore_runs = asyncio.Semaphore(max_parallel_runs)
 	tasks_to_run = tasks[start_index:end_index] if end_index else tasks[start_index:]
 
+	browser_pool = None
+	if use_browser_pool:
+		logger.info(
+			f'Pre-launching browser pool with {max_parallel_runs} browsers (recycled every {browser_recycle_after} tasks)'
+		)
+		browser_pool = await BrowserPool(size=max_parallel_runs, headless=headless, recycle_after=browser_recycle_after).start()
+
 	logger.info(f'Starting {len(tasks_to_run)} tasks with parallel limit of {max_parallel_runs}')
 
 	# Run all tasks in parallel with additional parameters
-	task_results = await asyncio.gather(
-		*(
-			run_task_with_semaphore(
-				task=task,
-				run_id=run_id,
-				convex_url=convex_url,
-				secret_key=secret_key,
-				eval_model=eval_model,
-				llm=llm,  # Pass the agent LLM
-				max_steps_per_task=max_steps_per_task,
-				headless=headless,
-				use_vision=use_vision,
-				semaphore_runs=semaphore_runs,  # Pass the semaphore
-				fresh_start=fresh_start,
-				use_serp=use_serp,
-				enable_memory=enable_memory,
-				memory_interval=memory_interval,
-				max_actions_per_step=max_actions_per_step,
-				validate_output=validate_output,
-				planner_llm=planner_llm,
-				planner_interval=planner_interval,
-			)
-			for task in tasks_to_run
-		),
-		return_exceptions=True,  # Prevent task cancellation cascade
-	)
+	try:
+		task_results = await asyncio.gather(
+			*(
+				run_task_with_semaphore(
+					task=task,
+					run_id=run_id,
+					convex_url=convex_url,
+					secret_key=secret_key,
+					eval_model=eval_model,
+					llm=llm,  # Pass the agent LLM
+					max_steps_per_task=max_steps_per_task,
+					headless=headless,
+					use_vision=use_vision,
+					semaphore_runs=semaphore_runs,  # Pass the semaphore
+					fresh_start=fresh_start,
+					use_serp=use_serp,
+					enable_memory=enable_memory,
+					memory_interval=memory_interval,
+					max_actions_per_step=max_actions_per_step,
+					validate_output=validate_output,
+					planner_llm=planner_llm,
+					planner_interval=planner_interval,
+					browser_pool=browser_pool,
+				)
+				for task in tasks_to_run
+			),
+			return_exceptions=True,  # Prevent task cancellation cascade
+		)
+	finally:
+		if browser_pool:
+			await browser_pool.close()
 
 	# Process task results and handle any exceptions returned by gather
 	processed_results = []
@@ -1655,6 +1828,12 @@ if __name__ == '__main__':
 		help='Model to use for planning (separate from main agent model)',
 	)
 	parser.add_argument('--planner-interval', type=int, default=1, help='Run planner every N steps (default: 1)')
+	parser.add_argument(
+		'--browser-pool', action='store_true', help='Reuse warm pre-launched browsers with a fresh context per task'
+	)
+	parser.add_argument(
+		'--browser-recycle-after', type=int, default=20, help='Relaunch pooled browsers after N tasks (default: 20)'
+	)
 	args = parser.parse_args()
 
 	# Set up logging - Make sure logger is configured before use in fetch function
@@ -1748,6 +1927,7 @@ if __name__ == '__main__':
 			'use_vision': not args.no_vision,
 			'task_source': TEST_CASE_NAME,
 			'llm_judge': args.eval_model,
+			'browser_pool': args.browser_pool,
 		}
 
 		run_data = {
@@ -1857,6 +2037,8 @@ if __name__ == '__main__':
 				validate_output=args.validate_output,
 				planner_llm=planner_llm,
 				planner_interval=args.planner_interval,
+				use_browser_pool=args.browser_pool,
+				browser_recycle_after=args.browser_recycle_after,
 			)
 		)
 